@@ -1,19 +1,29 @@
 import json
 import uuid
 from enum import Enum
-
-from eth_account.messages import defunct_hash_message
-from web3 import Web3
-from web3.providers.legacy_websocket import LegacyWebSocketProvider
-
-from websockets.exceptions import ConnectionClosed
+from functools import lru_cache
 
 from common.constant import TokenSymbol
+from common.lazy_import import lazy_import
 from common.logger import get_logger
 
+# web3 takes a large share of the cold start, handlers importing this module only for
+# ContractType or get_contract_file_paths should not pay for it
+eth_account_messages = lazy_import("eth_account.messages")
+web3 = lazy_import("web3")
+web3_legacy_websocket = lazy_import("web3.providers.legacy_websocket")
+websockets_exceptions = lazy_import("websockets.exceptions")
+
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _load_contract_file(path):
+    with open(path) as f:
+        contract = json.load(f)
+    return contract
+
+
 class ContractType(Enum):
     REGISTRY = "REGISTRY"
     MPE = "MPE"
@@ -34,31 +44,33 @@ class BlockChainUtil(object):
         self._provider_url = provider
 
         if self._provider_type == "HTTP_PROVIDER":
-            self.provider = Web3.HTTPProvider(self._provider_url)
+            self.provider = web3.Web3.HTTPProvider(self._provider_url)
         elif self._provider_type == "WS_PROVIDER":
-            self.provider = LegacyWebSocketProvider(self._provider_url)
+            self.provider = web3_legacy_websocket.LegacyWebSocketProvider(self._provider_url)
         else:
             raise Exception("Only HTTP_PROVIDER and WS_PROVIDER provider type are supported.")
 
-        self.web3_object = Web3(self.provider)
+        self.web3_object = web3.Web3(self.provider)
 
     @staticmethod
     def load_contract(path):
-        with open(path) as f:
-            contract = json.load(f)
-        return contract
+        """
+        Contract files are part of the deployment package, so they are parsed once per container.
+        The returned content is shared by all callers and must be treated as read-only.
+        """
+        return _load_contract_file(path)
 
     def read_contract_address(self, net_id, path, token_name, stage, key='address'):
         contract = self.load_contract(path)
         logger.info("contract: {}".format(contract))
-        return Web3.to_checksum_address(contract[str(net_id)][token_name][stage][key])
+        return web3.Web3.to_checksum_address(contract[str(net_id)][token_name][stage][key])
 
     def contract_instance(self, contract_abi, address):
         if self._provider_type == "HTTP_PROVIDER":
-            self.provider = Web3.HTTPProvider(self._provider_url)
+            self.provider = web3.Web3.HTTPProvider(self._provider_url)
         elif self._provider_type == "WS_PROVIDER":
-            self.provider = LegacyWebSocketProvider(self._provider_url)
-        web3_object = Web3(self.provider)
+            self.provider = web3_legacy_websocket.LegacyWebSocketProvider(self._provider_url)
+        web3_object = web3.Web3(self.provider)
         self.web3_object = web3_object
         return web3_object.eth.contract(abi=contract_abi, address=address)
 
@@ -77,14 +89,14 @@ class BlockChainUtil(object):
 
     def generate_signature(self, data_types, values, signer_key):
         signer_key = "0x" + signer_key if not signer_key.startswith("0x") else signer_key
-        message = Web3.solidity_keccak(data_types, values)
-        signature = self.web3_object.eth.account._sign_hash(defunct_hash_message(message), signer_key)
+        message = web3.Web3.solidity_keccak(data_types, values)
+        signature = self.web3_object.eth.account._sign_hash(eth_account_messages.defunct_hash_message(message), signer_key)
         return signature.signature.hex()
 
     def generate_signature_bytes(self, data_types, values, signer_key):
         signer_key = "0x" + signer_key if not signer_key.startswith("0x") else signer_key
-        message = Web3.solidity_keccak(data_types, values)
-        signature = self.web3_object.eth.account._sign_hash(defunct_hash_message(message), signer_key)
+        message = web3.Web3.solidity_keccak(data_types, values)
+        signature = self.web3_object.eth.account._sign_hash(eth_account_messages.defunct_hash_message(message), signer_key)
         return bytes(signature.signature)
 
     def get_nonce(self, address):
@@ -129,7 +141,7 @@ class BlockChainUtil(object):
     def get_current_block_no(self):
         try:
             connected = self.web3_object.is_connected()
-        except ConnectionClosed as e:
+        except websockets_exceptions.ConnectionClosed as e:
             logger.info(f"Connection is closed:: {repr(e)}")
             connected = False
         if not connected:
@@ -183,8 +195,8 @@ class BlockChainUtil(object):
 
     def reset_web3_connection(self):
         if self._provider_type == "HTTP_PROVIDER":
-            self.provider = Web3.HTTPProvider(self._provider_url)
+            self.provider = web3.Web3.HTTPProvider(self._provider_url)
         elif self._provider_type == "WS_PROVIDER":
-            self.provider = LegacyWebSocketProvider(self._provider_url)
-        web3_object = Web3(self.provider)
+            self.provider = web3_legacy_websocket.LegacyWebSocketProvider(self._provider_url)
+        web3_object = web3.Web3(self.provider)
         self.web3_object = web3_object
@@ -1,30 +1,102 @@
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from http import HTTPStatus
 from urllib.parse import urlparse
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from common.logger import get_logger
+from common.utils import GzipTextStream
 
 
 logger = get_logger(__name__)
 
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+S3_DELETE_OBJECTS_MAX_KEYS = 1000
+# objects are transferred in parallel already, large ones are split into a few parts on top of that
+S3_TRANSFER_CONFIG = TransferConfig(multipart_threshold=64 * 1024 * 1024, max_concurrency=4)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_boto_client(service_name, region_name=None, max_attempts=None, connect_timeout=None, read_timeout=None,
+                    max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS):
+    """
+    Returns a client shared by the whole container for the combination of the given arguments.
+    Clients are thread-safe once created, so they keep the loaded service model and the pool of
+    open connections between calls instead of paying for them on every call.
+    """
+    key = (service_name, region_name, max_attempts, connect_timeout, read_timeout, max_pool_connections)
+    client = _clients.get(key)
+    if client is None:
+        # creating clients from the default session is not thread-safe
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                config_options = {"max_pool_connections": max_pool_connections}
+                if max_attempts is not None:
+                    config_options["retries"] = {"max_attempts": max_attempts}
+                if connect_timeout is not None:
+                    config_options["connect_timeout"] = connect_timeout
+                if read_timeout is not None:
+                    config_options["read_timeout"] = read_timeout
+                client = boto3.client(service_name, region_name=region_name, config=Config(**config_options))
+                _clients[key] = client
+    return client
+
+
+def clear_boto_clients():
+    """ Drops the shared clients, e.g. for tests that patch boto3.client """
+    with _clients_lock:
+        _clients.clear()
+
+
+class S3TransferException(Exception):
+    def __init__(self, operation, failures):
+        self.failures = failures
+        super().__init__(f"{operation} failed for {len(failures)} object(s): {failures}")
+
+
+def _run_concurrently(func, items, max_workers):
+    """ Calls func for every item on a thread pool, returns (item, error) pairs of the calls that failed """
+    failures = []
+    if not items:
+        return failures
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = {executor.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                failures.append((futures[future], repr(future.exception())))
+    return failures
+
 
 class BotoUtils:
-    def __init__(self, region_name):
+    def __init__(self, region_name, max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS):
         self.region_name = region_name
+        self.max_pool_connections = max_pool_connections
 
-    def get_ssm_parameter(self, parameter, config=Config(retries={'max_attempts': 1})):
+    def _get_client(self, service_name, region_name=None, config=None, max_attempts=None):
+        if config is not None:
+            # a client with a custom config is not shared, configs can't be compared through the public API
+            config = Config(max_pool_connections=self.max_pool_connections).merge(config)
+            return boto3.client(service_name, region_name=region_name, config=config)
+        return get_boto_client(service_name, region_name=region_name, max_attempts=max_attempts,
+                               max_pool_connections=self.max_pool_connections)
+
+    def get_ssm_parameter(self, parameter, config=None):
         """ Format config=Config(connect_timeout=1, read_timeout=0.1, retries={'max_attempts': 1}) """
-        ssm = boto3.client('ssm', region_name=self.region_name, config=config)
+        ssm = self._get_client('ssm', region_name=self.region_name, config=config, max_attempts=1)
         parameter = ssm.get_parameter(Name=parameter, WithDecryption=True)
         return parameter["Parameter"]["Value"]
 
-    def invoke_lambda(self, lambda_function_arn, invocation_type, payload, config=Config(retries={'max_attempts': 1})):
+    def invoke_lambda(self, lambda_function_arn, invocation_type, payload, config=None):
         """ Format config=Config(connect_timeout=1, read_timeout=0.1, retries={'max_attempts': 1}) """
-        lambda_client = boto3.client('lambda', region_name=self.region_name, config=config)
+        lambda_client = self._get_client('lambda', region_name=self.region_name, config=config, max_attempts=1)
         lambda_response = lambda_client.invoke(FunctionName=lambda_function_arn, InvocationType=invocation_type,
                                                Payload=payload)
         if invocation_type == "Event":
@@ -32,17 +104,43 @@ class BotoUtils:
         return json.loads(lambda_response.get('Payload').read())
 
     def s3_upload_file(self, filename, bucket, key):
-        s3_client = boto3.client('s3')
+        s3_client = self._get_client('s3')
         s3_client.upload_file(filename, bucket, key)
 
     def s3_download_file(self, bucket, key, filename):
-        s3_client = boto3.client('s3')
+        s3_client = self._get_client('s3')
         s3_client.download_file(bucket, key, filename)
 
+    def s3_upload_fileobj(self, fileobj, bucket, key, metadata=None):
+        s3_client = self._get_client('s3')
+        extra_args = {'Metadata': metadata} if metadata else None
+        s3_client.upload_fileobj(fileobj, bucket, key, ExtraArgs=extra_args, Config=S3_TRANSFER_CONFIG)
+
+    def get_s3_object_metadata(self, bucket, key):
+        """ Returns user metadata of the object, None if the object doesn't exist """
+        s3_client = self._get_client('s3')
+        try:
+            return s3_client.head_object(Bucket=bucket, Key=key)['Metadata']
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise e
+
+    def s3_upload_gzip_text_stream(self, chunks, bucket, key, content_type="text/plain; charset=utf-8"):
+        """ Compresses text chunks with gzip on the fly and uploads them without buffering the whole file """
+        s3_client = self._get_client('s3', region_name=self.region_name)
+        s3_client.upload_fileobj(GzipTextStream(chunks), bucket, key,
+                                 ExtraArgs={'ContentType': content_type, 'ContentEncoding': 'gzip'})
+
+    def generate_s3_presigned_url(self, bucket, key, expires_in, filename=None):
+        s3_client = self._get_client('s3', region_name=self.region_name)
+        params = {'Bucket': bucket, 'Key': key}
+        if filename:
+            params['ResponseContentDisposition'] = f'attachment; filename="{filename}"'
+        return s3_client.generate_presigned_url('get_object', Params=params, ExpiresIn=expires_in)
+
     def get_parameter_value_from_secrets_manager(self, secret_name):
-        config = Config(retries=dict(max_attempts=2))
-        session = boto3.session.Session()
-        client = session.client(service_name='secretsmanager', region_name=self.region_name, config=config)
+        client = self._get_client('secretsmanager', region_name=self.region_name, max_attempts=2)
         try:
             parameter_value = client.get_secret_value(SecretId=secret_name)['SecretString']
         except ClientError as e:
@@ -55,12 +153,32 @@ class BotoUtils:
     @staticmethod
     def delete_objects_from_s3(bucket, key, key_pattern):
         if key_pattern in key:
-                s3_client = boto3.client('s3')
+                s3_client = get_boto_client('s3')
                 s3_client.delete_object(Bucket=bucket, Key=key)
 
+    @staticmethod
+    def delete_objects_in_batches(bucket, keys):
+        """ Deletes keys with DeleteObjects requests of up to 1000 keys, returns (key, error) pairs of failed deletes """
+        s3_client = get_boto_client('s3')
+        failures = []
+        for i in range(0, len(keys), S3_DELETE_OBJECTS_MAX_KEYS):
+            batch = keys[i:i + S3_DELETE_OBJECTS_MAX_KEYS]
+            try:
+                response = s3_client.delete_objects(Bucket=bucket, Delete={
+                    'Objects': [{'Key': key} for key in batch],
+                    'Quiet': True
+                })
+            except ClientError as e:
+                logger.error(f"Failed to delete batch of {len(batch)} objects from {bucket}: {repr(e)}")
+                failures.extend((key, repr(e)) for key in batch)
+                continue
+            for error in response.get('Errors', []):
+                failures.append((error['Key'], f"{error.get('Code')}: {error.get('Message')}"))
+        return failures
+
     @staticmethod
     def get_objects_from_s3(bucket, key):
-        s3 = boto3.client('s3')
+        s3 = get_boto_client('s3')
         objects = []
         paginator = s3.get_paginator('list_objects_v2')
         pages = paginator.paginate(Bucket=bucket, Prefix=key)
@@ -76,38 +194,48 @@ class BotoUtils:
         return parsed_url.hostname.split(".")[0], parsed_url.path[1:]
 
     def upload_folder_contents_to_s3(self, folder_path, bucket, key):
-        try:
-            for root, dirs, files in os.walk(folder_path):
-                for file in files:
-                    folder_name = root.replace(str(folder_path), "")
-                    folder_name = folder_name.replace(os.path.sep, "")
-                    if folder_name:
-                        folder_name = folder_name + "/"
-                    self.s3_upload_file(filename=os.path.join(root, file), bucket=bucket,
-                                        key=f"{key}/{folder_name}{file}")
-        except Exception as e:
-            raise e
+        s3_client = self._get_client('s3')
+        uploads = []
+        for root, dirs, files in os.walk(folder_path):
+            for file in files:
+                folder_name = root.replace(str(folder_path), "")
+                folder_name = folder_name.replace(os.path.sep, "")
+                if folder_name:
+                    folder_name = folder_name + "/"
+                uploads.append((os.path.join(root, file), f"{key}/{folder_name}{file}"))
+
+        failures = _run_concurrently(
+            lambda upload: s3_client.upload_file(upload[0], bucket, upload[1], Config=S3_TRANSFER_CONFIG),
+            uploads, self.max_pool_connections
+        )
+        if failures:
+            raise S3TransferException(f"Upload of {folder_path} to {bucket}/{key}", failures)
 
     def download_folder_contents_from_s3(self, bucket, key, target):
-        try:
-            keys = self.get_objects_from_s3(bucket=bucket, key=key)
-            for object_key in keys:
-                path, filename = os.path.split(object_key['Key'])
-                file_or_folder = object_key['Key'].replace(key,"")
-                sub_folder_structure = ""
-                if "/" in file_or_folder:
-                    sub_folder_structure = path.replace(key, "")
-                target_path = os.path.join(target, sub_folder_structure)
-                if not os.path.exists(target_path):
-                    os.makedirs(target_path)
-                self.s3_download_file(bucket=bucket, key=object_key['Key'], filename=os.path.join(target_path, filename))
-        except Exception as e:
-            raise e
+        s3_client = self._get_client('s3')
+        downloads = []
+        for object_key in self.get_objects_from_s3(bucket=bucket, key=key):
+            path, filename = os.path.split(object_key['Key'])
+            file_or_folder = object_key['Key'].replace(key,"")
+            sub_folder_structure = ""
+            if "/" in file_or_folder:
+                sub_folder_structure = path.replace(key, "")
+            target_path = os.path.join(target, sub_folder_structure)
+            if not os.path.exists(target_path):
+                os.makedirs(target_path)
+            downloads.append((object_key['Key'], os.path.join(target_path, filename)))
+
+        failures = _run_concurrently(
+            lambda download: s3_client.download_file(bucket, download[0], download[1], Config=S3_TRANSFER_CONFIG),
+            downloads, self.max_pool_connections
+        )
+        if failures:
+            raise S3TransferException(f"Download of {bucket}/{key}", failures)
 
     @staticmethod
     def get_code_build_details(build_ids):
         try:
-            build_client = boto3.client('codebuild')
+            build_client = get_boto_client('codebuild')
             return build_client.batch_get_builds(ids=build_ids)
         except build_client.exceptions.InvalidInputException as e:
             raise Exception(f"build id is not found {build_ids}")
@@ -115,39 +243,52 @@ class BotoUtils:
     @staticmethod
     def trigger_code_build(build_details):
         try:
-            cb = boto3.client('codebuild')
+            cb = get_boto_client('codebuild')
             build = cb.start_build(**build_details)
             return build
         except Exception as e:
             raise e
 
     def move_s3_objects(self, source_bucket, source_key, target_bucket, target_key, clear_destination=False):
-        s3 = boto3.resource('s3')
-        source_objects = self.get_objects_from_s3(bucket=source_bucket, key=source_key)
-        dest_bucket = s3.Bucket(target_bucket)
+        """ Copies objects server-side in parallel, only the sources that were copied are deleted """
+        s3_client = self._get_client('s3')
+        source_keys = [obj['Key'] for obj in self.get_objects_from_s3(bucket=source_bucket, key=source_key)]
         if clear_destination:
             destination_key = target_key[:-1] if target_key.endswith('/') else target_key
-            target_objects = self.get_objects_from_s3(bucket=target_bucket, key=destination_key)
-            for key in target_objects:
-                self.delete_objects_from_s3(bucket=target_bucket, key=key['Key'], key_pattern=destination_key)
-        for source_key in source_objects:
-            copy_source = {'Bucket': source_bucket, 'Key': source_key['Key']}
-            dest_bucket.copy(copy_source, target_key + os.path.basename(source_key['Key']))
-            s3.Object(source_bucket, source_key['Key']).delete()
+            target_keys = [obj['Key'] for obj in self.get_objects_from_s3(bucket=target_bucket, key=destination_key)
+                           if destination_key in obj['Key']]
+            failures = self.delete_objects_in_batches(bucket=target_bucket, keys=target_keys)
+            if failures:
+                raise S3TransferException(f"Clearing {target_bucket}/{destination_key}", failures)
+
+        copy_failures = _run_concurrently(
+            lambda key: s3_client.copy({'Bucket': source_bucket, 'Key': key}, target_bucket,
+                                       target_key + os.path.basename(key), Config=S3_TRANSFER_CONFIG),
+            source_keys, self.max_pool_connections
+        )
+        failed_keys = {key for key, _ in copy_failures}
+        delete_failures = self.delete_objects_in_batches(
+            bucket=source_bucket, keys=[key for key in source_keys if key not in failed_keys]
+        )
+        if copy_failures or delete_failures:
+            raise S3TransferException(f"Move of {source_bucket}/{source_key} to {target_bucket}/{target_key}",
+                                      copy_failures + delete_failures)
 
     @staticmethod
     def clear_s3_files(bucket, key):
         try:
-            to_delete_objects = BotoUtils.get_objects_from_s3(bucket = bucket, key = key)
-            for delete_obj in to_delete_objects:
-                BotoUtils.delete_objects_from_s3(bucket = bucket, key = delete_obj["Key"], key_pattern = key)
+            to_delete_keys = [obj["Key"] for obj in BotoUtils.get_objects_from_s3(bucket = bucket, key = key)
+                              if key in obj["Key"]]
+            failures = BotoUtils.delete_objects_in_batches(bucket = bucket, keys = to_delete_keys)
+            if failures:
+                raise S3TransferException(f"Clearing {bucket}/{key}", failures)
         except Exception as e:
             msg = f"Error in deleting stub files :: {repr(e)}"
             logger.info(msg)
             raise Exception(msg)
 
     def publish_data_to_sns_topic(self, topic_arn: str, payload: dict, delay_seconds: int = 0):
-        sns_client = boto3.client('sns', region_name = self.region_name)
+        sns_client = self._get_client('sns', region_name = self.region_name)
         logger.debug(f"Publishing data to SNS topic, payload: {payload}")
         response = sns_client.publish(TargetArn = topic_arn,
                                       Message = json.dumps({'default': json.dumps(payload)}),
@@ -161,3 +302,20 @@ class BotoUtils:
         if response['ResponseMetadata']['HTTPStatusCode'] != HTTPStatus.OK:
             logger.error(f"Failed to publish data to SNS topic. Response: {response}")
             raise Exception("Failed to publish data to SNS topic!")
+
+    def publish_batch_to_sns_topic(self, topic_arn: str, payloads: list) -> list:
+        """ Publishes up to 10 payloads with one request, returns indexes of the payloads that failed """
+        sns_client = self._get_client('sns', region_name = self.region_name)
+        logger.debug(f"Publishing batch of {len(payloads)} messages to SNS topic")
+        response = sns_client.publish_batch(TopicArn = topic_arn,
+                                            PublishBatchRequestEntries = [
+                                                {
+                                                    'Id': str(index),
+                                                    'Message': json.dumps({'default': json.dumps(payload)}),
+                                                    'MessageStructure': 'json'
+                                                } for index, payload in enumerate(payloads)
+                                            ])
+        failed = response.get('Failed', [])
+        if failed:
+            logger.error(f"Failed to publish part of the batch to SNS topic: {failed}")
+        return sorted(int(entry['Id']) for entry in failed)
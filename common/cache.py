@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small thread-safe in-memory cache with per-entry expiration. It is meant to keep values
+    between invocations of a warm Lambda container, so it is usually created at module level.
+    """
+
+    def __init__(self, ttl_in_seconds: float, max_size: Optional[int] = None):
+        self._ttl = ttl_in_seconds
+        self._max_size = max_size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_in_seconds: Optional[float] = None) -> None:
+        ttl = self._ttl if ttl_in_seconds is None else ttl_in_seconds
+        with self._lock:
+            if self._max_size is not None and len(self._entries) >= self._max_size:
+                self._evict_expired()
+                if len(self._entries) >= self._max_size:
+                    # the oldest inserted entry goes first
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (value, time.monotonic() + ttl)
+
+    def get_or_set(
+        self, key: Hashable, loader: Callable[[], Any], ttl_in_seconds: Optional[float] = None
+    ) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value, ttl_in_seconds)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
@@ -1,9 +1,12 @@
 import json
+import logging
 from http import HTTPStatus
 from functools import wraps
 from common.constant import ResponseStatus
 from common.exceptions import CustomException, FailedResponse
 from common.alerts import AlertsProcessor, DefaultProcessor
+from common.handler_metrics import handler_metrics, metrics_enabled_by_default
+from common.query_counter import log_repeated_queries, query_counter_enabled_by_default
 from common.utils import generate_lambda_response, format_response
 
 
@@ -11,6 +14,8 @@ def exception_handler(*decorator_args, **decorator_kwargs):
     ENVIRONMENT = decorator_kwargs.get("ENVIRONMENT", "Undefined")
     ALERTS_PROCESSOR = decorator_kwargs.get("ALERTS_PROCESSOR", DefaultProcessor())
     EXCEPTIONS_IGNORING_ALERT = decorator_kwargs.get("EXCEPTIONS_IGNORING_ALERT", ())
+    EMIT_METRICS = decorator_kwargs.get("EMIT_METRICS", metrics_enabled_by_default())
+    DETECT_REPEATED_QUERIES = decorator_kwargs.get("DETECT_REPEATED_QUERIES", query_counter_enabled_by_default())
     logger = decorator_kwargs["logger"]
 
     def decorator(handler):
@@ -20,10 +25,13 @@ def exception_handler(*decorator_args, **decorator_kwargs):
 
             handler_name = handler.__name__
             event = args[0] if len(args) > 0 else {}
-            logger.debug(f"Handler {handler_name} received event: {json.dumps(event)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Handler {handler_name} received event: {json.dumps(event)}")
 
             try:
-                return handler(*args, **kwargs)
+                with handler_metrics(handler_name, enabled=EMIT_METRICS), \
+                        log_repeated_queries(handler_name, enabled=DETECT_REPEATED_QUERIES):
+                    return handler(*args, **kwargs)
             except FailedResponse as exc:
                 logger.exception(f"Failed response [code {exc.code}]: {exc.message}", exc_info=False)
                 response = format_response(ResponseStatus.FAILED, exc.to_dict())
@@ -58,6 +66,8 @@ def worker_exception_handler(*decorator_args, **decorator_kwargs):
     ENVIRONMENT = decorator_kwargs.get("ENVIRONMENT", "Undefined")
     ALERTS_PROCESSOR = decorator_kwargs.get("ALERTS_PROCESSOR", DefaultProcessor())
     EXCEPTIONS_IGNORING_ALERT = decorator_kwargs.get("EXCEPTIONS_IGNORING_ALERT", ())
+    EMIT_METRICS = decorator_kwargs.get("EMIT_METRICS", metrics_enabled_by_default())
+    DETECT_REPEATED_QUERIES = decorator_kwargs.get("DETECT_REPEATED_QUERIES", query_counter_enabled_by_default())
     logger = decorator_kwargs["logger"]
 
     def decorator(handler):
@@ -66,10 +76,13 @@ def worker_exception_handler(*decorator_args, **decorator_kwargs):
         def wrapper(*args, **kwargs):
             handler_name = handler.__name__
             event = args[0] if len(args) > 0 else {}
-            logger.debug(f"Handler {handler_name} received event: {json.dumps(event)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Handler {handler_name} received event: {json.dumps(event)}")
 
             try:
-                return handler(*args, **kwargs)
+                with handler_metrics(handler_name, enabled=EMIT_METRICS), \
+                        log_repeated_queries(handler_name, enabled=DETECT_REPEATED_QUERIES):
+                    return handler(*args, **kwargs)
             except Exception as exc:
                 logger.exception(f"Exception in cron/trigger lambda handler: {handler_name}", exc_info=True)
                 if not isinstance(exc, EXCEPTIONS_IGNORING_ALERT):
@@ -0,0 +1,224 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+from common.sqlalchemy_hook import add_statement_listener
+
+DEFAULT_METRICS_NAMESPACE = "MarketplaceHandlers"
+
+# phase -> prefix of its Time and Calls metrics
+PHASES = {
+    "db": "DB",
+    "lambda": "Lambda",
+    "s3": "S3",
+    "aws": "AWS",
+    "http": "HTTP",
+}
+
+
+def metrics_enabled_by_default() -> bool:
+    return os.environ.get("HANDLER_METRICS_ENABLED", "false").lower() == "true"
+
+
+class HandlerMetrics:
+    """
+    Timing of one handler invocation. Time of every phase is the sum of its calls, so calls made
+    concurrently from worker threads can add up to more than the total handler time.
+    """
+
+    def __init__(self, handler_name: str):
+        self.handler_name = handler_name
+        self.started_at = time.perf_counter()
+        self.phase_times = {phase: 0.0 for phase in PHASES}
+        self.phase_calls = {phase: 0 for phase in PHASES}
+        self.endpoint_times = {}
+        self.endpoint_calls = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phase_times[phase] += seconds
+            self.phase_calls[phase] += 1
+
+    def record_endpoint(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self.endpoint_times[endpoint] = self.endpoint_times.get(endpoint, 0.0) + seconds
+            self.endpoint_calls[endpoint] = self.endpoint_calls.get(endpoint, 0) + 1
+
+    def to_emf(self, namespace: str, error: bool) -> dict:
+        """ CloudWatch embedded metric format, the log line is turned into metrics by CloudWatch Logs """
+        metrics = [{"Name": "Duration", "Unit": "Milliseconds"}, {"Name": "Errors", "Unit": "Count"}]
+        values = {
+            "Duration": round((time.perf_counter() - self.started_at) * 1000, 3),
+            "Errors": int(error),
+        }
+        for phase, prefix in PHASES.items():
+            metrics.append({"Name": f"{prefix}Time", "Unit": "Milliseconds"})
+            metrics.append({"Name": f"{prefix}Calls", "Unit": "Count"})
+            values[f"{prefix}Time"] = round(self.phase_times[phase] * 1000, 3)
+            values[f"{prefix}Calls"] = self.phase_calls[phase]
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {"Namespace": namespace, "Dimensions": [["Handler"]], "Metrics": metrics}
+                ],
+            },
+            "Handler": self.handler_name,
+            "FunctionName": os.environ.get("AWS_LAMBDA_FUNCTION_NAME"),
+            **values,
+        }
+
+    def endpoints_to_emf(self, namespace: str) -> List[dict]:
+        """ One EMF line per called endpoint, the endpoint is a dimension next to the handler """
+        metrics = [
+            {"Name": "EndpointTime", "Unit": "Milliseconds"},
+            {"Name": "EndpointCalls", "Unit": "Count"},
+        ]
+        timestamp = int(time.time() * 1000)
+        return [
+            {
+                "_aws": {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [
+                        {"Namespace": namespace, "Dimensions": [["Handler", "Endpoint"]], "Metrics": metrics}
+                    ],
+                },
+                "Handler": self.handler_name,
+                "Endpoint": endpoint,
+                "EndpointTime": round(self.endpoint_times[endpoint] * 1000, 3),
+                "EndpointCalls": self.endpoint_calls[endpoint],
+            }
+            for endpoint in sorted(self.endpoint_calls)
+        ]
+
+
+# A Lambda container runs one invocation at a time, a module level variable (unlike a context
+# variable) is also visible to the worker threads started by the handler
+_current_metrics: Optional[HandlerMetrics] = None
+_current_metrics_lock = threading.Lock()
+
+
+def get_current_metrics() -> Optional[HandlerMetrics]:
+    return _current_metrics
+
+
+def record_endpoint(endpoint: str, seconds: float) -> bool:
+    """ Adds a call of the named endpoint to the running handler, False outside of a handler """
+    metrics = _current_metrics
+    if metrics is None:
+        return False
+    metrics.record_endpoint(endpoint, seconds)
+    return True
+
+
+@contextmanager
+def timed(phase: str):
+    """ Adds the time of the block to the phase of the running handler, no-op outside of a handler """
+    metrics = _current_metrics
+    if metrics is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(phase, time.perf_counter() - started_at)
+
+
+@contextmanager
+def handler_metrics(handler_name: str, enabled: bool = True, namespace: Optional[str] = None):
+    """
+    Collects timings of the handler and writes them as EMF lines to stdout, one for the handler
+    and one per endpoint passed to record_endpoint. An exception leaving the block is counted
+    as an error. A handler called from another instrumented
+    handler is accounted to the outer one.
+    """
+    global _current_metrics
+    if not enabled:
+        yield
+        return
+    with _current_metrics_lock:
+        nested = _current_metrics is not None
+        if not nested:
+            _current_metrics = HandlerMetrics(handler_name)
+            metrics = _current_metrics
+    if nested:
+        yield
+        return
+
+    install_instrumentation()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        with _current_metrics_lock:
+            _current_metrics = None
+        namespace = namespace or os.environ.get("HANDLER_METRICS_NAMESPACE", DEFAULT_METRICS_NAMESPACE)
+        lines = [metrics.to_emf(namespace, error)] + metrics.endpoints_to_emf(namespace)
+        sys.stdout.write("".join(json.dumps(line) + "\n" for line in lines))
+        sys.stdout.flush()
+
+
+_instrumentation_installed = False
+_instrumentation_lock = threading.Lock()
+
+
+def install_instrumentation() -> None:
+    """ Hooks SQLAlchemy, botocore and requests once per container """
+    global _instrumentation_installed
+    with _instrumentation_lock:
+        if _instrumentation_installed:
+            return
+        _instrumentation_installed = True
+        _instrument_sqlalchemy()
+        _instrument_botocore()
+        _instrument_requests()
+
+
+def _record_db_time(statement: str, parameters, seconds: float) -> None:
+    metrics = _current_metrics
+    if metrics is not None:
+        metrics.record("db", seconds)
+
+
+def _instrument_sqlalchemy() -> None:
+    add_statement_listener(_record_db_time)
+
+
+def _instrument_botocore() -> None:
+    try:
+        from botocore.client import BaseClient
+    except ImportError:
+        return
+
+    make_api_call = BaseClient._make_api_call
+
+    def _make_api_call(client, operation_name, api_params):
+        service_name = client.meta.service_model.service_name
+        with timed(service_name if service_name in ("lambda", "s3") else "aws"):
+            return make_api_call(client, operation_name, api_params)
+
+    BaseClient._make_api_call = _make_api_call
+
+
+def _instrument_requests() -> None:
+    try:
+        from requests import Session
+    except ImportError:
+        return
+
+    send = Session.send
+
+    def _send(session, request, **kwargs):
+        with timed("http"):
+            return send(session, request, **kwargs)
+
+    Session.send = _send
@@ -0,0 +1,162 @@
+"""
+Reports the cold start import cost of every handler module declared in the serverless.yml files.
+Each module is imported in a fresh interpreter with -X importtime, the cost is split by the top
+level package that was imported, so heavy dependencies pulled in by a handler stand out.
+
+Run from the repository root:
+    python -m common.import_profiler
+    python -m common.import_profiler registry/serverless.yml contract_api/serverless.yml --top 5
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+HANDLER_PATTERN = re.compile(r"^\s*handler:\s*['\"]?([\w./-]+)['\"]?\s*$", re.MULTILINE)
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)\s*$")
+
+IMPORT_SCRIPT = """
+import time
+started_at = time.perf_counter()
+import {module}
+print((time.perf_counter() - started_at) * 1000)
+"""
+
+
+@dataclass
+class ImportedModule:
+    name: str
+    cumulative_us: int
+    children: List["ImportedModule"] = field(default_factory=list)
+
+
+@dataclass
+class HandlerImportCost:
+    module: str
+    handlers: List[str]
+    total_ms: Optional[float] = None
+    package_ms: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def find_handler_modules(serverless_files: List[str]) -> Dict[str, List[str]]:
+    """ Handler module -> functions, handlers are declared as path/to/module.function or package.module.function """
+    handler_modules = defaultdict(list)
+    for serverless_file in serverless_files:
+        with open(serverless_file) as f:
+            content = f.read()
+        for handler in HANDLER_PATTERN.findall(content):
+            module_path, _, function = handler.rpartition(".")
+            if module_path:
+                handler_modules[module_path.replace("/", ".")].append(function)
+    return dict(handler_modules)
+
+
+def parse_import_times(output: str) -> List[ImportedModule]:
+    """ Tree of the -X importtime output, a module is printed after the modules it imported """
+    pending_by_depth = defaultdict(list)
+    for line in output.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is None:
+            continue
+        _, cumulative_us, indent, name = match.groups()
+        depth = (len(indent) - 1) // 2
+        module = ImportedModule(name=name, cumulative_us=int(cumulative_us),
+                                children=pending_by_depth.pop(depth + 1, []))
+        pending_by_depth[depth].append(module)
+    return pending_by_depth[0]
+
+
+def get_package_import_times(roots: List[ImportedModule]) -> Dict[str, int]:
+    """ Cumulative time of every top level package, counted where it was first imported from another package """
+    package_times = defaultdict(int)
+
+    def visit(module: ImportedModule, parent_package: Optional[str]):
+        package = module.name.split(".")[0]
+        if package != parent_package:
+            package_times[package] += module.cumulative_us
+        for child in module.children:
+            visit(child, package)
+
+    for root in roots:
+        visit(root, None)
+    return dict(package_times)
+
+
+def run_import(module: str, root_dir: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root_dir, env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT.format(module=module)],
+        cwd=root_dir, env=env, capture_output=True, text=True
+    )
+
+
+def profile_handler_module(module: str, handlers: List[str], root_dir: str,
+                           baseline_modules: set) -> HandlerImportCost:
+    cost = HandlerImportCost(module=module, handlers=handlers)
+    result = run_import(module, root_dir)
+    if result.returncode != 0:
+        error_lines = [
+            line for line in result.stderr.splitlines() if line.strip() and not IMPORT_TIME_PATTERN.match(line)
+        ]
+        cost.error = error_lines[-1] if error_lines else f"exit code {result.returncode}"
+        return cost
+    cost.total_ms = float(result.stdout.strip().splitlines()[-1])
+    # modules imported by the interpreter start up are not part of the handler cost
+    roots = [root for root in parse_import_times(result.stderr) if root.name not in baseline_modules]
+    package_us = get_package_import_times(roots)
+    # the service package of the handler contains all the others, it is the total already
+    package_us.pop(module.split(".")[0], None)
+    cost.package_ms = {
+        package: us / 1000 for package, us in sorted(package_us.items(), key=lambda item: -item[1])
+    }
+    return cost
+
+
+def print_report(costs: List[HandlerImportCost], top: int) -> None:
+    failed = [cost for cost in costs if cost.error is not None]
+    profiled = sorted((cost for cost in costs if cost.error is None), key=lambda cost: -cost.total_ms)
+    for cost in profiled:
+        print(f"{cost.total_ms:9.1f} ms  {cost.module} ({len(cost.handlers)} handlers)")
+        for package, package_ms in list(cost.package_ms.items())[:top]:
+            print(f"{package_ms:21.1f} ms  {package}")
+    for cost in failed:
+        print(f"{'failed':>12}  {cost.module}: {cost.error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("serverless_files", nargs="*",
+                        help="serverless.yml files to read the handlers from, all services by default")
+    parser.add_argument("--top", type=int, default=10, help="packages listed per handler module")
+    parser.add_argument("--json", action="store_true", help="print the costs as json")
+    args = parser.parse_args()
+
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    serverless_files = args.serverless_files or sorted(glob.glob(os.path.join(root_dir, "*", "serverless.yml")))
+    handler_modules = find_handler_modules(serverless_files)
+
+    baseline = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"],
+                              capture_output=True, text=True)
+    baseline_modules = {root.name for root in parse_import_times(baseline.stderr)}
+
+    costs = [
+        profile_handler_module(module, handlers, root_dir, baseline_modules)
+        for module, handlers in sorted(handler_modules.items())
+    ]
+    if args.json:
+        print(json.dumps([cost.__dict__ for cost in costs], indent=2))
+    else:
+        print_report(costs, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,20 @@
 import json
 import os
-from typing import Optional, Union
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import boto3
+from botocore.config import Config
+
+from common.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+DEFAULT_INVOKE_MANY_MAX_WORKERS = 10
+DEFAULT_INVOKE_MANY_TIME_RESERVE_IN_MILLISECONDS = 1000
 
 
 class LambdaClientError(Exception):
@@ -10,14 +22,106 @@ class LambdaClientError(Exception):
         super().__init__(f"{lambda_client_name} response error: {message}")
 
 
+class LambdaClientDeadlineExceededError(LambdaClientError):
+    def __init__(self, lambda_client_name: str, lambda_function_arn: str):
+        super().__init__(lambda_client_name, f"deadline exceeded before {lambda_function_arn} responded")
+
+
+@dataclass
+class LambdaInvocationResult:
+    lambda_function_arn: str
+    data: Union[dict, list, None] = None
+    error: Optional[Exception] = None
+    latency_in_seconds: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class LambdaClient:
-    def __init__(self, region_name: str):
+    def __init__(self, region_name: str, max_pool_connections: int = DEFAULT_INVOKE_MANY_MAX_WORKERS):
+        # invoke_many shares the client between threads, each of them needs its own connection
+        config = Config(max_pool_connections=max_pool_connections)
         if os.environ.get("IS_SERVERLESS_OFFLINE") == "true": # for local building and running
             self._boto_client = boto3.client("lambda", region_name = region_name,
                                              endpoint_url = "http://localhost:3000", aws_access_key_id = "mock",
-                                             aws_secret_access_key = "mock")
+                                             aws_secret_access_key = "mock", config = config)
         else:
-            self._boto_client = boto3.client('lambda', region_name=region_name)
+            self._boto_client = boto3.client('lambda', region_name=region_name, config=config)
+
+    def invoke_many(
+        self,
+        invocations: List[Dict[str, Any]],
+        max_workers: int = DEFAULT_INVOKE_MANY_MAX_WORKERS,
+        get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
+        time_reserve_in_millis: int = DEFAULT_INVOKE_MANY_TIME_RESERVE_IN_MILLISECONDS,
+    ) -> List[LambdaInvocationResult]:
+        """
+        Runs several _invoke_lambda calls concurrently, every invocation is a dict of its keyword arguments.
+        Results are returned in the order of invocations, a failed call doesn't affect the others and
+        keeps its exception in the result. When get_remaining_time_in_millis of the Lambda context is
+        passed, calls still running time_reserve_in_millis before the end of the invocation are reported
+        as LambdaClientDeadlineExceededError, so the caller has time to respond.
+        """
+        results = [
+            LambdaInvocationResult(lambda_function_arn=invocation["lambda_function_arn"])
+            for invocation in invocations
+        ]
+        if not invocations:
+            return results
+
+        deadline = None
+        if get_remaining_time_in_millis is not None:
+            deadline = time.monotonic() + (get_remaining_time_in_millis() - time_reserve_in_millis) / 1000
+
+        def invoke(index: int) -> LambdaInvocationResult:
+            # every call fills its own result, results of calls that missed the deadline are dropped
+            result = LambdaInvocationResult(lambda_function_arn=invocations[index]["lambda_function_arn"])
+            if deadline is not None and time.monotonic() >= deadline:
+                result.error = LambdaClientDeadlineExceededError(self.__class__.__name__, result.lambda_function_arn)
+                return result
+            started_at = time.monotonic()
+            try:
+                result.data = self._invoke_lambda(**invocations[index])
+            except Exception as e:
+                result.error = e
+            result.latency_in_seconds = time.monotonic() - started_at
+            return result
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(invocations)))
+        try:
+            pending = {executor.submit(invoke, index): index for index in range(len(invocations))}
+            while pending:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+            for index in pending.values():
+                results[index].error = LambdaClientDeadlineExceededError(
+                    self.__class__.__name__, results[index].lambda_function_arn
+                )
+        finally:
+            # calls that missed the deadline are left to finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self._log_latencies(results)
+        return results
+
+    @staticmethod
+    def _log_latencies(results: List[LambdaInvocationResult]) -> None:
+        latencies = {}
+        for result in results:
+            if result.latency_in_seconds is not None:
+                latencies.setdefault(result.lambda_function_arn, []).append(result.latency_in_seconds)
+        for lambda_function_arn, target_latencies in latencies.items():
+            logger.info(
+                f"Invoked {lambda_function_arn} {len(target_latencies)} time(s), "
+                f"max latency {max(target_latencies) * 1000:.0f} ms, "
+                f"total {sum(target_latencies) * 1000:.0f} ms"
+            )
 
     def _invoke_lambda(
         self,
@@ -0,0 +1,41 @@
+import importlib
+
+
+class LazyModule:
+    """
+    Stands in for a module that is imported on the first attribute access, so a handler
+    pays for a heavy dependency only when its code path uses it.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __setattr__(self, key, value):
+        # e.g. mock.patch of a module attribute has to reach the real module
+        setattr(self._load(), key, value)
+
+    def __delattr__(self, item):
+        delattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """ Usage: pandas = lazy_import("pandas"), then pandas.DataFrame imports pandas on the first call """
+    return LazyModule(name)
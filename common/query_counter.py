@@ -0,0 +1,132 @@
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from common.logger import get_logger
+from common.sqlalchemy_hook import add_statement_listener
+
+
+logger = get_logger(__name__)
+
+DEFAULT_REPEATED_STATEMENT_THRESHOLD = 3
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_STRING_LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_PATTERN = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|%\(\w+\)s)\s*,?)+\)", re.IGNORECASE)
+
+
+def query_counter_enabled_by_default() -> bool:
+    return os.environ.get("QUERY_COUNTER_ENABLED", "false").lower() == "true"
+
+
+def normalize_statement(statement: str) -> str:
+    """ Replaces literals inlined into the SQL with placeholders, so loops over values are grouped """
+    statement = _STRING_LITERAL_PATTERN.sub("?", statement)
+    statement = _NUMBER_LITERAL_PATTERN.sub("?", statement)
+    statement = _IN_LIST_PATTERN.sub("IN (...)", statement)
+    return _WHITESPACE_PATTERN.sub(" ", statement).strip()
+
+
+class QueryCounter:
+    """ Statements executed while the counter is active, from any thread """
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self._variants: Dict[str, set] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, parameters=None) -> None:
+        normalized_statement = normalize_statement(statement)
+        with self._lock:
+            self.statements.append(normalized_statement)
+            # inlined literals make the raw statement differ instead of the parameters
+            self._variants[normalized_statement].add((statement, repr(parameters)))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated_statements(self, threshold: int = DEFAULT_REPEATED_STATEMENT_THRESHOLD) -> Dict[str, int]:
+        """ Statements executed at least threshold times with different parameters, likely N+1 queries """
+        with self._lock:
+            return {
+                statement: count
+                for statement, count in Counter(self.statements).most_common()
+                if count >= threshold and len(self._variants[statement]) > 1
+            }
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries executed"]
+        for statement, count in Counter(self.statements).most_common():
+            lines.append(f"{count:5d} x {statement}")
+        return "\n".join(lines)
+
+
+_active_counters: List[QueryCounter] = []
+_active_counters_lock = threading.Lock()
+
+
+def record_query(statement: str, parameters=None) -> None:
+    """ Hook for code executing SQL without SQLAlchemy, e.g. common.repository.Repository """
+    if not _active_counters:
+        return
+    with _active_counters_lock:
+        counters = list(_active_counters)
+    for counter in counters:
+        counter.record(statement, parameters)
+
+
+@contextmanager
+def count_queries():
+    """ Counts queries executed inside the block, counters can be nested """
+    install_sqlalchemy_hook()
+    counter = QueryCounter()
+    with _active_counters_lock:
+        _active_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        with _active_counters_lock:
+            _active_counters.remove(counter)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, repeated_statement_threshold: Optional[int] = None):
+    """
+    Fails the test when the block executes more than max_queries queries or, when
+    repeated_statement_threshold is set, any statement repeats that often with different parameters.
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > max_queries:
+        raise AssertionError(f"Expected at most {max_queries} queries, {counter.report()}")
+    if repeated_statement_threshold is not None:
+        repeated_statements = counter.repeated_statements(repeated_statement_threshold)
+        if repeated_statements:
+            raise AssertionError(f"Repeated statements {repeated_statements}, {counter.report()}")
+
+
+@contextmanager
+def log_repeated_queries(name: str, enabled: bool = True,
+                         threshold: int = DEFAULT_REPEATED_STATEMENT_THRESHOLD):
+    """ Logs the query count of the block and a warning for every likely N+1 statement """
+    if not enabled:
+        yield
+        return
+    with count_queries() as counter:
+        yield
+    logger.info(f"{name} executed {counter.count} queries")
+    for statement, count in counter.repeated_statements(threshold).items():
+        logger.warning(f"Possible N+1 in {name}: {count} x {statement}")
+
+
+def _record_executed_statement(statement: str, parameters, seconds: float) -> None:
+    record_query(statement, parameters)
+
+
+def install_sqlalchemy_hook() -> None:
+    add_statement_listener(_record_executed_statement)
@@ -1,6 +1,8 @@
 import pymysql
 
+from common.handler_metrics import timed
 from common.logger import get_logger
+from common.query_counter import record_query
 
 logger = get_logger(__name__)
 
@@ -36,8 +38,9 @@ class Repository:
 
     def __execute_query(self, query, params=None):
         result = list()
+        record_query(query, params)
         try:
-            with self.connection.cursor() as cursor:
+            with self.connection.cursor() as cursor, timed("db"):
                 qry_resp = cursor.execute(query, params)
                 db_rows = cursor.fetchall()
                 if cursor.description is not None:
@@ -57,8 +60,9 @@ class Repository:
         return result
 
     def bulk_query(self, query, params=None):
+        record_query(query, params)
         try:
-            with self.connection.cursor() as cursor:
+            with self.connection.cursor() as cursor, timed("db"):
                 result = cursor.executemany(query, params)
                 self.connection.commit()
                 return result
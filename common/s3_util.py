@@ -1,17 +1,44 @@
+import threading
 from urllib.parse import urlparse
 
 import boto3
+from botocore.config import Config
+
+from common.boto_utils import DEFAULT_MAX_POOL_CONNECTIONS
 
 
 # create an STS client object that represents a live connection to the
 # STS service
 
 
+_s3_clients = {}
+_s3_clients_lock = threading.Lock()
+
+
 class S3Util(object):
 
-    def __init__(self, aws_access_key, aws_secret_key):
+    def __init__(self, aws_access_key, aws_secret_key, max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS):
         self.aws_access_key = aws_access_key
         self.aws_secret_key = aws_secret_key
+        self.max_pool_connections = max_pool_connections
+
+    def get_s3_client_from_key(self):
+        """
+            Client is shared by all instances with the same credentials, unlike resources it is
+            thread-safe and keeps its connection pool between calls.
+        """
+        key = (self.aws_access_key, self.aws_secret_key, self.max_pool_connections)
+        s3_client = _s3_clients.get(key)
+        if s3_client is None:
+            with _s3_clients_lock:
+                s3_client = _s3_clients.get(key)
+                if s3_client is None:
+                    s3_client = boto3.session.Session(
+                        aws_access_key_id=self.aws_access_key,
+                        aws_secret_access_key=self.aws_secret_key
+                    ).client('s3', config=Config(max_pool_connections=self.max_pool_connections))
+                    _s3_clients[key] = s3_client
+        return s3_client
 
     def get_s3_resource_from_key(self):
         s3_resource = boto3.resource(
@@ -59,9 +86,7 @@ class S3Util(object):
 
     def push_io_bytes_to_s3(self, key, bucket_name, io_bytes):
         s3_url = 'https://{}.s3.amazonaws.com/{}'.format(bucket_name, key)
-        s3_resource = self.get_s3_resource_from_key()
-        obj = s3_resource.Object(bucket_name, key)
-        obj.upload_fileobj(io_bytes)
+        self.get_s3_client_from_key().upload_fileobj(io_bytes, bucket_name, key)
         return s3_url
 
     def get_bucket_and_key_from_url(self, url):
@@ -69,11 +94,9 @@ class S3Util(object):
         return parsed_url.hostname.split(".")[0], parsed_url.path[1:]
 
     def delete_file_from_s3(self, url):
-        s3_resource = self.get_s3_resource_from_key()
         bucket, key = self.get_bucket_and_key_from_url(url)
-        result = s3_resource.Object(bucket, key).delete()
+        result = self.get_s3_client_from_key().delete_object(Bucket=bucket, Key=key)
         return result
 
     def push_file_to_s3(self, file_path, bucket, key):
-        s3_resource = self.get_s3_resource_from_key()
-        s3_resource.meta.client.upload_file(file_path, bucket, key)
+        self.get_s3_client_from_key().upload_file(file_path, bucket, key)
@@ -0,0 +1,112 @@
+import json
+import threading
+from typing import Callable, Dict, List, Tuple, Type, Union
+
+from common.boto_utils import get_boto_client
+from common.cache import TTLCache
+from common.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+DEFAULT_SECRET_TTL_IN_SECONDS = 900
+SSM_GET_PARAMETERS_MAX_NAMES = 10
+
+
+class SecretNotFoundException(Exception):
+    def __init__(self, names: List[str]):
+        super().__init__(f"Secrets not found: {names}")
+
+
+class SecretCache:
+    """
+    Keeps decrypted SSM parameters and Secrets Manager secrets in memory of a warm Lambda container.
+    Callers that detect a stale secret (e.g. authentication with it fails after a rotation) should
+    use call_with_refresh or invalidate, so the next lookup goes to AWS again.
+    """
+
+    def __init__(self, region_name: str, ttl_in_seconds: float = DEFAULT_SECRET_TTL_IN_SECONDS,
+                 max_attempts: int = 2):
+        self.region_name = region_name
+        self._max_attempts = max_attempts
+        self._cache = TTLCache(ttl_in_seconds)
+
+    def _get_client(self, service_name: str):
+        return get_boto_client(service_name, region_name=self.region_name, max_attempts=self._max_attempts)
+
+    def get_ssm_parameter(self, name: str, force_refresh: bool = False) -> str:
+        return self.get_ssm_parameters([name], force_refresh=force_refresh)[name]
+
+    def get_ssm_parameters(self, names: List[str], force_refresh: bool = False) -> Dict[str, str]:
+        """ Returns several parameters, all missing ones are fetched with as few GetParameters calls as possible """
+        values = {}
+        if not force_refresh:
+            for name in names:
+                value = self._cache.get(('ssm', name))
+                if value is not None:
+                    values[name] = value
+        missing_names = [name for name in names if name not in values]
+        if missing_names:
+            fetched_values = self._fetch_ssm_parameters(missing_names)
+            for name, value in fetched_values.items():
+                self._cache.set(('ssm', name), value)
+            values.update(fetched_values)
+        return values
+
+    def prefetch_ssm_parameters(self, names: List[str]) -> None:
+        self.get_ssm_parameters(names)
+
+    def _fetch_ssm_parameters(self, names: List[str]) -> Dict[str, str]:
+        ssm = self._get_client('ssm')
+        values = {}
+        invalid_names = []
+        for i in range(0, len(names), SSM_GET_PARAMETERS_MAX_NAMES):
+            response = ssm.get_parameters(Names=names[i:i + SSM_GET_PARAMETERS_MAX_NAMES], WithDecryption=True)
+            for parameter in response['Parameters']:
+                values[parameter['Name']] = parameter['Value']
+            invalid_names.extend(response.get('InvalidParameters', []))
+        if invalid_names:
+            raise SecretNotFoundException(invalid_names)
+        return values
+
+    def get_secret(self, secret_name: str, force_refresh: bool = False) -> str:
+        """ Same contract as BotoUtils.get_parameter_value_from_secrets_manager """
+        if not force_refresh:
+            value = self._cache.get(('secretsmanager', secret_name))
+            if value is not None:
+                return value
+        secret_string = self._get_client('secretsmanager').get_secret_value(SecretId=secret_name)['SecretString']
+        value = json.loads(secret_string)[secret_name]
+        self._cache.set(('secretsmanager', secret_name), value)
+        return value
+
+    def invalidate(self, *names: str) -> None:
+        if not names:
+            self._cache.clear()
+            return
+        self._cache.invalidate_where(lambda key: key[1] in names)
+
+    def call_with_refresh(self, func: Callable, names: List[str],
+                          refresh_on: Union[Type[Exception], Tuple[Type[Exception], ...]] = Exception):
+        """
+        Calls func, which reads the given secrets from this cache. If it fails with refresh_on,
+        the secrets are dropped from the cache and func is retried once with fresh values.
+        """
+        try:
+            return func()
+        except refresh_on as e:
+            logger.info(f"Refreshing secrets {names} after failure: {repr(e)}")
+            self.invalidate(*names)
+            return func()
+
+
+_secret_caches = {}
+_secret_caches_lock = threading.Lock()
+
+
+def get_secret_cache(region_name: str) -> SecretCache:
+    """ Returns the container-wide secret cache for the region """
+    with _secret_caches_lock:
+        if region_name not in _secret_caches:
+            _secret_caches[region_name] = SecretCache(region_name)
+        return _secret_caches[region_name]
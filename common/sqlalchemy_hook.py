@@ -0,0 +1,53 @@
+import threading
+import time
+from typing import Callable, List
+
+# listener(statement, parameters, seconds), called once a statement finished or failed
+StatementListener = Callable[[str, object, float], None]
+
+_statement_listeners: List[StatementListener] = []
+_statement_listeners_lock = threading.Lock()
+_hook_installed = False
+
+
+def add_statement_listener(listener: StatementListener) -> None:
+    """ Calls the listener for every statement executed by any SQLAlchemy engine, a listener is added once """
+    with _statement_listeners_lock:
+        if listener not in _statement_listeners:
+            _statement_listeners.append(listener)
+        _install_hook()
+
+
+def _notify(statement: str, parameters, started_at: float) -> None:
+    seconds = time.perf_counter() - started_at
+    for listener in list(_statement_listeners):
+        listener(statement, parameters, seconds)
+
+
+def _install_hook() -> None:
+    global _hook_installed
+    if _hook_installed:
+        return
+    _hook_installed = True
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+    except ImportError:
+        return
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sqlalchemy_hook_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _notify(statement, parameters, conn.info["sqlalchemy_hook_started_at"].pop())
+
+    @event.listens_for(Engine, "handle_error")
+    def handle_error(exception_context):
+        # after_cursor_execute is not called for a failed statement
+        if exception_context.connection is None:
+            return
+        started_at_stack = exception_context.connection.info.get("sqlalchemy_hook_started_at")
+        if started_at_stack:
+            _notify(exception_context.statement, exception_context.parameters, started_at_stack.pop())
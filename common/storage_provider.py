@@ -9,10 +9,12 @@ from zipfile import ZipFile
 from common.exceptions import BadRequestException
 from contract_api.config import IPFS_URL
 from common.exceptions import LighthouseInternalException
+from common.lazy_import import lazy_import
 from common.logger import get_logger
 
 import ipfshttpclient
-from lighthouseweb3 import Lighthouse
+
+lighthouseweb3 = lazy_import("lighthouseweb3")
 
 logger = get_logger(__name__)
 
@@ -48,7 +50,7 @@ class StorageProvider:
         if lighthouse_token is None or lighthouse_token == "":
             lighthouse_token = "read_only_token"
         self.__ipfs_util = IPFSUtil(IPFS_URL["url"], IPFS_URL["port"])
-        self.__lighthouse_client = Lighthouse(lighthouse_token)
+        self.__lighthouse_client = lighthouseweb3.Lighthouse(lighthouse_token)
 
     def get(self, metadata_uri: str, to_decode: bool = True) -> Union[dict, bytes]:
         """
@@ -1,5 +1,9 @@
 import base64
+import json
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
 from web3 import Web3
 
@@ -93,3 +97,17 @@ class TestUtils(unittest.TestCase):
         signature = self.obj_utils.generate_signature(data_types=data_types, values=values, signer_key=SIGNER_KEY)
         _, _, _ = Web3.to_int(hexstr="0x" + signature[-2:]), signature[:66], "0x" + signature[66:130]
         assert(signature == "0x7e50ac20909da29f72ed2ab9cf6c6375f853d8eddfcf3ce33806a4e27b30bcbd5366c41a59647467f0519b0bfc89a50d890b683cd797d5566ba03937f82819c41b")
+
+
+class TestLoadContract(unittest.TestCase):
+    def test_contract_file_is_parsed_once(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"11155111": {"address": "0x1"}}, f)
+        self.addCleanup(os.remove, f.name)
+
+        with patch("common.blockchain_util.json.load", wraps=json.load) as json_load:
+            contract = BlockChainUtil.load_contract(f.name)
+            self.assertIs(BlockChainUtil.load_contract(f.name), contract)
+
+        self.assertEqual(contract, {"11155111": {"address": "0x1"}})
+        json_load.assert_called_once()
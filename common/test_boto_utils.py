@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from common.boto_utils import BotoUtils, S3TransferException, _run_concurrently, clear_boto_clients, get_boto_client
+
+
+class TestGetBotoClient(unittest.TestCase):
+    def setUp(self):
+        clear_boto_clients()
+        self.addCleanup(clear_boto_clients)
+        patcher = patch("boto3.client", side_effect=lambda *args, **kwargs: Mock())
+        self.mock_boto_client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_client_shared_for_same_arguments(self):
+        client = get_boto_client("ssm", region_name="us-east-1", max_attempts=1)
+
+        self.assertIs(get_boto_client("ssm", region_name="us-east-1", max_attempts=1), client)
+        self.assertEqual(self.mock_boto_client.call_count, 1)
+
+    def test_client_per_arguments(self):
+        clients = [
+            get_boto_client("ssm"),
+            get_boto_client("ssm", region_name="us-east-1"),
+            get_boto_client("ssm", region_name="us-east-1", max_attempts=2),
+            get_boto_client("ssm", region_name="us-east-1", max_attempts=2, read_timeout=5),
+            get_boto_client("ssm", region_name="us-east-1", max_attempts=2, max_pool_connections=50),
+            get_boto_client("lambda", region_name="us-east-1"),
+        ]
+
+        self.assertEqual(len({id(client) for client in clients}), len(clients))
+
+    def test_client_config(self):
+        get_boto_client("lambda", region_name="us-east-1", max_attempts=1, connect_timeout=2, read_timeout=30,
+                        max_pool_connections=20)
+
+        config = self.mock_boto_client.call_args.kwargs["config"]
+        self.assertEqual(config.retries, {"max_attempts": 1})
+        self.assertEqual(config.connect_timeout, 2)
+        self.assertEqual(config.read_timeout, 30)
+        self.assertEqual(config.max_pool_connections, 20)
+
+    def test_clear_boto_clients(self):
+        client = get_boto_client("s3")
+        clear_boto_clients()
+
+        self.assertIsNot(get_boto_client("s3"), client)
+
+    def test_custom_config_client_not_shared(self):
+        boto_utils = BotoUtils(region_name="us-east-1")
+        config = Config(read_timeout=1)
+
+        boto_utils._get_client("ssm", config=config)
+        boto_utils._get_client("ssm", config=config)
+
+        self.assertEqual(self.mock_boto_client.call_count, 2)
+
+
+
+class TestS3Transfers(unittest.TestCase):
+    def setUp(self):
+        self.s3_client = Mock()
+        self.s3_client.delete_objects.return_value = {}
+        patcher = patch("common.boto_utils.get_boto_client", return_value=self.s3_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.boto_utils = BotoUtils(region_name="us-east-1")
+
+    def test_run_concurrently_collects_failures(self):
+        def func(item):
+            if item % 2:
+                raise ValueError(item)
+            return item
+
+        failures = _run_concurrently(func, list(range(6)), max_workers=3)
+
+        self.assertEqual(sorted(failures), [(1, repr(ValueError(1))), (3, repr(ValueError(3))),
+                                            (5, repr(ValueError(5)))])
+        self.assertEqual(_run_concurrently(func, [], max_workers=3), [])
+
+    def test_delete_objects_in_batches(self):
+        keys = [f"key_{i}" for i in range(2500)]
+
+        failures = BotoUtils.delete_objects_in_batches(bucket="bucket", keys=keys)
+
+        self.assertEqual(failures, [])
+        batches = [call.kwargs["Delete"]["Objects"] for call in self.s3_client.delete_objects.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [1000, 1000, 500])
+        self.assertEqual([obj["Key"] for batch in batches for obj in batch], keys)
+
+    def test_delete_objects_in_batches_failures(self):
+        error = ClientError({"Error": {"Code": "SlowDown", "Message": "Slow down"}}, "DeleteObjects")
+        self.s3_client.delete_objects.side_effect = [
+            {"Errors": [{"Key": "key_1", "Code": "AccessDenied", "Message": "Access Denied"}]},
+            error
+        ]
+
+        failures = BotoUtils.delete_objects_in_batches(bucket="bucket", keys=[f"key_{i}" for i in range(1002)])
+
+        self.assertEqual(failures, [("key_1", "AccessDenied: Access Denied"),
+                                    ("key_1000", repr(error)), ("key_1001", repr(error))])
+
+    def test_clear_s3_files_partial_errors(self):
+        self.s3_client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "stubs/a.py"}, {"Key": "stubs/b.py"}]}
+        ]
+        self.s3_client.delete_objects.return_value = {
+            "Errors": [{"Key": "stubs/b.py", "Code": "AccessDenied", "Message": "Access Denied"}]
+        }
+
+        with self.assertRaisesRegex(Exception, "S3TransferException"):
+            BotoUtils.clear_s3_files(bucket="bucket", key="stubs")
+
+    def test_move_s3_objects_keeps_sources_that_were_not_copied(self):
+        self.s3_client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "source/a.py"}, {"Key": "source/b.py"}, {"Key": "source/c.py"}]}
+        ]
+
+        def copy(source, bucket, key, Config):
+            if source["Key"] == "source/b.py":
+                raise ValueError("copy failed")
+
+        self.s3_client.copy.side_effect = copy
+
+        with self.assertRaises(S3TransferException) as context:
+            self.boto_utils.move_s3_objects("source_bucket", "source/", "target_bucket", "target/")
+
+        self.assertEqual(context.exception.failures, [("source/b.py", repr(ValueError("copy failed")))])
+        deleted_keys = [obj["Key"] for obj in self.s3_client.delete_objects.call_args.kwargs["Delete"]["Objects"]]
+        self.assertEqual(deleted_keys, ["source/a.py", "source/c.py"])
+
+    def test_upload_folder_contents_to_s3_failure(self):
+        def upload_file(path, bucket, key, Config):
+            if key.endswith("b.txt"):
+                raise ValueError("upload failed")
+
+        self.s3_client.upload_file.side_effect = upload_file
+
+        with tempfile.TemporaryDirectory() as folder_path:
+            for filename in ("a.txt", "b.txt"):
+                with open(os.path.join(folder_path, filename), "w") as f:
+                    f.write(filename)
+
+            with self.assertRaises(S3TransferException) as context:
+                self.boto_utils.upload_folder_contents_to_s3(folder_path, "bucket", "assets")
+
+        self.assertEqual(context.exception.failures,
+                         [((os.path.join(folder_path, "b.txt"), "assets/b.txt"), repr(ValueError("upload failed")))])
+        self.assertEqual(self.s3_client.upload_file.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from common import cache
+from common.cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = patch.object(cache.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_entry_expires_after_ttl(self):
+        ttl_cache = TTLCache(ttl_in_seconds=10)
+        ttl_cache.set("key", "value")
+
+        self.now += 9.9
+        self.assertEqual(ttl_cache.get("key"), "value")
+
+        self.now += 0.1
+        self.assertIsNone(ttl_cache.get("key"))
+        self.assertEqual(ttl_cache.get("key", "default"), "default")
+
+    def test_entry_ttl_overrides_default_ttl(self):
+        ttl_cache = TTLCache(ttl_in_seconds=10)
+        ttl_cache.set("short", 1, ttl_in_seconds=1)
+        ttl_cache.set("long", 2)
+
+        self.now += 5
+        self.assertIsNone(ttl_cache.get("short"))
+        self.assertEqual(ttl_cache.get("long"), 2)
+
+    def test_oldest_entry_evicted_when_full(self):
+        ttl_cache = TTLCache(ttl_in_seconds=10, max_size=2)
+        ttl_cache.set("first", 1)
+        ttl_cache.set("second", 2)
+        ttl_cache.set("third", 3)
+
+        self.assertIsNone(ttl_cache.get("first"))
+        self.assertEqual(ttl_cache.get("second"), 2)
+        self.assertEqual(ttl_cache.get("third"), 3)
+
+    def test_expired_entries_evicted_before_live_ones(self):
+        ttl_cache = TTLCache(ttl_in_seconds=10, max_size=2)
+        ttl_cache.set("live", 1)
+        ttl_cache.set("expiring", 2, ttl_in_seconds=1)
+
+        self.now += 5
+        ttl_cache.set("new", 3)
+
+        self.assertEqual(ttl_cache.get("live"), 1)
+        self.assertEqual(ttl_cache.get("new"), 3)
+
+    def test_get_or_set_calls_loader_once(self):
+        ttl_cache = TTLCache(ttl_in_seconds=10)
+        loader = Mock(return_value=None)
+
+        self.assertIsNone(ttl_cache.get_or_set("key", loader))
+        self.assertIsNone(ttl_cache.get_or_set("key", loader))
+        loader.assert_called_once()
+
+        self.now += 10
+        ttl_cache.get_or_set("key", loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_invalidate(self):
+        ttl_cache = TTLCache(ttl_in_seconds=10)
+        for key in [("org", "a"), ("org", "b"), ("other", "a")]:
+            ttl_cache.set(key, True)
+
+        ttl_cache.invalidate(("other", "a"))
+        self.assertIsNone(ttl_cache.get(("other", "a")))
+
+        ttl_cache.invalidate_where(lambda key: key[0] == "org")
+        self.assertIsNone(ttl_cache.get(("org", "a")))
+        self.assertIsNone(ttl_cache.get(("org", "b")))
+
+
+if __name__ == "__main__":
+    unittest.main()
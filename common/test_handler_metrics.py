@@ -0,0 +1,172 @@
+import io
+import json
+import unittest
+from unittest.mock import patch
+
+import boto3
+import requests
+from botocore.stub import Stubber
+from requests.adapters import BaseAdapter
+from sqlalchemy import create_engine, text
+
+from common.handler_metrics import PHASES, handler_metrics, record_endpoint
+
+
+class StaticResponseAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.request = request
+        response.url = request.url
+        response.raw = io.BytesIO(b"{}")
+        return response
+
+    def close(self):
+        pass
+
+
+class TestHandlerMetrics(unittest.TestCase):
+    def run_handler(self, handler, handler_name="test_handler", namespace="TestNamespace"):
+        """ Runs the handler inside handler_metrics, returns the EMF lines written to stdout """
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            try:
+                with handler_metrics(handler_name, namespace=namespace):
+                    handler()
+            finally:
+                lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        return lines
+
+    def get_stubbed_client(self, service_name, operation_name, response):
+        client = boto3.client(
+            service_name, region_name="us-east-1", aws_access_key_id="key", aws_secret_access_key="secret"
+        )
+        stubber = Stubber(client)
+        stubber.add_response(operation_name, response)
+        stubber.activate()
+        self.addCleanup(stubber.deactivate)
+        return client
+
+    def test_emf_line(self):
+        lines = self.run_handler(lambda: None)
+
+        self.assertEqual(len(lines), 1)
+        emf = lines[0]
+        cloudwatch_metrics = emf["_aws"]["CloudWatchMetrics"]
+        self.assertEqual(len(cloudwatch_metrics), 1)
+        self.assertEqual(cloudwatch_metrics[0]["Namespace"], "TestNamespace")
+        self.assertEqual(cloudwatch_metrics[0]["Dimensions"], [["Handler"]])
+        expected_names = ["Duration", "Errors"]
+        for prefix in PHASES.values():
+            expected_names += [f"{prefix}Time", f"{prefix}Calls"]
+        self.assertEqual([metric["Name"] for metric in cloudwatch_metrics[0]["Metrics"]], expected_names)
+        for name in expected_names:
+            self.assertIn(name, emf)
+        self.assertIsInstance(emf["_aws"]["Timestamp"], int)
+        self.assertEqual(emf["Handler"], "test_handler")
+        self.assertEqual(emf["Errors"], 0)
+        self.assertGreaterEqual(emf["Duration"], 0)
+
+    def test_error_is_flagged_and_raised(self):
+        def failing_handler():
+            raise ValueError("failed")
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with self.assertRaises(ValueError):
+                with handler_metrics("failing_handler"):
+                    failing_handler()
+
+        emf = json.loads(stdout.getvalue())
+        self.assertEqual(emf["Handler"], "failing_handler")
+        self.assertEqual(emf["Errors"], 1)
+
+    def test_nested_handler_is_counted_once(self):
+        engine = create_engine("sqlite://")
+
+        def outer_handler():
+            with handler_metrics("inner_handler"), engine.connect() as connection:
+                connection.execute(text("select 1"))
+
+        lines = self.run_handler(outer_handler, handler_name="outer_handler")
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["Handler"], "outer_handler")
+        self.assertEqual(lines[0]["DBCalls"], 1)
+
+    def test_endpoint_lines(self):
+        def handler():
+            record_endpoint("get_call_events", 0.01)
+            record_endpoint("get_call_events", 0.02)
+            record_endpoint("get_logs", 0.005)
+
+        lines = self.run_handler(handler)
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual([line.get("Endpoint") for line in lines], [None, "get_call_events", "get_logs"])
+        self.assertEqual(lines[1]["EndpointCalls"], 2)
+        self.assertAlmostEqual(lines[1]["EndpointTime"], 30, places=3)
+        self.assertEqual(lines[1]["Handler"], "test_handler")
+        self.assertEqual(lines[1]["_aws"]["CloudWatchMetrics"][0]["Dimensions"], [["Handler", "Endpoint"]])
+        self.assertFalse(record_endpoint("get_logs", 0.005))
+
+    def test_disabled_handler_writes_nothing(self):
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with handler_metrics("test_handler", enabled=False):
+                pass
+
+        self.assertEqual(stdout.getvalue(), "")
+
+    def test_db_phase(self):
+        engine = create_engine("sqlite://")
+
+        def handler():
+            with engine.connect() as connection:
+                connection.execute(text("select 1"))
+                connection.execute(text("select 2"))
+                with self.assertRaises(Exception):
+                    connection.execute(text("select * from missing_table"))
+
+        emf = self.run_handler(handler)[0]
+
+        # the failed statement is counted too
+        self.assertEqual(emf["DBCalls"], 3)
+        self.assertGreater(emf["DBTime"], 0)
+        self.assertEqual((emf["LambdaCalls"], emf["S3Calls"], emf["AWSCalls"], emf["HTTPCalls"]), (0, 0, 0, 0))
+
+    def test_aws_phases(self):
+        def handler():
+            lambda_client = self.get_stubbed_client("lambda", "invoke", {"StatusCode": 200})
+            lambda_client.invoke(FunctionName="function")
+            s3_client = self.get_stubbed_client("s3", "list_buckets", {"Buckets": []})
+            s3_client.list_buckets()
+            ssm_client = self.get_stubbed_client("ssm", "get_parameter", {"Parameter": {"Value": "value"}})
+            ssm_client.get_parameter(Name="name")
+
+        emf = self.run_handler(handler)[0]
+
+        self.assertEqual((emf["LambdaCalls"], emf["S3Calls"], emf["AWSCalls"]), (1, 1, 1))
+        self.assertEqual((emf["DBCalls"], emf["HTTPCalls"]), (0, 0))
+
+    def test_http_phase(self):
+        def handler():
+            with requests.Session() as session:
+                session.mount("http://", StaticResponseAdapter())
+                session.get("http://example.com")
+
+        emf = self.run_handler(handler)[0]
+
+        self.assertEqual(emf["HTTPCalls"], 1)
+        self.assertEqual((emf["DBCalls"], emf["LambdaCalls"], emf["AWSCalls"]), (0, 0, 0))
+
+    def test_calls_outside_of_handler_are_not_recorded(self):
+        engine = create_engine("sqlite://")
+        self.run_handler(lambda: None)
+        with engine.connect() as connection:
+            connection.execute(text("select 1"))
+
+        emf = self.run_handler(lambda: None)[0]
+
+        self.assertEqual(emf["DBCalls"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
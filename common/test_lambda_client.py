@@ -0,0 +1,73 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from common.lambda_client import LambdaClient, LambdaClientDeadlineExceededError, LambdaClientError
+
+
+class TestInvokeMany(unittest.TestCase):
+    def setUp(self):
+        with patch("boto3.client"):
+            self.lambda_client = LambdaClient(region_name="us-east-1")
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def mock_invoke_lambda(self, lambda_function_arn, body=None, **kwargs):
+        if body.get("block"):
+            self.release.wait(5)
+        time.sleep(body.get("sleep", 0))
+        if body.get("fail"):
+            raise LambdaClientError("LambdaClient", lambda_function_arn)
+        return {"arn": lambda_function_arn}
+
+    def invoke_many(self, bodies, **kwargs):
+        invocations = [{"lambda_function_arn": f"arn_{i}", "body": body} for i, body in enumerate(bodies)]
+        with patch.object(self.lambda_client, "_invoke_lambda", side_effect=self.mock_invoke_lambda):
+            return self.lambda_client.invoke_many(invocations, **kwargs)
+
+    def test_results_in_order_of_invocations(self):
+        results = self.invoke_many([{"sleep": 0.05}, {"sleep": 0.02}, {}])
+
+        self.assertEqual([result.lambda_function_arn for result in results], ["arn_0", "arn_1", "arn_2"])
+        self.assertEqual([result.data for result in results], [{"arn": "arn_0"}, {"arn": "arn_1"}, {"arn": "arn_2"}])
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_failed_call_does_not_affect_others(self):
+        results = self.invoke_many([{}, {"fail": True}, {}], max_workers=1)
+
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertIsInstance(results[1].error, LambdaClientError)
+        self.assertIsNone(results[1].data)
+        self.assertEqual(results[2].data, {"arn": "arn_2"})
+
+    def test_deadline_exceeded(self):
+        results = self.invoke_many([{}, {"block": True}, {}], get_remaining_time_in_millis=lambda: 1200,
+                                   time_reserve_in_millis=1000)
+
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertIsInstance(results[1].error, LambdaClientDeadlineExceededError)
+        self.assertIsNone(results[1].latency_in_seconds)
+
+    def test_calls_not_started_before_deadline(self):
+        started_at = time.monotonic()
+        results = self.invoke_many([{"block": True}, {}], max_workers=1, get_remaining_time_in_millis=lambda: 1100,
+                                   time_reserve_in_millis=1000)
+
+        self.assertLess(time.monotonic() - started_at, 1)
+        self.assertTrue(all(isinstance(result.error, LambdaClientDeadlineExceededError) for result in results))
+
+    def test_latency_recorded(self):
+        with self.assertLogs("common.lambda_client", level="INFO") as logs:
+            results = self.invoke_many([{"sleep": 0.05}, {"fail": True}])
+
+        self.assertGreaterEqual(results[0].latency_in_seconds, 0.05)
+        self.assertIsNotNone(results[1].latency_in_seconds)
+        self.assertTrue(any("Invoked arn_0 1 time(s)" in line for line in logs.output))
+
+    def test_no_invocations(self):
+        self.assertEqual(self.lambda_client.invoke_many([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
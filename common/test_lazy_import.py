@@ -0,0 +1,53 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+from common.lazy_import import LazyModule, lazy_import
+
+# a stdlib module this process is unlikely to have imported already
+MODULE_NAME = "colorsys"
+
+
+class TestLazyImport(unittest.TestCase):
+    def setUp(self):
+        sys.modules.pop(MODULE_NAME, None)
+
+    def test_module_is_loaded_on_first_access(self):
+        module = lazy_import(MODULE_NAME)
+
+        self.assertIsInstance(module, LazyModule)
+        self.assertNotIn(MODULE_NAME, sys.modules)
+        self.assertIn("not loaded", repr(module))
+
+        self.assertEqual(module.rgb_to_hsv(0, 0, 0), (0.0, 0.0, 0.0))
+        self.assertIs(module.__dict__["_module"], sys.modules[MODULE_NAME])
+        self.assertIn("(loaded)", repr(module))
+        self.assertIn("rgb_to_hsv", dir(module))
+
+    def test_setattr_reaches_real_module(self):
+        module = lazy_import(MODULE_NAME)
+
+        module.TEST_ATTRIBUTE = 1
+        self.assertEqual(sys.modules[MODULE_NAME].TEST_ATTRIBUTE, 1)
+
+        del module.TEST_ATTRIBUTE
+        self.assertFalse(hasattr(sys.modules[MODULE_NAME], "TEST_ATTRIBUTE"))
+
+    def test_patch_reaches_real_module(self):
+        module = lazy_import(MODULE_NAME)
+
+        with patch.object(module, "rgb_to_hsv", return_value="patched"):
+            self.assertEqual(sys.modules[MODULE_NAME].rgb_to_hsv(0, 0, 0), "patched")
+            self.assertEqual(module.rgb_to_hsv(0, 0, 0), "patched")
+
+        self.assertEqual(module.rgb_to_hsv(0, 0, 0), (0.0, 0.0, 0.0))
+
+    def test_missing_module_raises_on_access(self):
+        module = lazy_import("missing_module_for_lazy_import_test")
+
+        with self.assertRaises(ModuleNotFoundError):
+            module.attribute
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from sqlalchemy import create_engine, text
+
+from common.query_counter import assert_max_queries, count_queries, normalize_statement, record_query
+
+
+class TestQueryCounter(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        with self.engine.begin() as connection:
+            connection.execute(text("create table service (row_id integer primary key, org_id varchar(16))"))
+            connection.execute(text("insert into service (row_id, org_id) values (1, 'org'), (2, 'org')"))
+
+    def test_repeated_statements_with_different_parameters(self):
+        with count_queries() as counter, self.engine.connect() as connection:
+            for row_id in (1, 2, 3):
+                connection.execute(text("select org_id from service where row_id = :row_id"), {"row_id": row_id})
+            for _ in range(3):
+                connection.execute(text("select count(*) from service"))
+
+        self.assertEqual(counter.count, 6)
+        self.assertEqual(
+            counter.repeated_statements(threshold=3),
+            {"select org_id from service where row_id = ?": 3}
+        )
+
+    def test_inlined_literals_are_normalized(self):
+        with count_queries() as counter:
+            for org_id in ("org_1", "org_2"):
+                record_query(f"SELECT * FROM service WHERE org_id = '{org_id}' AND row_id IN (1, 2)")
+
+        self.assertEqual(
+            counter.repeated_statements(threshold=2),
+            {"SELECT * FROM service WHERE org_id = ? AND row_id IN (...)": 2}
+        )
+        self.assertEqual(normalize_statement("select  *\n from service_1"), "select * from service_1")
+
+    def test_assert_max_queries(self):
+        with assert_max_queries(1), self.engine.connect() as connection:
+            connection.execute(text("select org_id from service where row_id in (1, 2)"))
+
+        with self.assertRaises(AssertionError):
+            with assert_max_queries(1), self.engine.connect() as connection:
+                for row_id in (1, 2):
+                    connection.execute(text("select org_id from service where row_id = :row_id"), {"row_id": row_id})
+
+        with self.assertRaises(AssertionError):
+            with assert_max_queries(10, repeated_statement_threshold=2), self.engine.connect() as connection:
+                for row_id in (1, 2):
+                    connection.execute(text("select org_id from service where row_id = :row_id"), {"row_id": row_id})
+
+
+if __name__ == "__main__":
+    unittest.main()
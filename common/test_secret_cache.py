@@ -0,0 +1,111 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from common import cache
+from common.secret_cache import SecretCache, SecretNotFoundException
+
+
+class TestSecretCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = patch.object(cache.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.ssm = Mock()
+        self.ssm.get_parameters.side_effect = lambda Names, WithDecryption: {
+            "Parameters": [{"Name": name, "Value": f"{name}_value"} for name in Names],
+            "InvalidParameters": []
+        }
+        self.secretsmanager = Mock()
+        self.secretsmanager.get_secret_value.side_effect = lambda SecretId: {
+            "SecretString": json.dumps({SecretId: f"{SecretId}_value"})
+        }
+        clients = {"ssm": self.ssm, "secretsmanager": self.secretsmanager}
+
+        self.secret_cache = SecretCache("us-east-1", ttl_in_seconds=60)
+        self.secret_cache._get_client = lambda service_name: clients[service_name]
+
+    def test_ssm_parameter_expires_after_ttl(self):
+        self.assertEqual(self.secret_cache.get_ssm_parameter("key"), "key_value")
+        self.now += 59
+        self.assertEqual(self.secret_cache.get_ssm_parameter("key"), "key_value")
+        self.assertEqual(self.ssm.get_parameters.call_count, 1)
+
+        self.now += 1
+        self.assertEqual(self.secret_cache.get_ssm_parameter("key"), "key_value")
+        self.assertEqual(self.ssm.get_parameters.call_count, 2)
+
+    def test_secret_expires_after_ttl(self):
+        self.assertEqual(self.secret_cache.get_secret("secret"), "secret_value")
+        self.assertEqual(self.secret_cache.get_secret("secret"), "secret_value")
+        self.assertEqual(self.secretsmanager.get_secret_value.call_count, 1)
+
+        self.now += 60
+        self.secret_cache.get_secret("secret")
+        self.assertEqual(self.secretsmanager.get_secret_value.call_count, 2)
+
+    def test_ssm_parameters_fetched_in_batches(self):
+        names = [f"key_{i}" for i in range(23)]
+
+        values = self.secret_cache.get_ssm_parameters(names)
+
+        self.assertEqual(values, {name: f"{name}_value" for name in names})
+        self.assertEqual(
+            [len(call.kwargs["Names"]) for call in self.ssm.get_parameters.call_args_list], [10, 10, 3]
+        )
+
+    def test_only_missing_ssm_parameters_fetched(self):
+        self.secret_cache.prefetch_ssm_parameters(["key_1", "key_2"])
+
+        values = self.secret_cache.get_ssm_parameters(["key_1", "key_2", "key_3"])
+
+        self.assertEqual(values, {"key_1": "key_1_value", "key_2": "key_2_value", "key_3": "key_3_value"})
+        self.assertEqual(self.ssm.get_parameters.call_args.kwargs["Names"], ["key_3"])
+
+    def test_invalid_ssm_parameters(self):
+        self.ssm.get_parameters.side_effect = lambda Names, WithDecryption: {
+            "Parameters": [], "InvalidParameters": Names
+        }
+
+        with self.assertRaises(SecretNotFoundException):
+            self.secret_cache.get_ssm_parameter("missing_key")
+
+    def test_call_with_refresh(self):
+        rotated_values = iter(["old_key", "new_key"])
+        self.ssm.get_parameters.side_effect = lambda Names, WithDecryption: {
+            "Parameters": [{"Name": "key", "Value": next(rotated_values)}]
+        }
+        self.secret_cache.prefetch_ssm_parameters(["key"])
+        self.secret_cache._cache.set(("ssm", "other_key"), "other_key_value")
+
+        def authenticate():
+            key = self.secret_cache.get_ssm_parameter("key")
+            if key != "new_key":
+                raise PermissionError(key)
+            return key
+
+        self.assertEqual(self.secret_cache.call_with_refresh(authenticate, ["key"], refresh_on=PermissionError),
+                         "new_key")
+        self.assertEqual(self.ssm.get_parameters.call_count, 2)
+        # the other secrets stay cached
+        self.assertEqual(self.secret_cache.get_ssm_parameter("other_key"), "other_key_value")
+
+    def test_call_with_refresh_other_exception_not_retried(self):
+        func = Mock(side_effect=ValueError())
+
+        with self.assertRaises(ValueError):
+            self.secret_cache.call_with_refresh(func, ["key"], refresh_on=PermissionError)
+        func.assert_called_once()
+
+    def test_call_with_refresh_fails_twice(self):
+        func = Mock(side_effect=PermissionError())
+
+        with self.assertRaises(PermissionError):
+            self.secret_cache.call_with_refresh(func, ["key"], refresh_on=PermissionError)
+        self.assertEqual(func.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
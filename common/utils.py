@@ -1,14 +1,18 @@
 import base64
 import datetime as dt
 import decimal
+import hashlib
+import io
 import json
 import os
 import os.path
+import posixpath
 import re
 import shutil
 import tarfile
 import uuid
-from typing import Generator, Iterable, TypeVar
+import zlib
+from typing import BinaryIO, Generator, Iterable, Iterator, List, Optional, TypeVar, Union
 import zipfile
 from urllib.parse import urlparse
 
@@ -18,6 +22,7 @@ from common.constant import COGS_TO_AGI, ResponseStatus, StatusCode
 from common.logger import get_logger
 
 IGNORED_LIST = ["row_id", "row_created", "row_updated"]
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
 logger = get_logger(__name__)
 
 
@@ -136,6 +141,37 @@ def generate_lambda_text_file_response(content: str, filename: str, cors_enabled
     return response
 
 
+class GzipTextStream(io.RawIOBase):
+    """
+    Read-only file-like object that gzip-compresses text chunks taken from an iterable on demand,
+    so the whole content never has to be kept in memory (e.g. for boto3 upload_fileobj).
+    """
+
+    def __init__(self, chunks: Iterable[str], encoding: str = "utf-8"):
+        self._chunks = iter(chunks)
+        self._encoding = encoding
+        self._compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        self._buffer = bytearray()
+        self._exhausted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while len(self._buffer) < len(buffer) and not self._exhausted:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._buffer += self._compressor.flush()
+                self._exhausted = True
+            else:
+                self._buffer += self._compressor.compress(chunk.encode(self._encoding))
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
+
+
 def extract_payload(method, event):
     method_found = True
     payload_dict = None
@@ -225,6 +261,89 @@ def make_tarfile(output_filename, source_dir):
         tar.add(source_dir, arcname=os.path.basename(source_dir))
 
 
+def get_canonical_json_hash(data) -> str:
+    """ sha256 of the JSON with sorted keys and no insignificant whitespace, equal documents give equal hashes """
+    canonical_json = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+
+
+def download_file_to_fileobj(file_url: str, fileobj: BinaryIO) -> None:
+    """ Streams the response body into fileobj instead of holding it in memory, fileobj is rewound """
+    with requests.get(file_url, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=ARCHIVE_CHUNK_SIZE):
+            fileobj.write(chunk)
+    fileobj.seek(0)
+
+
+def _iter_zip_members(zip_obj: zipfile.ZipFile, exclude_files: Optional[List[str]]) -> Iterator[zipfile.ZipInfo]:
+    for info in zip_obj.infolist():
+        name = info.filename.rstrip("/")
+        if not name or (exclude_files and posixpath.basename(name) in exclude_files):
+            continue
+        if name.startswith("/") or ".." in name.split("/"):
+            raise ValueError(f"Unsafe path in zip archive: {info.filename}")
+        yield info
+
+
+def get_zip_content_hash(zip_source: Union[str, BinaryIO], exclude_files: Optional[List[str]] = None) -> str:
+    """
+    Returns sha256 of the names and contents of zip entries. It doesn't depend on compression
+    or timestamps, so re-uploads of the same content get the same hash.
+    """
+    digest = hashlib.sha256()
+    with zipfile.ZipFile(zip_source, "r") as zip_obj:
+        for info in _iter_zip_members(zip_obj, exclude_files):
+            digest.update(f"{info.filename}\0{info.file_size}\0".encode("utf-8"))
+            if info.is_dir():
+                continue
+            with zip_obj.open(info) as entry:
+                for chunk in iter(lambda: entry.read(ARCHIVE_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+    if hasattr(zip_source, "seek"):
+        zip_source.seek(0)
+    return digest.hexdigest()
+
+
+def transcode_zip_to_tar_gz(
+    zip_source: Union[str, BinaryIO],
+    output_fileobj: BinaryIO,
+    arcname_prefix: str = "",
+    exclude_files: Optional[List[str]] = None,
+    mtime: Optional[int] = None,
+) -> None:
+    """
+    Writes entries of a zip archive as a tar.gz stream, entry by entry, without extracting them to disk.
+
+    :param arcname_prefix: directory all entries are put into inside the tar
+    :param mtime: modification time of all entries, e.g. for reproducible archives (default is the zip entry time)
+    """
+    with zipfile.ZipFile(zip_source, "r") as zip_obj, \
+            tarfile.open(fileobj=output_fileobj, mode="w|gz") as tar:
+        if arcname_prefix:
+            prefix_info = tarfile.TarInfo(arcname_prefix)
+            prefix_info.type = tarfile.DIRTYPE
+            prefix_info.mode = 0o755
+            prefix_info.mtime = mtime if mtime is not None else int(dt.datetime.now().timestamp())
+            tar.addfile(prefix_info)
+
+        for info in _iter_zip_members(zip_obj, exclude_files):
+            tar_info = tarfile.TarInfo(posixpath.join(arcname_prefix, info.filename.rstrip("/")))
+            tar_info.mtime = mtime if mtime is not None else int(dt.datetime(*info.date_time).timestamp())
+            unix_mode = (info.external_attr >> 16) & 0o7777
+            if info.is_dir():
+                tar_info.type = tarfile.DIRTYPE
+                tar_info.mode = unix_mode or 0o755
+                tar.addfile(tar_info)
+                continue
+            tar_info.size = info.file_size
+            tar_info.mode = unix_mode or 0o644
+            with zip_obj.open(info) as entry:
+                tar.addfile(tar_info, entry)
+    if hasattr(zip_source, "seek"):
+        zip_source.seek(0)
+
+
 def match_regex_string(path, regex_pattern):
     key_pattern = re.compile(regex_pattern)
     match = re.match(key_pattern, path)
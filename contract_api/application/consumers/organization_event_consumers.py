@@ -27,10 +27,17 @@ class OrganizationCreatedEventConsumer(EventConsumer):
     ):
         if org_id is None:
             org_id = request.org_id
-        org_id, blockchain_org_data, org_metadata, org_metadata_uri = (
-            self._get_org_details_from_blockchain(org_id)
-        )
+        blockchain_org_data, org_metadata_uri = self._get_org_data_from_blockchain(org_id)
+        if not blockchain_org_data[0]:
+            logger.info(f"Organization {org_id} is not found in the registry")
+            return
+        if self._is_organization_unchanged(org_id, blockchain_org_data, org_metadata_uri):
+            logger.info(
+                f"Organization {org_id} metadata {org_metadata_uri} is already stored, skipping"
+            )
+            return
 
+        org_metadata = self._storage_provider.get(org_metadata_uri)
         self._process_organization_create_update_event(
             org_id, blockchain_org_data, org_metadata, org_metadata_uri
         )
@@ -86,7 +93,20 @@ class OrganizationCreatedEventConsumer(EventConsumer):
         )
         return new_assets_url_mapping
 
-    def _get_org_details_from_blockchain(self, org_id):
+    def _is_organization_unchanged(
+        self, org_id: str, blockchain_org_data, org_metadata_uri: str
+    ) -> bool:
+        # metadata URIs are content addressed, the same URI means the same metadata and assets
+        with session_scope(self._session_factory) as session:
+            existing_organization = self._organization_repository.get_organization(session, org_id)
+        return (
+            existing_organization is not None
+            and existing_organization.is_curated
+            and existing_organization.org_metadata_uri == org_metadata_uri
+            and existing_organization.owner_address == blockchain_org_data[3]
+        )
+
+    def _get_org_data_from_blockchain(self, org_id):
         registry_contract = self._get_contract("REGISTRY")
 
         logger.info(f"Organization id: {org_id}")
@@ -97,9 +117,7 @@ class OrganizationCreatedEventConsumer(EventConsumer):
         org_metadata_uri = Web3.to_text(blockchain_org_data[2]).rstrip("\x00")
         logger.info(f"Organization metadata uri hash: {org_metadata_uri}")
 
-        org_metadata = self._storage_provider.get(org_metadata_uri)
-
-        return org_id, blockchain_org_data, org_metadata, org_metadata_uri
+        return blockchain_org_data, org_metadata_uri
 
 
 class OrganizationDeletedEventConsumer(EventConsumer):
@@ -55,9 +55,6 @@ class ServiceCreatedEventConsumer(EventConsumer):
         org_id = request.org_id
         service_id = request.service_id
         metadata_uri = request.metadata_uri
-        service_metadata = self._storage_provider.get(metadata_uri)
-        service_mpe_address = service_metadata.get("mpe_address")
-
         mpe_contract_path = os.path.abspath(
             f"{CONTRACT_BASE_PATH}/node_modules/singularitynet-platform-contracts/networks/MultiPartyEscrow.json"
         )
@@ -68,6 +65,14 @@ class ServiceCreatedEventConsumer(EventConsumer):
             stage=STAGE,
             key="address",
         )
+        if self._is_service_unchanged(org_id, service_id, metadata_uri, current_mpe_address):
+            logger.info(
+                f"Service {org_id}/{service_id} metadata {metadata_uri} is already stored, skipping"
+            )
+            return
+
+        service_metadata = self._storage_provider.get(metadata_uri)
+        service_mpe_address = service_metadata.get("mpe_address")
 
         if service_mpe_address != current_mpe_address:
             with session_scope(self._session_factory) as session:
@@ -115,6 +120,26 @@ class ServiceCreatedEventConsumer(EventConsumer):
 
                 self._process_service_data(org_id, service_id, metadata_uri, service_metadata)
 
+    def _is_service_unchanged(
+        self, org_id: str, service_id: str, metadata_uri: str, current_mpe_address: str
+    ) -> bool:
+        # metadata URIs are content addressed, so groups, endpoints, tags and assets of a curated
+        # service stored with the same URI are already up to date, unless the MPE contract changed
+        # since and the stored service has to be removed
+        if not metadata_uri:
+            return False
+        with session_scope(self._session_factory) as session:
+            existing_service = self._service_repository.get_service(session, org_id, service_id)
+        if existing_service is None:
+            return False
+        service, organization, service_metadata = existing_service
+        return (
+            service.is_curated
+            and organization.is_curated
+            and service.hash_uri == metadata_uri
+            and service_metadata.mpe_address == current_mpe_address
+        )
+
     def _get_new_assets_url(
         self,
         org_id: str,
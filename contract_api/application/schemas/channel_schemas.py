@@ -1,10 +1,10 @@
 import json
 
-from pydantic import BaseModel, model_validator, Field
+from pydantic import BaseModel, field_validator, model_validator, Field
 
 from common.constant import RequestPayloadType
 from common.validation_handler import validation_handler
-from contract_api.exceptions import InvalidUpdatingChannelParameters
+from contract_api.exceptions import InvalidUpdatingChannelParameters, InvalidGroupChannelsParameters
 
 
 class GetChannelsRequest(BaseModel):
@@ -18,7 +18,9 @@ class GetChannelsRequest(BaseModel):
 
 
 class GetGroupChannelsRequest(BaseModel):
-    user_address: str
+    user_address: str | None = None
+    # comma separated in the query string
+    user_addresses: list[str] | None = None
     org_id: str
     group_id: str
 
@@ -28,6 +30,19 @@ class GetGroupChannelsRequest(BaseModel):
         data = {**event[RequestPayloadType.QUERY_STRING]}
         return cls.model_validate(data)
 
+    @field_validator("user_addresses", mode="before")
+    @classmethod
+    def split_user_addresses(cls, value):
+        if isinstance(value, str):
+            return [address for address in value.split(",") if address]
+        return value
+
+    @model_validator(mode="after")
+    def validate_user_addresses(self) -> "GetGroupChannelsRequest":
+        if self.user_address is None and not self.user_addresses:
+            raise InvalidGroupChannelsParameters()
+        return self
+
 
 class UpdateConsumedBalanceRequest(BaseModel):
     channel_id: int = Field(alias="channelId")
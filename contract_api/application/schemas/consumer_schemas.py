@@ -1,10 +1,12 @@
 import ast
 from pydantic import BaseModel, model_validator, Field
 import json
-from web3 import Web3
 
+from common.lazy_import import lazy_import
 from common.validation_handler import validation_handler
 
+web3 = lazy_import("web3")
+
 
 class EventConsumerRequest(BaseModel):
     event_name: str = Field(alias = "name")
@@ -73,6 +75,6 @@ class RegistryEventConsumerRequest(EventConsumerRequest):
         for key, value in data.items():
             new_value = value
             if key != "name":
-                new_value = Web3.to_text(value).rstrip("\x00")
+                new_value = web3.Web3.to_text(value).rstrip("\x00")
             converted_data[key] = new_value
         return converted_data
@@ -42,7 +42,10 @@ class ChannelService:
         org_id = request.org_id
         group_id = request.group_id
 
-        channels = self._channel_repo.get_group_channels(user_address, org_id, group_id)
+        if request.user_addresses is not None:
+            return self._get_group_channels_for_addresses(request.user_addresses, org_id, group_id)
+
+        channels = self._channel_repo.get_group_channels([user_address], org_id, group_id)
         channel_data = {
             "user_address": user_address,
             "org_id": org_id,
@@ -52,6 +55,24 @@ class ChannelService:
 
         return channel_data
 
+    def _get_group_channels_for_addresses(self, user_addresses: list[str], org_id: str, group_id: str) -> dict:
+        user_addresses = list(dict.fromkeys(user_addresses))
+        channels = self._channel_repo.get_group_channels(user_addresses, org_id, group_id)
+
+        # addresses are compared case-insensitively by the database
+        address_channels = {address.lower(): [] for address in user_addresses}
+        for channel in channels:
+            address_channels[channel.sender.lower()].append(channel.to_response())
+
+        return {
+            "org_id": org_id,
+            "group_id": group_id,
+            "user_addresses": [
+                {"user_address": address, "channels": address_channels[address.lower()]}
+                for address in user_addresses
+            ]
+        }
+
     def update_consumed_balance(self, request: UpdateConsumedBalanceRequest) -> dict:
         channel_id = request.channel_id
         org_id = request.org_id
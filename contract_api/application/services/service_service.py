@@ -4,10 +4,18 @@ import uuid
 from pathlib import Path
 from typing import Any
 from datetime import datetime
+from urllib.parse import urlparse
 
 from common.boto_utils import BotoUtils
 from common.constant import BuildStatus
-from common.utils import download_file_from_url, extract_zip_file, make_tarfile
+from common.utils import (
+    download_file_from_url,
+    download_file_to_fileobj,
+    extract_zip_file,
+    get_zip_content_hash,
+    make_tarfile,
+    transcode_zip_to_tar_gz,
+)
 from common.logger import get_logger
 from contract_api.application.schemas.service_schemas import (
     GetServiceFiltersRequest,
@@ -18,7 +26,7 @@ from contract_api.application.schemas.service_schemas import (
     UpdateServiceRatingRequest
 )
 from contract_api.config import REGION_NAME, ASSETS_COMPONENT_BUCKET_NAME
-from contract_api.constant import FilterKeys
+from contract_api.constant import FilterKeys, DEMO_COMPONENT_SPOOL_MAX_SIZE
 from contract_api.domain.factory.service_factory import ServiceFactory
 from contract_api.domain.models.demo_component import DemoComponent
 from contract_api.domain.models.offchain_service_attribute import OffchainServiceConfigDomain
@@ -227,6 +235,34 @@ class ServiceService:
         return {"demoComponentRequired": False}
 
     def _publish_demo_component(self, org_id, service_id, demo_file_url):
+        component_name = urlparse(demo_file_url).path.split("/")[-1]
+        if not component_name.endswith(".zip"):
+            return self._repack_demo_component(org_id, service_id, demo_file_url)
+
+        arcname = component_name.split(".")[0].split("_")[1]
+        key = f"assets/{org_id}/{service_id}/component.tar.gz"
+        new_demo_url = f"https://{ASSETS_COMPONENT_BUCKET_NAME}.s3.amazonaws.com/{key}"
+        with tempfile.SpooledTemporaryFile(max_size = DEMO_COMPONENT_SPOOL_MAX_SIZE) as zip_file:
+            download_file_to_fileobj(demo_file_url, zip_file)
+
+            # the hash of the published content is kept in the object metadata
+            content_hash = get_zip_content_hash(zip_file)
+            metadata = self._boto_utils.get_s3_object_metadata(ASSETS_COMPONENT_BUCKET_NAME, key)
+            if metadata is not None and metadata.get("content-hash") == content_hash \
+                    and metadata.get("arcname") == arcname:
+                logger.info(f"Demo component of {org_id}/{service_id} is already published, content hash: {content_hash}")
+                return new_demo_url
+
+            with tempfile.SpooledTemporaryFile(max_size = DEMO_COMPONENT_SPOOL_MAX_SIZE) as tar_file:
+                transcode_zip_to_tar_gz(zip_file, tar_file, arcname_prefix = arcname)
+                tar_file.seek(0)
+                self._boto_utils.s3_upload_fileobj(
+                    tar_file, ASSETS_COMPONENT_BUCKET_NAME, key,
+                    metadata = {"content-hash": content_hash, "arcname": arcname}
+                )
+        return new_demo_url
+
+    def _repack_demo_component(self, org_id, service_id, demo_file_url):
         root_directory = os.path.join(tempfile.gettempdir(), str(uuid.uuid4()))
         if not Path.exists(Path(root_directory)):
             os.mkdir(root_directory)
@@ -2,6 +2,8 @@ from enum import Enum
 
 GET_ALL_SERVICE_OFFSET_LIMIT = 0
 GET_ALL_SERVICE_LIMIT = 15
+# archives up to this size are transcoded in memory, bigger ones spill to /tmp
+DEMO_COMPONENT_SPOOL_MAX_SIZE = 64 * 1024 * 1024
 
 
 class ServiceAssetsRegex(Enum):
@@ -7,6 +7,11 @@ class InvalidUpdatingChannelParameters(BadRequestException):
                                  "org_id and service_id required for GENERAL wallet")
 
 
+class InvalidGroupChannelsParameters(BadRequestException):
+    def __init__(self):
+        super().__init__(message="Invalid query parameters: user_address or user_addresses required")
+
+
 class MissingFilePathException(BadRequestException):
     def __init__(self):
         super().__init__(message="Missing file path in S3 event")
@@ -1,10 +1,14 @@
 from urllib.parse import urlparse
 
-import grpc
-from contract_api.infrastructure.stubs import state_service_pb2, state_service_pb2_grpc
 from resources.certificates.root_certificate import certificate
+from common.lazy_import import lazy_import
 from common.logger import get_logger
 
+# grpc and the generated stubs are loaded by the first daemon call
+grpc = lazy_import("grpc")
+state_service_pb2 = lazy_import("contract_api.infrastructure.stubs.state_service_pb2")
+state_service_pb2_grpc = lazy_import("contract_api.infrastructure.stubs.state_service_pb2_grpc")
+
 
 logger = get_logger(__name__)
 
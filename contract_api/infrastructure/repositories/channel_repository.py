@@ -28,7 +28,7 @@ class ChannelRepository(BaseRepository):
         result_list = list(result.mappings().all())
         return result_list
 
-    def get_group_channels(self, user_address: str, org_id: str, group_id: str) -> list[ChannelDomain]:
+    def get_group_channels(self, user_addresses: list[str], org_id: str, group_id: str) -> list[ChannelDomain]:
         query = select(
             MpeChannel
         ).join(
@@ -36,7 +36,7 @@ class ChannelRepository(BaseRepository):
         ).where(
             OrgGroup.org_id == org_id,
             OrgGroup.group_id == group_id,
-            MpeChannel.sender == user_address,
+            MpeChannel.sender.in_(user_addresses),
             MpeChannel.recipient == OrgGroup.payment["payment_address"]
         )
 
@@ -1,19 +1,28 @@
 from unittest import TestCase
 from unittest.mock import patch
 
+from common.boto_utils import clear_boto_clients
 from contract_api.infrastructure.repositories.organization_repository import OrganizationRepository
 from contract_api.infrastructure.repositories.service_repository import ServiceRepository
 from contract_api.application.handlers.consumer_handlers import registry_event_consumer
 
+SERVICE_CREATED_EVENT = {'Records': [
+    {'body': '{\n "Message" : "{\\"blockchain_name\\": \\"Ethereum\\", \\"blockchain_event\\": {\\"name\\": \\"ServiceCreated\\", \\"data\\": {\\"block_no\\": 8640583, \\"from_address\\": \\"0xeDFb9c1e6C4ac9A2333552C5F52a0acaeB555EA8\\", \\"to_address\\": \\"0xE73aC4AC2D9Df5698710fFB2f6c3923ADf0bA055\\", \\"json_str\\": \\"{\'orgId\': b\'190625\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\', \'serviceId\': b\'190625_2\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\', \'metadataURI\': b\'ipfs://QmYVYBxjCxLWYYnz6bK5kHYVW8JBfFLwn4MGzEpMiF7LZ1\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\'}\\", \\"transaction_hash\\": \\"0x38fd6accd2103bd041571b6081acaf845083d4b2878599a91217f76694b6e5cb\\", \\"log_index\\": 8}}}"\n}'}
+]}
+
 
 class TestRegistryEventConsumer(TestCase):
     def setUp(self):
         self.service_repository = ServiceRepository()
         self.organization_repository = OrganizationRepository()
+        # boto3.client is patched in some tests, clients cached by other tests would bypass the mock
+        clear_boto_clients()
+        self.addCleanup(clear_boto_clients)
 
-    @patch('contract_api.application.consumers.organization_event_consumers.OrganizationCreatedEventConsumer._get_org_details_from_blockchain')
+    @patch('common.storage_provider.StorageProvider.get')
+    @patch('contract_api.application.consumers.organization_event_consumers.OrganizationCreatedEventConsumer._get_org_data_from_blockchain')
     @patch('contract_api.application.consumers.event_consumer.EventConsumer._push_asset_to_s3_using_hash')
-    def test_a_organization_created(self, push_assets_to_s3, get_org_details_from_blockchain):
+    def test_a_organization_created(self, push_assets_to_s3, get_org_data_from_blockchain, storage_provider_get):
         event = event = {'Records': [
             {'body': '{\n "Message" : "{\\"blockchain_name\\": \\"Ethereum\\", \\"blockchain_event\\": {\\"name\\": \\"OrganizationCreated\\", \\"data\\": {\\"block_no\\": 8640583, \\"from_address\\": \\"0xeDFb9c1e6C4ac9A2333552C5F52a0acaeB555EA8\\", \\"to_address\\": \\"0xE73aC4AC2D9Df5698710fFB2f6c3923ADf0bA055\\", \\"json_str\\": \\"{\'orgId\': b\'190625\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\'}\\", \\"transaction_hash\\": \\"0x38fd6accd2103bd041571b6081acaf845083d4b2878599a91217f76694b6e5cb\\", \\"log_index\\": 8}}}"\n}'}
         ]}
@@ -61,13 +70,19 @@ class TestRegistryEventConsumer(TestCase):
                 }
             ]
         }
-        blockchain_data = ("190625", ["190625", "", "", "0xeDFb9c1e6C4ac9A2333552C5F52a0acaeB555EA8"], mock_org_metadata, "abc")
+        blockchain_data = (["190625", "", "", "0xeDFb9c1e6C4ac9A2333552C5F52a0acaeB555EA8"], "abc")
         mock_s3_url = "http://test-s3-push"
 
-        get_org_details_from_blockchain.return_value = blockchain_data
+        get_org_data_from_blockchain.return_value = blockchain_data
+        storage_provider_get.return_value = mock_org_metadata
         push_assets_to_s3.return_value = mock_s3_url
 
         registry_event_consumer(event, context = None)
+        # a redelivered event with the same metadata uri is not processed again
+        registry_event_consumer(event, context = None)
+
+        storage_provider_get.assert_called_once()
+        push_assets_to_s3.assert_called_once()
 
         org = self.organization_repository.get_organization(org_id = "190625")
 
@@ -103,9 +118,7 @@ class TestRegistryEventConsumer(TestCase):
     @patch('contract_api.application.consumers.service_event_consumers.ServiceCreatedDeploymentEventHandler.process_service_deployment')
     @patch('boto3.client')
     def test_b_service_created(self, lambda_client, process_service_deployment, push_assets_to_s3, read_contract_address, storage_provider_get):
-        event = {'Records': [
-            {'body': '{\n "Message" : "{\\"blockchain_name\\": \\"Ethereum\\", \\"blockchain_event\\": {\\"name\\": \\"ServiceCreated\\", \\"data\\": {\\"block_no\\": 8640583, \\"from_address\\": \\"0xeDFb9c1e6C4ac9A2333552C5F52a0acaeB555EA8\\", \\"to_address\\": \\"0xE73aC4AC2D9Df5698710fFB2f6c3923ADf0bA055\\", \\"json_str\\": \\"{\'orgId\': b\'190625\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\', \'serviceId\': b\'190625_2\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\', \'metadataURI\': b\'ipfs://QmYVYBxjCxLWYYnz6bK5kHYVW8JBfFLwn4MGzEpMiF7LZ1\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\\\\\\\\x00\'}\\", \\"transaction_hash\\": \\"0x38fd6accd2103bd041571b6081acaf845083d4b2878599a91217f76694b6e5cb\\", \\"log_index\\": 8}}}"\n}'}
-        ]}
+        event = SERVICE_CREATED_EVENT
 
         mock_service_metadata = {
             "version": 1,
@@ -170,6 +183,10 @@ class TestRegistryEventConsumer(TestCase):
         lambda_client.return_value = None
 
         registry_event_consumer(event, context = None)
+        registry_event_consumer(event, context = None)
+
+        storage_provider_get.assert_called_once()
+        process_service_deployment.assert_called_once()
 
         result = self.service_repository.get_service(org_id = "190625", service_id = "190625_2")
 
@@ -184,6 +201,19 @@ class TestRegistryEventConsumer(TestCase):
         assert service_metadata.mpe_address == "0x03e7D37A13ed807B2311418095E23fA8Ff9DE192"
 
 
+    @patch('common.storage_provider.StorageProvider.get')
+    @patch('common.blockchain_util.BlockChainUtil.read_contract_address')
+    def test_b_service_created_replayed_after_mpe_migration(self, read_contract_address, storage_provider_get):
+        storage_provider_get.return_value = {"mpe_address": "0x03e7D37A13ed807B2311418095E23fA8Ff9DE192"}
+        read_contract_address.return_value = "0x5e592F9b1d303183d963635f895f0f0C48284f4e"
+
+        registry_event_consumer(SERVICE_CREATED_EVENT, context = None)
+
+        storage_provider_get.assert_called_once()
+        result = self.service_repository.get_service(org_id = "190625", service_id = "190625_2")
+
+        assert result is None
+
     def test_c_service_deleted(self):
         event = {'Records': [
             {
@@ -8,7 +8,11 @@ from contract_api.domain.models.organization import NewOrganizationDomain
 
 from contract_api.infrastructure.repositories.channel_repository import ChannelRepository
 from contract_api.infrastructure.repositories.organization_repository import OrganizationRepository
-from contract_api.application.handlers.channel_handlers import *
+from contract_api.application.handlers.channel_handlers import (
+    get_channels,
+    get_group_channels,
+    update_consumed_balance,
+)
 
 
 class TestChannels(TestCase):
@@ -109,6 +113,25 @@ class TestChannels(TestCase):
 
         self.assertDictEqual(real_data, expected_data)
 
+    def test_get_group_channels_for_several_addresses(self):
+        event = {
+            "queryStringParameters": {
+                "user_addresses": "0x6E7BaCcc00D69eab750eDf661D831cd2c7f3A4DF,0x0000000000000000000000000000000000000001",
+                "org_id": "test_org_id",
+                "group_id": "NSf/28//MmwM+ktwr1gO0vVFoWqvctAT+Qko6lO3Xzo="
+            }
+        }
+
+        response = get_group_channels(event = event, context = None)
+        assert response["statusCode"] == 200
+
+        real_data = json.loads(response["body"])["data"]
+        assert [address["user_address"] for address in real_data["user_addresses"]] == [
+            "0x6E7BaCcc00D69eab750eDf661D831cd2c7f3A4DF", "0x0000000000000000000000000000000000000001"
+        ]
+        assert [channel["channel_id"] for channel in real_data["user_addresses"][0]["channels"]] == [self.channel_id]
+        assert real_data["user_addresses"][1]["channels"] == []
+
     def test_update_consumed_balance(self):
         event = {
             "pathParameters": {
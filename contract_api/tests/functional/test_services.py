@@ -1,9 +1,14 @@
+import io
 import json
+import tarfile
+import zipfile
 from datetime import datetime, UTC
 from unittest import TestCase
 from unittest.mock import patch
 
+from common.utils import get_zip_content_hash
 from contract_api.application.handlers.service_handlers import *
+from contract_api.application.services.service_service import ServiceService
 from contract_api.domain.factory.service_factory import ServiceFactory
 from contract_api.domain.models.organization import NewOrganizationDomain
 from contract_api.domain.models.service import NewServiceDomain
@@ -445,3 +450,56 @@ class TestServices(TestCase):
 
         self.assertDictEqual(service_metadata.service_rating, expected_result)
 
+
+
+class TestPublishDemoComponent(TestCase):
+    demo_file_url = "https://bucket.s3.amazonaws.com/test_org_id/test_service_id/1234_component.zip"
+
+    def setUp(self):
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w") as zip_file:
+            zip_file.writestr("index.js", "console.log('demo')")
+        self.zip_content = zip_buffer.getvalue()
+        self.content_hash = get_zip_content_hash(io.BytesIO(self.zip_content))
+
+        patcher = patch(
+            "contract_api.application.services.service_service.download_file_to_fileobj",
+            side_effect=lambda url, fileobj: fileobj.write(self.zip_content)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.service_service = ServiceService()
+        patcher = patch.object(self.service_service, "_boto_utils")
+        self.boto_utils = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_published_component_is_not_uploaded_again(self):
+        self.boto_utils.get_s3_object_metadata.return_value = {
+            "content-hash": self.content_hash, "arcname": "component"
+        }
+
+        demo_url = self.service_service._publish_demo_component(
+            "test_org_id", "test_service_id", self.demo_file_url
+        )
+
+        assert demo_url.endswith("assets/test_org_id/test_service_id/component.tar.gz")
+        self.boto_utils.s3_upload_fileobj.assert_not_called()
+
+    def test_changed_component_is_uploaded(self):
+        self.boto_utils.get_s3_object_metadata.return_value = {
+            "content-hash": "previous_content_hash", "arcname": "component"
+        }
+        uploaded = {}
+
+        def s3_upload_fileobj(fileobj, bucket, key, metadata):
+            uploaded["content"] = fileobj.read()
+            uploaded["metadata"] = metadata
+
+        self.boto_utils.s3_upload_fileobj.side_effect = s3_upload_fileobj
+
+        self.service_service._publish_demo_component("test_org_id", "test_service_id", self.demo_file_url)
+
+        assert uploaded["metadata"] == {"content-hash": self.content_hash, "arcname": "component"}
+        with tarfile.open(fileobj=io.BytesIO(uploaded["content"]), mode="r:gz") as tar_file:
+            assert "component/index.js" in tar_file.getnames()
@@ -125,4 +125,11 @@ def post_aws_cognito_signup_handler(event, context):
 
 @worker_exception_handler(logger=logger)
 def sync_users_handler(event, context):
-    __user_service.sync_users()
+    return __user_service.sync_users(
+        get_remaining_time_in_millis=getattr(context, "get_remaining_time_in_millis", None)
+    )
+
+
+@worker_exception_handler(logger=logger)
+def publish_service_rating_updates_handler(event, context):
+    return __user_service.publish_service_rating_updates()
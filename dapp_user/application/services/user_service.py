@@ -1,4 +1,6 @@
-from typing import List
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Callable, List
 
 from common.constant import TokenSymbol
 from common.exceptions import BadGateway
@@ -12,13 +14,17 @@ from dapp_user.application.schemas import (
 )
 from dapp_user.domain.factory.user_factory import UserFactory
 from dapp_user.domain.interfaces.contract_api_client_interface import AbstractContractAPIClient
-from dapp_user.domain.interfaces.user_identity_manager_interface import UserIdentityManager
+from dapp_user.domain.interfaces.user_identity_manager_interface import (
+    PaginationTokenExpiredException,
+    UserIdentityManager,
+)
 from dapp_user.domain.interfaces.user_repository_interface import AbstractUserRepository
 from dapp_user.domain.interfaces.wallet_api_client_interface import AbstractWalletsAPIClient
+from dapp_user.domain.models.service_rating import ServiceRatingUpdate
 from dapp_user.domain.models.user_preference import user_preferences_to_dict
 from dapp_user.exceptions import UserNotFoundHTTPException, UserReviewAlreadyExistHTTPException
 from dapp_user.infrastructure.cognito_api import CognitoUserManager
-from dapp_user.infrastructure.contract_api_client import ContractAPIClient, ContractAPIClientError
+from dapp_user.infrastructure.contract_api_client import ContractAPIClient
 from dapp_user.infrastructure.db import DefaultSessionFactory, session_scope
 from dapp_user.infrastructure.repositories.exceptions import (
     FeedbackAlreadyExistsException,
@@ -32,6 +38,13 @@ from sqlalchemy.orm import sessionmaker
 
 logger = get_logger(__name__)
 
+USER_SYNC_STATE_NAME = "cognito_users"
+SYNC_USERS_TIME_RESERVE_IN_MILLIS = 30000
+SERVICE_RATING_UPDATES_BATCH_SIZE = 100
+SERVICE_RATING_UPDATE_MAX_ATTEMPTS = 10
+SERVICE_RATING_UPDATE_RETRY_DELAY_IN_SECONDS = 60
+SERVICE_RATING_UPDATE_MAX_RETRY_DELAY_IN_SECONDS = 6 * 60 * 60
+
 
 class UserService:
     def __init__(
@@ -95,11 +108,73 @@ class UserService:
             logger.error(msg)
             raise BadGateway(msg)
 
-    def sync_users(self) -> None:
-        users_for_sync = self.user_identity_manager.get_all_users()
-
+    def sync_users(self, get_remaining_time_in_millis: Callable[[], int] | None = None) -> dict:
+        """
+        Upserts users modified in the identity provider since the last completed sync, page by page.
+        Every page is committed together with the pagination checkpoint, so when the time of the
+        invocation is running out the sync stops and the next invocation resumes from the checkpoint.
+        """
         with session_scope(self.session_factory) as session:
-            self.user_repo.batch_insert_users(session, users_for_sync)
+            sync_state = self.user_repo.get_user_sync_state(session, name=USER_SYNC_STATE_NAME)
+        if not sync_state.in_progress:
+            sync_state = replace(sync_state, run_started_at=self.__utc_now())
+
+        pages = scanned_users = synced_users = 0
+        while True:
+            if (
+                get_remaining_time_in_millis is not None
+                and get_remaining_time_in_millis() < SYNC_USERS_TIME_RESERVE_IN_MILLIS
+            ):
+                logger.info("Sync users interrupted, it will resume from the checkpoint")
+                break
+
+            try:
+                page = self.user_identity_manager.get_users_page(
+                    pagination_token=sync_state.pagination_token,
+                    modified_since=sync_state.watermark,
+                )
+            except PaginationTokenExpiredException:
+                logger.warning(
+                    "Sync users checkpoint is expired, starting the sync from the beginning"
+                )
+                sync_state = replace(
+                    sync_state, pagination_token=None, run_started_at=self.__utc_now()
+                )
+                continue
+
+            if page.pagination_token is not None:
+                sync_state = replace(sync_state, pagination_token=page.pagination_token)
+            else:
+                # users modified while the run was in progress are synced again by the next run
+                sync_state = replace(
+                    sync_state,
+                    watermark=sync_state.run_started_at,
+                    pagination_token=None,
+                    run_started_at=None,
+                )
+            with session_scope(self.session_factory) as session:
+                self.user_repo.batch_insert_users(session, page.users)
+                self.user_repo.save_user_sync_state(session, sync_state)
+
+            pages += 1
+            scanned_users += page.scanned_count
+            synced_users += len(page.users)
+            if not sync_state.in_progress:
+                break
+
+        result = {
+            "completed": not sync_state.in_progress,
+            "pages": pages,
+            "scanned_users": scanned_users,
+            "synced_users": synced_users,
+        }
+        logger.info(f"Sync users result: {result}")
+        return result
+
+    @staticmethod
+    def __utc_now() -> datetime:
+        # TIMESTAMP columns keep whole seconds, truncating keeps the watermark conservative
+        return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
 
     def register_user(self, request: CognitoUserPoolEvent) -> dict:
         new_user = UserFactory.user_from_cognito_request(event=request)
@@ -147,6 +222,8 @@ class UserService:
     def create_user_review(
         self, origin: str, username: str, request: CreateUserServiceReviewRequest
     ) -> None:
+        token_name = self.__get_token_from_origin(origin)
+
         try:
             with session_scope(self.session_factory) as session:
                 user = self.user_repo.get_user(session, username=username)
@@ -155,23 +232,86 @@ class UserService:
                     user_row_id=user.row_id, create_feedback_request=request
                 )
 
-                rating, total_users_rated = self.user_repo.submit_user_review(
+                self.user_repo.submit_user_review(
                     session=session, user_vote=user_vote, user_feedback=user_feedback
                 )
+                # contract_api gets the rating asynchronously, see publish_service_rating_updates
+                self.user_repo.enqueue_service_rating_update(
+                    session,
+                    org_id=user_vote.org_id,
+                    service_id=user_vote.service_id,
+                    token_name=token_name,
+                )
         except (VoteAlreadyExistsException, FeedbackAlreadyExistsException):
             raise UserReviewAlreadyExistHTTPException()
 
-        token_name = self.__get_token_from_origin(origin)
+    def publish_service_rating_updates(
+        self, limit: int = SERVICE_RATING_UPDATES_BATCH_SIZE
+    ) -> dict:
+        """
+        Pushes pending service ratings to contract_api. Reviews of a service submitted before the
+        push are coalesced into one update with the current aggregate. A failed update is retried
+        with an exponential backoff and parked after SERVICE_RATING_UPDATE_MAX_ATTEMPTS failures,
+        until a new review of the service enqueues it again.
+        """
+        with session_scope(self.session_factory) as session:
+            service_rating_updates = self.user_repo.get_service_rating_updates(
+                session, limit=limit, max_attempts=SERVICE_RATING_UPDATE_MAX_ATTEMPTS
+            )
 
-        try:
-            self.contract_api_client.update_service_rating(
-                org_id=user_vote.org_id,
-                service_id=user_vote.service_id,
-                rating=float(rating),
-                total_users_rated=total_users_rated,
-                token_name=token_name,
+        published = failed = 0
+        for service_rating_update in service_rating_updates:
+            try:
+                self.__publish_service_rating_update(service_rating_update)
+            except Exception as e:
+                # one broken update must not block the others
+                self.__postpone_service_rating_update(service_rating_update, e)
+                failed += 1
+                continue
+            published += 1
+
+        result = {"published": published, "failed": failed}
+        logger.info(f"Publish service rating updates result: {result}")
+        return result
+
+    def __publish_service_rating_update(self, service_rating_update: ServiceRatingUpdate) -> None:
+        with session_scope(self.session_factory) as session:
+            service_rating = self.user_repo.get_service_rating(
+                session,
+                org_id=service_rating_update.org_id,
+                service_id=service_rating_update.service_id,
+            )
+
+        self.contract_api_client.update_service_rating(
+            org_id=service_rating.org_id,
+            service_id=service_rating.service_id,
+            rating=service_rating.rating,
+            total_users_rated=service_rating.total_users_rated,
+            token_name=service_rating_update.token_name,
+        )
+
+        with session_scope(self.session_factory) as session:
+            # a review submitted during the push enqueues the update again, it stays for the next run
+            self.user_repo.delete_service_rating_update(session, service_rating_update)
+
+    def __postpone_service_rating_update(
+        self, service_rating_update: ServiceRatingUpdate, error: Exception
+    ) -> None:
+        attempts = service_rating_update.attempts + 1
+        service = f"{service_rating_update.org_id}/{service_rating_update.service_id}"
+        if attempts >= SERVICE_RATING_UPDATE_MAX_ATTEMPTS:
+            logger.error(
+                f"Parking service rating update for {service} after {attempts} attempts: {repr(error)}"
+            )
+        else:
+            logger.warning(
+                f"Failed to update service rating for {service}, attempt {attempts}: {repr(error)}"
+            )
+        delay_in_seconds = min(
+            SERVICE_RATING_UPDATE_RETRY_DELAY_IN_SECONDS * 2**service_rating_update.attempts,
+            SERVICE_RATING_UPDATE_MAX_RETRY_DELAY_IN_SECONDS,
+        )
+        with session_scope(self.session_factory) as session:
+            self.user_repo.postpone_service_rating_update(
+                session, service_rating_update, delay_in_seconds=delay_in_seconds
             )
-        except ContractAPIClientError as e:
-            msg = f"Failed to update service rating for {user_vote.org_id}/{user_vote.service_id}: {str(e)}"
-            logger.error(msg)
-            raise BadGateway(msg)
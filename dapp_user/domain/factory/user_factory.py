@@ -1,19 +1,25 @@
 from typing import List, Sequence, Tuple
 
+from common.constant import TokenSymbol
 from dapp_user.application.schemas import (
     AddOrUpdateUserPreferencesRequest,
     CognitoUserPoolEvent,
     CreateUserServiceReviewRequest,
 )
 from dapp_user.constant import CommunicationType, PreferenceType, SourceDApp, Status
+from dapp_user.domain.models.service_rating import ServiceRating, ServiceRatingUpdate
 from dapp_user.domain.models.user import NewUser, User
 from dapp_user.domain.models.user_preference import UserPreference
 from dapp_user.domain.models.user_service_feedback import UserServiceFeedback
 from dapp_user.domain.models.user_service_vote import UserServiceVote
+from dapp_user.domain.models.user_sync_state import UserSyncState
+from dapp_user.infrastructure.models import ServiceRating as ServiceRatingDB
+from dapp_user.infrastructure.models import ServiceRatingOutbox as ServiceRatingOutboxDB
 from dapp_user.infrastructure.models import User as UserDB
 from dapp_user.infrastructure.models import UserPreference as UserPreferenceDB
 from dapp_user.infrastructure.models import UserServiceFeedback as UserServiceFeedbackDB
 from dapp_user.infrastructure.models import UserServiceVote as UserServiceVoteDB
+from dapp_user.infrastructure.models import UserSyncState as UserSyncStateDB
 
 
 class UserFactory:
@@ -108,6 +114,37 @@ class UserFactory:
             is_terms_accepted=True,
         )
 
+    @staticmethod
+    def service_rating_from_db_model(service_rating_db: ServiceRatingDB) -> ServiceRating:
+        return ServiceRating(
+            org_id=service_rating_db.org_id,
+            service_id=service_rating_db.service_id,
+            rating_sum=service_rating_db.rating_sum,
+            total_users_rated=service_rating_db.total_users_rated,
+        )
+
+    @staticmethod
+    def service_rating_update_from_db_model(
+        service_rating_outbox_db: ServiceRatingOutboxDB,
+    ) -> ServiceRatingUpdate:
+        return ServiceRatingUpdate(
+            row_id=service_rating_outbox_db.row_id,
+            org_id=service_rating_outbox_db.org_id,
+            service_id=service_rating_outbox_db.service_id,
+            token_name=TokenSymbol(service_rating_outbox_db.token_name),
+            version=service_rating_outbox_db.version,
+            attempts=service_rating_outbox_db.attempts,
+        )
+
+    @staticmethod
+    def user_sync_state_from_db_model(user_sync_state_db: UserSyncStateDB) -> UserSyncState:
+        return UserSyncState(
+            name=user_sync_state_db.name,
+            watermark=user_sync_state_db.watermark,
+            pagination_token=user_sync_state_db.pagination_token,
+            run_started_at=user_sync_state_db.run_started_at,
+        )
+
     @staticmethod
     def user_from_db_model(user_db: UserDB) -> User:
         return User(
@@ -1,11 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
 
-from dapp_user.domain.models.user import NewUser
+from dapp_user.domain.models.user_sync_state import IdentityUsersPage
+
+
+class PaginationTokenExpiredException(Exception):
+    """Raised when the identity provider no longer accepts a saved pagination token"""
+
+    def __init__(self):
+        super().__init__("Pagination token is expired")
 
 
 class UserIdentityManager(ABC):
     @abstractmethod
-    def get_all_users(self) -> List[NewUser]:
-        """Fetch all users from the identity provider"""
+    def get_users_page(
+        self, pagination_token: str | None = None, modified_since: datetime | None = None
+    ) -> IdentityUsersPage:
+        """Fetch one page of users from the identity provider, skipping users not modified since
+        modified_since (naive UTC). The page's pagination_token is None on the last page."""
         pass
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import List, Tuple
 
+from common.constant import TokenSymbol
+from dapp_user.domain.models.service_rating import ServiceRating as ServiceRatingDomain
+from dapp_user.domain.models.service_rating import ServiceRatingUpdate as ServiceRatingUpdateDomain
 from dapp_user.domain.models.user import (
     NewUser as NewUserDomain,
 )
@@ -12,6 +15,7 @@ from dapp_user.domain.models.user_service_feedback import (
     UserServiceFeedback as UserServiceFeedbackDomain,
 )
 from dapp_user.domain.models.user_service_vote import UserServiceVote as UserServiceVoteDomain
+from dapp_user.domain.models.user_sync_state import UserSyncState as UserSyncStateDomain
 from sqlalchemy.orm import Session
 
 
@@ -33,6 +37,42 @@ class AbstractUserRepository(ABC):
         self, session: Session, users: List[NewUserDomain], batch_size: int = 100
     ) -> None: ...
 
+    @abstractmethod
+    def get_service_rating(
+        self, session: Session, org_id: str, service_id: str
+    ) -> ServiceRatingDomain: ...
+
+    @abstractmethod
+    def enqueue_service_rating_update(
+        self, session: Session, org_id: str, service_id: str, token_name: TokenSymbol
+    ) -> None: ...
+
+    @abstractmethod
+    def get_service_rating_updates(
+        self, session: Session, limit: int, max_attempts: int
+    ) -> List[ServiceRatingUpdateDomain]: ...
+
+    @abstractmethod
+    def delete_service_rating_update(
+        self, session: Session, service_rating_update: ServiceRatingUpdateDomain
+    ) -> bool: ...
+
+    @abstractmethod
+    def postpone_service_rating_update(
+        self,
+        session: Session,
+        service_rating_update: ServiceRatingUpdateDomain,
+        delay_in_seconds: int,
+    ) -> None: ...
+
+    @abstractmethod
+    def get_user_sync_state(self, session: Session, name: str) -> UserSyncStateDomain: ...
+
+    @abstractmethod
+    def save_user_sync_state(
+        self, session: Session, user_sync_state: UserSyncStateDomain
+    ) -> None: ...
+
     @abstractmethod
     def get_user_preferences(
         self, session: Session, username: str
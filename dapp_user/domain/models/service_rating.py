@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from common.constant import TokenSymbol
+
+
+@dataclass(frozen=True)
+class ServiceRating:
+    org_id: str
+    service_id: str
+    rating_sum: Decimal
+    total_users_rated: int
+
+    @property
+    def rating(self) -> float:
+        if not self.total_users_rated:
+            return 0.0
+        return float(self.rating_sum / self.total_users_rated)
+
+
+@dataclass(frozen=True)
+class ServiceRatingUpdate:
+    """Pending push of the service rating to contract_api, repeated updates of a service share one"""
+
+    row_id: int
+    org_id: str
+    service_id: str
+    token_name: TokenSymbol
+    version: int
+    attempts: int
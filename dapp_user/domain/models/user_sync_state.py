@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List
+
+from dapp_user.domain.models.user import NewUser
+
+
+@dataclass(frozen=True)
+class UserSyncState:
+    name: str
+    # users modified before the watermark are already synced
+    watermark: datetime | None = None
+    # set only while a run is in progress, the next invocation resumes from it
+    pagination_token: str | None = None
+    run_started_at: datetime | None = None
+
+    @property
+    def in_progress(self) -> bool:
+        return self.pagination_token is not None
+
+
+@dataclass(frozen=True)
+class IdentityUsersPage:
+    users: List[NewUser]
+    scanned_count: int
+    pagination_token: str | None
@@ -1,59 +1,82 @@
 import json
+from datetime import datetime, timezone
 from typing import Dict, List
 
-import boto3
+from common.boto_utils import get_boto_client
 from dapp_user.constant import CognitoAttributes
-from dapp_user.domain.interfaces.user_identity_manager_interface import UserIdentityManager
+from dapp_user.domain.interfaces.user_identity_manager_interface import (
+    PaginationTokenExpiredException,
+    UserIdentityManager,
+)
 from dapp_user.domain.models.user import NewUser
+from dapp_user.domain.models.user_sync_state import IdentityUsersPage
 from dapp_user.settings import settings
 
 
 class CognitoUserManager(UserIdentityManager):
     def __init__(self, user_pool_id: str):
-        self.client = boto3.client("cognito-idp", region_name=settings.aws.region_name)
         self.user_pool_id = user_pool_id
 
-    def get_all_users(self) -> List[NewUser]:
-        users: List[NewUser] = []
-        pagination_token = None
+    @property
+    def client(self):
+        # the client is created by the first call, UserService is instantiated at handler import
+        return get_boto_client("cognito-idp", region_name=settings.aws.region_name)
 
-        while True:
-            params = {
-                "UserPoolId": self.user_pool_id,
-                "Limit": 60,
-            }
-            if pagination_token:
-                params["PaginationToken"] = pagination_token
+    def get_users_page(
+        self, pagination_token: str | None = None, modified_since: datetime | None = None
+    ) -> IdentityUsersPage:
+        params = {
+            "UserPoolId": self.user_pool_id,
+            "Limit": 60,
+        }
+        if pagination_token:
+            params["PaginationToken"] = pagination_token
 
+        try:
             response = self.client.list_users(**params)
+        except self.client.exceptions.InvalidParameterException:
+            if pagination_token:
+                raise PaginationTokenExpiredException()
+            raise
+
+        users: List[NewUser] = []
+        for user in response["Users"]:
+            if (
+                modified_since is not None
+                and self._to_naive_utc(user["UserLastModifiedDate"]) < modified_since
+            ):
+                continue
 
-            for user in response["Users"]:
-                attr_map: Dict[str, str] = {
-                    attr["Name"]: attr["Value"] for attr in user.get("Attributes", [])
-                }
+            attr_map: Dict[str, str] = {
+                attr["Name"]: attr["Value"] for attr in user.get("Attributes", [])
+            }
 
-                if not attr_map.get("nickname"):
-                    continue
+            if not attr_map.get("nickname"):
+                continue
 
-                new_user = NewUser(
-                    account_id=attr_map["sub"],
-                    username=attr_map["email"],
-                    name=attr_map["nickname"],
-                    email=attr_map["email"],
-                    email_verified=True,
-                    email_alerts=True,
-                    status=True,
-                    is_terms_accepted=self._parse_terms_accepted(
-                        attr_map.get(CognitoAttributes.TNC)
-                    ),
-                )
-                users.append(new_user)
+            new_user = NewUser(
+                account_id=attr_map["sub"],
+                username=attr_map["email"],
+                name=attr_map["nickname"],
+                email=attr_map["email"],
+                email_verified=True,
+                email_alerts=True,
+                status=True,
+                is_terms_accepted=self._parse_terms_accepted(attr_map.get(CognitoAttributes.TNC)),
+            )
+            users.append(new_user)
 
-            pagination_token = response.get("PaginationToken")
-            if not pagination_token:
-                break
+        return IdentityUsersPage(
+            users=users,
+            scanned_count=len(response["Users"]),
+            pagination_token=response.get("PaginationToken"),
+        )
 
-        return users
+    @staticmethod
+    def _to_naive_utc(value: datetime) -> datetime:
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
 
     def _parse_terms_accepted(self, json_str: str | None) -> bool:
         if not json_str:
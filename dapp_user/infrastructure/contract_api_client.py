@@ -1,7 +1,7 @@
 import json
 from http import HTTPStatus
 
-import boto3
+from common.boto_utils import get_boto_client
 from common.constant import TokenSymbol
 from common.exceptions import WrongTokenSymbolException
 from dapp_user.domain.interfaces.contract_api_client_interface import AbstractContractAPIClient
@@ -14,8 +14,9 @@ class ContractAPIClientError(Exception):
 
 
 class ContractAPIClient(AbstractContractAPIClient):
-    def __init__(self):
-        self.lambda_client = boto3.client("lambda", region_name=settings.aws.region_name)
+    @property
+    def lambda_client(self):
+        return get_boto_client("lambda", region_name=settings.aws.region_name)
 
     def update_service_rating(
         self,
@@ -4,9 +4,11 @@ from decimal import Decimal
 from sqlalchemy import (
     BOOLEAN,
     DECIMAL,
+    TEXT,
     VARCHAR,
     BigInteger,
     ForeignKey,
+    Index,
     Integer,
     UniqueConstraint,
     text,
@@ -124,3 +126,65 @@ class UserServiceFeedback(Base):
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP, server_default=UpdateTimestamp, nullable=True
     )
+
+
+class UserSyncState(Base):
+    __tablename__ = "user_sync_state"
+
+    row_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(VARCHAR(128), nullable=False, unique=True)
+    watermark: Mapped[datetime | None] = mapped_column(TIMESTAMP, nullable=True)
+    pagination_token: Mapped[str | None] = mapped_column(TEXT, nullable=True)
+    run_started_at: Mapped[datetime | None] = mapped_column(TIMESTAMP, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=CreateTimestamp, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=UpdateTimestamp, nullable=False
+    )
+
+
+class ServiceRating(Base):
+    __tablename__ = "service_rating"
+
+    row_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    org_id: Mapped[str] = mapped_column(VARCHAR(128), nullable=False)
+    service_id: Mapped[str] = mapped_column(VARCHAR(128), nullable=False)
+    rating_sum: Mapped[Decimal] = mapped_column(DECIMAL(19, 1), nullable=False, default=0)
+    total_users_rated: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=CreateTimestamp, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=UpdateTimestamp, nullable=False
+    )
+
+    __table_args__ = (UniqueConstraint(org_id, service_id, name="service_rating_unique"),)
+
+
+class ServiceRatingOutbox(Base):
+    __tablename__ = "service_rating_outbox"
+
+    row_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    org_id: Mapped[str] = mapped_column(VARCHAR(128), nullable=False)
+    service_id: Mapped[str] = mapped_column(VARCHAR(128), nullable=False)
+    token_name: Mapped[str] = mapped_column(VARCHAR(16), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=CreateTimestamp, nullable=False
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=CreateTimestamp, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=UpdateTimestamp, nullable=False
+    )
+
+    __table_args__ = (
+        UniqueConstraint(org_id, service_id, token_name, name="service_rating_outbox_unique"),
+        Index("service_rating_outbox_next_attempt_at_idx", next_attempt_at),
+    )
@@ -1,8 +1,12 @@
+from decimal import Decimal
 from typing import List, Tuple
 
+from common.constant import TokenSymbol
 from common.utils import chunked
 from dapp_user.constant import Status
 from dapp_user.domain.factory.user_factory import UserFactory
+from dapp_user.domain.models.service_rating import ServiceRating as ServiceRatingDomain
+from dapp_user.domain.models.service_rating import ServiceRatingUpdate as ServiceRatingUpdateDomain
 from dapp_user.domain.models.user import NewUser as NewUserDomain
 from dapp_user.domain.models.user import User as UserDomain
 from dapp_user.domain.models.user_preference import UserPreference as UserPreferenceDomain
@@ -10,11 +14,15 @@ from dapp_user.domain.models.user_service_feedback import (
     UserServiceFeedback as UserServiceFeedbackDomain,
 )
 from dapp_user.domain.models.user_service_vote import UserServiceVote as UserServiceVoteDomain
+from dapp_user.domain.models.user_sync_state import UserSyncState as UserSyncStateDomain
 from dapp_user.infrastructure.models import (
+    ServiceRating,
+    ServiceRatingOutbox,
     User,
     UserPreference,
     UserServiceFeedback,
     UserServiceVote,
+    UserSyncState,
 )
 from dapp_user.infrastructure.repositories.exceptions import (
     UserAlreadyExistsException,
@@ -23,7 +31,7 @@ from dapp_user.infrastructure.repositories.exceptions import (
     FeedbackAlreadyExistsException,
 )
 
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import and_, delete, func, select, text, update
 from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
@@ -90,6 +98,22 @@ class UserRepository:
         return UserFactory.user_preferences_from_db_model(user_preference_db)
 
     def delete_user(self, session: Session, username: str):
+        # votes are deleted by the cascade, so they are taken out of the service ratings first
+        votes_query = (
+            select(UserServiceVote)
+            .join(User, User.row_id == UserServiceVote.user_row_id)
+            .where(User.username == username, UserServiceVote.rating.isnot(None))
+            .with_for_update()
+        )
+        for vote in session.execute(votes_query).scalars().all():
+            self.__apply_service_rating_delta(
+                session,
+                org_id=vote.org_id,
+                service_id=vote.service_id,
+                rating_delta=-vote.rating,
+                count_delta=-1,
+            )
+
         query = delete(User).where(User.username == username)
         result = session.execute(query)
         if result.rowcount == 0:
@@ -128,6 +152,28 @@ class UserRepository:
 
             session.execute(query)
 
+    def get_user_sync_state(self, session: Session, name: str) -> UserSyncStateDomain:
+        query = select(UserSyncState).where(UserSyncState.name == name)
+        result = session.execute(query)
+        user_sync_state_db = result.scalar_one_or_none()
+        if user_sync_state_db is None:
+            return UserSyncStateDomain(name=name)
+        return UserFactory.user_sync_state_from_db_model(user_sync_state_db)
+
+    def save_user_sync_state(self, session: Session, user_sync_state: UserSyncStateDomain) -> None:
+        query = insert(UserSyncState).values(
+            name=user_sync_state.name,
+            watermark=user_sync_state.watermark,
+            pagination_token=user_sync_state.pagination_token,
+            run_started_at=user_sync_state.run_started_at,
+        )
+        query = query.on_duplicate_key_update(
+            watermark=query.inserted.watermark,
+            pagination_token=query.inserted.pagination_token,
+            run_started_at=query.inserted.run_started_at,
+        )
+        session.execute(query)
+
     def insert_user(self, session: Session, user: UserDomain | NewUserDomain):
         try:
             query = insert(User).values(
@@ -145,23 +191,35 @@ class UserRepository:
         except IntegrityError:
             raise UserAlreadyExistsException(username=user.email)
 
-    def __update_or_set_user_vote(self, session: Session, user_vote: UserServiceVoteDomain) -> None:
-        query = select(UserServiceVote).where(
-            UserServiceVote.user_row_id == user_vote.user_row_id,
-            UserServiceVote.org_id == user_vote.org_id,
-            UserServiceVote.service_id == user_vote.service_id,
+    def __update_or_set_user_vote(
+        self, session: Session, user_vote: UserServiceVoteDomain
+    ) -> Decimal | None:
+        """Returns the previous rating of the user, None for a new vote"""
+        query = (
+            select(UserServiceVote)
+            .where(
+                UserServiceVote.user_row_id == user_vote.user_row_id,
+                UserServiceVote.org_id == user_vote.org_id,
+                UserServiceVote.service_id == user_vote.service_id,
+            )
+            .with_for_update()
         )
         vote = session.execute(query).scalar_one_or_none()
         if vote:
+            previous_rating = vote.rating
             vote.rating = user_vote.rating
-        else:
-            new_vote = UserServiceVote(
-                user_row_id=user_vote.user_row_id,
-                org_id=user_vote.org_id,
-                service_id=user_vote.service_id,
-                rating=user_vote.rating,
-            )
-            session.add(new_vote)
+            session.flush()
+            return previous_rating
+
+        new_vote = UserServiceVote(
+            user_row_id=user_vote.user_row_id,
+            org_id=user_vote.org_id,
+            service_id=user_vote.service_id,
+            rating=user_vote.rating,
+        )
+        session.add(new_vote)
+        session.flush()
+        return None
 
     def __update_or_set_user_feedback(
         self, session: Session, user_feedback: UserServiceFeedbackDomain,
@@ -183,20 +241,97 @@ class UserRepository:
             )
             session.add(new_feedback)
 
-    def __aggregate_service_rating(
+    def __apply_service_rating_delta(
+        self,
+        session: Session,
+        org_id: str,
+        service_id: str,
+        rating_delta: Decimal,
+        count_delta: int,
+    ) -> None:
+        if not rating_delta and not count_delta:
+            return
+        query = insert(ServiceRating).values(
+            org_id=org_id,
+            service_id=service_id,
+            rating_sum=rating_delta,
+            total_users_rated=count_delta,
+        )
+        query = query.on_duplicate_key_update(
+            rating_sum=ServiceRating.rating_sum + query.inserted.rating_sum,
+            total_users_rated=ServiceRating.total_users_rated + query.inserted.total_users_rated,
+        )
+        session.execute(query)
+
+    def get_service_rating(
         self, session: Session, org_id: str, service_id: str
-    ) -> Tuple[float, int]:
-        agg_stmt = select(
-            func.avg(UserServiceVote.rating).label("avg_rating"),
-            func.count(UserServiceVote.rating).label("total_rated"),
-        ).where(
-            UserServiceVote.org_id == org_id,
-            UserServiceVote.service_id == service_id,
-            UserServiceVote.rating.isnot(None),
+    ) -> ServiceRatingDomain:
+        query = select(ServiceRating).where(
+            ServiceRating.org_id == org_id,
+            ServiceRating.service_id == service_id,
         )
-        result = session.execute(agg_stmt).one()
-        avg_rating, total_rated = result
-        return avg_rating or 0.0, total_rated
+        service_rating_db = session.execute(query).scalar_one_or_none()
+        if service_rating_db is None:
+            return ServiceRatingDomain(
+                org_id=org_id, service_id=service_id, rating_sum=Decimal(0), total_users_rated=0
+            )
+        return UserFactory.service_rating_from_db_model(service_rating_db)
+
+    def enqueue_service_rating_update(
+        self, session: Session, org_id: str, service_id: str, token_name: TokenSymbol
+    ) -> None:
+        query = insert(ServiceRatingOutbox).values(
+            org_id=org_id, service_id=service_id, token_name=token_name.value, version=1
+        )
+        # a new review revives a parked update, its postponed attempt is kept
+        query = query.on_duplicate_key_update(version=ServiceRatingOutbox.version + 1, attempts=0)
+        session.execute(query)
+
+    def get_service_rating_updates(
+        self, session: Session, limit: int, max_attempts: int
+    ) -> List[ServiceRatingUpdateDomain]:
+        """Updates due for an attempt, the ones that failed max_attempts times are parked"""
+        query = (
+            select(ServiceRatingOutbox)
+            .where(
+                ServiceRatingOutbox.next_attempt_at <= func.now(),
+                ServiceRatingOutbox.attempts < max_attempts,
+            )
+            .order_by(ServiceRatingOutbox.next_attempt_at, ServiceRatingOutbox.row_id)
+            .limit(limit)
+        )
+        result = session.execute(query)
+        return [
+            UserFactory.service_rating_update_from_db_model(update_db)
+            for update_db in result.scalars().all()
+        ]
+
+    def delete_service_rating_update(
+        self, session: Session, service_rating_update: ServiceRatingUpdateDomain
+    ) -> bool:
+        """Deletes the update unless it was enqueued again after it had been read"""
+        query = delete(ServiceRatingOutbox).where(
+            ServiceRatingOutbox.row_id == service_rating_update.row_id,
+            ServiceRatingOutbox.version == service_rating_update.version,
+        )
+        result = session.execute(query)
+        return result.rowcount > 0
+
+    def postpone_service_rating_update(
+        self,
+        session: Session,
+        service_rating_update: ServiceRatingUpdateDomain,
+        delay_in_seconds: int,
+    ) -> None:
+        query = (
+            update(ServiceRatingOutbox)
+            .where(ServiceRatingOutbox.row_id == service_rating_update.row_id)
+            .values(
+                attempts=ServiceRatingOutbox.attempts + 1,
+                next_attempt_at=func.timestampadd(text("SECOND"), delay_in_seconds, func.now()),
+            )
+        )
+        session.execute(query)
 
     def submit_user_review(
         self,
@@ -205,7 +340,7 @@ class UserRepository:
         user_feedback: UserServiceFeedbackDomain | None,
     ) -> Tuple[float, int]:
         try:
-            self.__update_or_set_user_vote(session, user_vote)
+            previous_rating = self.__update_or_set_user_vote(session, user_vote)
         except IntegrityError:
             raise VoteAlreadyExistsException()
 
@@ -215,12 +350,18 @@ class UserRepository:
             except IntegrityError:
                 raise FeedbackAlreadyExistsException()
 
-        avg_rating, total_rated = self.__aggregate_service_rating(
-            session=session,
+        new_rating = None if user_vote.rating is None else Decimal(str(user_vote.rating))
+        self.__apply_service_rating_delta(
+            session,
             org_id=user_vote.org_id,
             service_id=user_vote.service_id,
+            rating_delta=(new_rating or Decimal(0)) - (previous_rating or Decimal(0)),
+            count_delta=(new_rating is not None) - (previous_rating is not None),
+        )
+        service_rating = self.get_service_rating(
+            session, org_id=user_vote.org_id, service_id=user_vote.service_id
         )
-        return avg_rating, total_rated
+        return service_rating.rating, service_rating.total_users_rated
 
     def get_user_service_vote_and_feedback(
         self, session: Session, username: str, org_id: str, service_id: str
@@ -288,6 +429,14 @@ class UserRepository:
         )
 
         session.add(new_vote)
+        rating = None if user_vote.rating is None else Decimal(str(user_vote.rating))
+        self.__apply_service_rating_delta(
+            session,
+            org_id=user_vote.org_id,
+            service_id=user_vote.service_id,
+            rating_delta=rating or Decimal(0),
+            count_delta=int(rating is not None),
+        )
 
         return UserFactory().user_service_vote_from_db_model(new_vote)
 
@@ -1,7 +1,7 @@
 import json
 from http import HTTPStatus
 
-import boto3
+from common.boto_utils import get_boto_client
 from common.constant import TokenSymbol
 from common.exceptions import WrongTokenSymbolException
 from common.logger import get_logger
@@ -21,8 +21,9 @@ class DeleteUserWalletError(WalletsAPIClientError):
 
 
 class WalletsAPIClient(AbstractWalletsAPIClient):
-    def __init__(self):
-        self.lambda_client = boto3.client("lambda", region_name=settings.aws.region_name)
+    @property
+    def lambda_client(self):
+        return get_boto_client("lambda", region_name=settings.aws.region_name)
 
     def delete_user_wallet(self, username: str, token_name: TokenSymbol) -> bool:
         lambda_payload = {
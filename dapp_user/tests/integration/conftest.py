@@ -1,4 +1,5 @@
 import os
+from datetime import datetime
 from typing import Callable, Generator, List, Tuple
 
 import pytest
@@ -9,6 +10,7 @@ from dapp_user.domain.models.user_service_feedback import (
     UserServiceFeedback as UserServiceFeedbackDomain,
 )
 from dapp_user.domain.models.user_service_vote import UserServiceVote as UserServiceVoteDomain
+from dapp_user.domain.models.user_sync_state import IdentityUsersPage
 from dapp_user.infrastructure.models import (
     User,
     UserPreference,
@@ -297,7 +299,13 @@ def fake_cognito_users() -> List[NewUser]:
 @pytest.fixture
 def mock_user_identity_manager(fake_cognito_users: List[NewUser]):
     class MockUserIdentityManager:
-        def get_all_users(self) -> List[NewUser]:
-            return fake_cognito_users
+        def get_users_page(
+            self, pagination_token: str | None = None, modified_since: datetime | None = None
+        ) -> IdentityUsersPage:
+            return IdentityUsersPage(
+                users=fake_cognito_users,
+                scanned_count=len(fake_cognito_users),
+                pagination_token=None,
+            )
 
     return MockUserIdentityManager()
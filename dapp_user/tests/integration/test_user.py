@@ -5,20 +5,29 @@ from typing import List, Tuple
 from unittest.mock import MagicMock
 
 import pytest
+from common.constant import TokenSymbol
+from common.exceptions import WrongTokenSymbolException
 from dapp_user.application.handlers import user_handlers
-from dapp_user.application.services.user_service import UserService
+from dapp_user.application.services.user_service import (
+    SERVICE_RATING_UPDATE_MAX_ATTEMPTS,
+    USER_SYNC_STATE_NAME,
+    UserService,
+)
 from dapp_user.domain.interfaces.user_identity_manager_interface import UserIdentityManager
+from dapp_user.domain.models.user import NewUser
 from dapp_user.domain.models.user_preference import UserPreference as UserPreferenceDomain
 from dapp_user.domain.models.user_service_feedback import (
     UserServiceFeedback as UserServiceFeedbackDomain,
 )
 from dapp_user.domain.models.user_service_vote import UserServiceVote as UserServiceVoteDomain
+from dapp_user.domain.models.user_sync_state import IdentityUsersPage
 from dapp_user.infrastructure.db import session_scope
-from dapp_user.infrastructure.models import User
+from dapp_user.infrastructure.models import ServiceRatingOutbox, User
 from dapp_user.infrastructure.repositories.exceptions import UserNotFoundException
 from dapp_user.infrastructure.repositories.user_repository import UserRepository
 from dapp_user.tests.integration.conftest import TEST_USER
 from pytest import MonkeyPatch
+from sqlalchemy import delete, select
 from sqlalchemy.orm import sessionmaker
 
 
@@ -341,6 +350,126 @@ def test_create_user_service_review_handler_with_comment(
         assert feedback.comment == expected_comment
 
 
+def test_create_user_review_updates_service_rating_once(
+    lambda_event_authorized: dict,
+    create_test_users: List[User],
+    monkeypatch: MonkeyPatch,
+    test_session_factory: sessionmaker,
+):
+    mock_contract_api = MagicMock()
+    user_service = UserService(
+        contract_api_client=mock_contract_api, session_factory=test_session_factory
+    )
+    monkeypatch.setattr(user_handlers, "__user_service", user_service)
+    org_id = "rating_org_id"
+    service_id = "rating_service_id"
+
+    for user_rating in (4.0, 2.0):
+        lambda_event_authorized["body"] = json.dumps(
+            {"orgId": org_id, "serviceId": service_id, "user_rating": user_rating}
+        )
+        result = user_handlers.create_user_review_handler(lambda_event_authorized, context={})
+        assert result["statusCode"] == HTTPStatus.OK
+
+    with session_scope(test_session_factory) as session:
+        UserRepository().submit_user_review(
+            session=session,
+            user_vote=UserServiceVoteDomain(
+                user_row_id=create_test_users[0].row_id,
+                org_id=org_id,
+                service_id=service_id,
+                rating=5.0,
+            ),
+            user_feedback=None,
+        )
+    mock_contract_api.update_service_rating.assert_not_called()
+
+    result = user_service.publish_service_rating_updates()
+
+    assert result == {"published": 1, "failed": 0}
+    mock_contract_api.update_service_rating.assert_called_once()
+    kwargs = mock_contract_api.update_service_rating.call_args.kwargs
+    assert (kwargs["org_id"], kwargs["service_id"]) == (org_id, service_id)
+    assert math.isclose(kwargs["rating"], 3.5)
+    assert kwargs["total_users_rated"] == 2
+
+    assert user_service.publish_service_rating_updates() == {"published": 0, "failed": 0}
+
+    with session_scope(test_session_factory) as session:
+        UserRepository().delete_user(session, create_test_users[0].username)
+        service_rating = UserRepository().get_service_rating(session, org_id, service_id)
+    assert service_rating.total_users_rated == 1
+    assert math.isclose(service_rating.rating, 2.0)
+
+
+
+def test_publish_service_rating_updates_postpones_failed_update(
+    create_test_users: List[User],
+    test_session_factory: sessionmaker,
+):
+    def update_service_rating(org_id, **kwargs):
+        if org_id == "broken_org_id":
+            raise WrongTokenSymbolException()
+
+    mock_contract_api = MagicMock()
+    mock_contract_api.update_service_rating.side_effect = update_service_rating
+    user_service = UserService(
+        contract_api_client=mock_contract_api, session_factory=test_session_factory
+    )
+    with session_scope(test_session_factory) as session:
+        for org_id in ("broken_org_id", "rating_org_id"):
+            UserRepository().enqueue_service_rating_update(
+                session, org_id, "rating_service_id", TokenSymbol.FET
+            )
+
+    assert user_service.publish_service_rating_updates() == {"published": 1, "failed": 1}
+    # the failed update waits for its backoff
+    assert user_service.publish_service_rating_updates() == {"published": 0, "failed": 0}
+
+    with session_scope(test_session_factory) as session:
+        service_rating_outbox = session.execute(select(ServiceRatingOutbox)).scalars().all()
+        assert [(row.org_id, row.attempts) for row in service_rating_outbox] == [
+            ("broken_org_id", 1)
+        ]
+        service_rating_outbox[0].attempts = SERVICE_RATING_UPDATE_MAX_ATTEMPTS
+        service_rating_outbox[0].next_attempt_at = service_rating_outbox[0].created_at
+
+    # parked until a new review of the service
+    assert user_service.publish_service_rating_updates() == {"published": 0, "failed": 0}
+
+    with session_scope(test_session_factory) as session:
+        UserRepository().enqueue_service_rating_update(
+            session, "broken_org_id", "rating_service_id", TokenSymbol.FET
+        )
+    assert user_service.publish_service_rating_updates() == {"published": 0, "failed": 1}
+
+    with session_scope(test_session_factory) as session:
+        session.execute(delete(ServiceRatingOutbox))
+
+
+def test_insert_user_service_vote_updates_service_rating(
+    create_test_users: List[User],
+    test_session_factory: sessionmaker,
+):
+    with session_scope(test_session_factory) as session:
+        UserRepository().insert_user_service_vote(
+            session,
+            UserServiceVoteDomain(
+                user_row_id=create_test_users[0].row_id,
+                org_id="voted_org_id",
+                service_id="voted_service_id",
+                rating=4.0,
+            ),
+        )
+
+    with session_scope(test_session_factory) as session:
+        service_rating = UserRepository().get_service_rating(
+            session, "voted_org_id", "voted_service_id"
+        )
+    assert service_rating.total_users_rated == 1
+    assert math.isclose(service_rating.rating, 4.0)
+
+
 def test_get_user_review(
     lambda_event_authorized: dict,
     create_test_user_feedback_vote: Tuple[UserServiceVoteDomain, UserServiceFeedbackDomain],
@@ -385,3 +514,65 @@ def test_sync_users_handler(
         for cognito_user in fake_cognito_users:
             user = UserRepository().get_user(session=session,username=cognito_user.username)
             assert cognito_user.account_id == user.account_id
+
+
+def test_sync_users_resumes_from_checkpoint(test_session_factory: sessionmaker):
+    new_users = [
+        NewUser(
+            account_id=f"acc-sync-{i}",
+            username=f"sync{i}@example.com",
+            name=f"Sync User {i}",
+            email=f"sync{i}@example.com",
+            email_verified=True,
+            email_alerts=True,
+            status=True,
+            is_terms_accepted=False,
+        )
+        for i in range(2)
+    ]
+    pages = {
+        None: IdentityUsersPage(users=new_users[:1], scanned_count=1, pagination_token="page-2"),
+        "page-2": IdentityUsersPage(users=new_users[1:], scanned_count=1, pagination_token=None),
+    }
+    user_identity_manager = MagicMock()
+    user_identity_manager.get_users_page.side_effect = (
+        lambda pagination_token, modified_since: pages[pagination_token]
+    )
+    user_service = UserService(
+        user_identity_manager=user_identity_manager, session_factory=test_session_factory
+    )
+    with session_scope(test_session_factory) as session:
+        watermark = UserRepository().get_user_sync_state(session, USER_SYNC_STATE_NAME).watermark
+
+    # the time runs out after the first page
+    remaining_times = iter([60000, 0])
+    result = user_service.sync_users(get_remaining_time_in_millis=lambda: next(remaining_times))
+
+    assert result == {"completed": False, "pages": 1, "scanned_users": 1, "synced_users": 1}
+    with session_scope(test_session_factory) as session:
+        sync_state = UserRepository().get_user_sync_state(session, USER_SYNC_STATE_NAME)
+    assert sync_state.pagination_token == "page-2"
+    assert sync_state.watermark == watermark
+
+    result = user_service.sync_users()
+
+    assert result == {"completed": True, "pages": 1, "scanned_users": 1, "synced_users": 1}
+    user_identity_manager.get_users_page.assert_called_with(
+        pagination_token="page-2", modified_since=watermark
+    )
+    with session_scope(test_session_factory) as session:
+        sync_state = UserRepository().get_user_sync_state(session, USER_SYNC_STATE_NAME)
+        for new_user in new_users:
+            user = UserRepository().get_user(session=session, username=new_user.username)
+            assert user.account_id == new_user.account_id
+        for new_user in new_users:
+            UserRepository().delete_user(session, new_user.username)
+    assert sync_state.pagination_token is None
+    assert sync_state.run_started_at is None
+    assert sync_state.watermark is not None
+
+    user_service.sync_users()
+
+    user_identity_manager.get_users_page.assert_called_with(
+        pagination_token=None, modified_since=sync_state.watermark
+    )
@@ -112,9 +112,22 @@ def download_metrics(event, context, metrics_service=None, auth_service=None):
 
     if metrics_service is None:
         metrics_service = MetricsService()
-    file_content, filename = metrics_service.download_metrics(request)
-
-    return generate_lambda_text_file_response(file_content, filename, cors_enabled=True)
+    file_export = metrics_service.download_metrics(request)
+
+    if file_export.url is not None:
+        # the client decides how to download the file uploaded to S3
+        return generate_lambda_response(
+            StatusCode.OK,
+            {
+                "status": "success",
+                "data": {"url": file_export.url, "filename": file_export.filename},
+                "error": {},
+            },
+            cors_enabled=True,
+        )
+    return generate_lambda_text_file_response(
+        file_export.content, file_export.filename, cors_enabled=True
+    )
 
 
 @exception_handler(logger=logger)
@@ -140,19 +153,49 @@ def update_transaction_status(event, context, billing_service=None):
 
 def call_event_consumer(event, context, billing_service=None):
     logger.debug(f"Received events from queue: {event}")
-    events = CallEventConsumerRequest.get_events_from_queue(event)
+    messages = CallEventConsumerRequest.get_messages_from_queue(event)
 
     if billing_service is None:
         billing_service = BillingService()
 
-    logger.debug(f"Events: {events}")
-    for e in events:
-        request = CallEventConsumerRequest.validate_event(e)
-        billing_service.process_call_event(request)
+    logger.debug(f"Events: {messages}")
+    for message_id, body in messages:
+        message = CallEventConsumerRequest.parse_queue_message(body)
+        if message is None:
+            continue
+        request = CallEventConsumerRequest.validate_event(message)
+        billing_service.process_call_event(message_id, request)
 
     return {}
 
 
+def call_event_batch_consumer(event, context, billing_service=None):
+    logger.debug(f"Received events from queue: {event}")
+    messages = CallEventConsumerRequest.get_messages_from_queue(event)
+
+    if billing_service is None:
+        billing_service = BillingService()
+
+    requests = {}
+    failed_message_ids = []
+    for message_id, body in messages:
+        # a malformed record must fail alone, not the whole batch
+        try:
+            message = CallEventConsumerRequest.parse_queue_message(body)
+            if message is None:
+                continue
+            requests[message_id] = CallEventConsumerRequest.validate_event(message)
+        except Exception:
+            logger.exception(f"Invalid call event {message_id}: {body}")
+            failed_message_ids.append(message_id)
+
+    failed_message_ids.extend(billing_service.process_call_events(requests))
+
+    return {
+        "batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed_message_ids]
+    }
+
+
 def update_token_rate(event, context, billing_service=None):
     if billing_service is None:
         billing_service = BillingService()
@@ -8,6 +8,8 @@ from deployer.application.schemas.daemon_schemas import (
     DaemonRequest,
     UpdateConfigRequest,
     UpdateDaemonStatusRequest,
+    RedeployAllDaemonsRequest,
+    RedeployDaemonRequest,
 )
 from deployer.application.services.daemon_service import DaemonService
 
@@ -65,9 +67,22 @@ def download_daemon_logs(event, context, daemon_service=None, auth_service=None)
 
     if daemon_service is None:
         daemon_service = DaemonService()
-    file_content, filename = daemon_service.download_daemon_logs(request)
-
-    return generate_lambda_text_file_response(file_content, filename, cors_enabled=True)
+    file_export = daemon_service.download_daemon_logs(request)
+
+    if file_export.url is not None:
+        # the client decides how to download the file uploaded to S3
+        return generate_lambda_response(
+            StatusCode.OK,
+            {
+                "status": "success",
+                "data": {"url": file_export.url, "filename": file_export.filename},
+                "error": {},
+            },
+            cors_enabled=True,
+        )
+    return generate_lambda_text_file_response(
+        file_export.content, file_export.filename, cors_enabled=True
+    )
 
 
 @exception_handler(logger=logger)
@@ -104,6 +119,21 @@ def update_daemon_status(event, context, daemon_service=None):
     return {}
 
 
+def redeploy_daemon_event_consumer(event, context, daemon_service=None):
+    logger.debug(f"Received events from queue: {event}")
+    events = RedeployDaemonRequest.get_events_from_queue(event)
+
+    if daemon_service is None:
+        daemon_service = DaemonService()
+
+    logger.debug(f"Events: {events}")
+    for e in events:
+        request = RedeployDaemonRequest.validate_event(e)
+        daemon_service.redeploy_daemon(request)
+
+    return {}
+
+
 @exception_handler(logger=logger)
 def deploy_daemon(event, context, daemon_service=None):
     request = DaemonRequest.validate_event(event)
@@ -119,9 +149,13 @@ def deploy_daemon(event, context, daemon_service=None):
 
 @exception_handler(logger=logger)
 def redeploy_all_daemons(event, context, daemon_service=None):
+    request = RedeployAllDaemonsRequest.validate_event(event)
+
     if daemon_service is None:
         daemon_service = DaemonService()
-    response = daemon_service.redeploy_all_daemons()
+    response = daemon_service.redeploy_all_daemons(
+        request, context.get_remaining_time_in_millis if context is not None else None
+    )
 
     return generate_lambda_response(
         StatusCode.OK, {"status": "success", "data": response, "error": {}}, cors_enabled=True
@@ -11,6 +11,7 @@ from deployer.application.schemas.deployments_schemas import (
 )
 from deployer.application.services.authorization_service import AuthorizationService
 from deployer.application.services.deployments_service import DeploymentsService
+from deployer.constant import OrganizationRegistryEventNames
 
 
 logger = get_logger(__name__)
@@ -80,17 +81,21 @@ def get_public_key(event, context, deployments_service=None):
     )
 
 
-def registry_event_consumer(event, context, deployments_service=None):
+def registry_event_consumer(event, context, deployments_service=None, auth_service=None):
     logger.debug(f"Received events from queue: {event}")
     events = RegistryEventConsumerRequest.get_events_from_queue(event)
 
     if deployments_service is None:
         deployments_service = DeploymentsService()
+    if auth_service is None:
+        auth_service = AuthorizationService()
 
     logger.debug(f"Events: {events}")
     for e in events:
         request = RegistryEventConsumerRequest.validate_event(e["blockchain_event"])
         if request.event_name in ["ServiceCreated", "ServiceMetadataModified", "ServiceDeleted"]:
             deployments_service.process_registry_event(request)
+        elif request.event_name in OrganizationRegistryEventNames:
+            auth_service.invalidate_org_access(request.org_id)
 
     return {}
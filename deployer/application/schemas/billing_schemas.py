@@ -9,7 +9,7 @@ from common.validation_handler import validation_handler
 from deployer.application.schemas.queue_schema import QueueEventRequest
 from deployer.config import REQUEST_MAX_LIMIT
 from deployer.constant import PeriodType, OrderType, TypeOfMovementOfFunds, IncomeStatus
-from deployer.exceptions import WrongIncomeStatusForTypeException
+from deployer.exceptions import PageForAllTypeException, WrongIncomeStatusForTypeException
 
 
 class CreateOrderRequest(BaseModel):
@@ -44,6 +44,8 @@ class GetBalanceHistoryRequest(BaseModel):
     type_of_movement: Optional[TypeOfMovementOfFunds] = Field(
         alias="type", default=TypeOfMovementOfFunds.ALL
     )
+    # position in the merged history for the 'all' type, which is paginated only by the cursor
+    cursor: Optional[str] = Field(default=None)
 
     @classmethod
     @validation_handler([RequestPayloadType.QUERY_STRING])
@@ -59,6 +61,9 @@ class GetBalanceHistoryRequest(BaseModel):
         ):
             raise WrongIncomeStatusForTypeException()
 
+        if self.type_of_movement == TypeOfMovementOfFunds.ALL and self.page != 1:
+            raise PageForAllTypeException()
+
         return self
 
 
@@ -66,3 +66,23 @@ class UpdateDaemonStatusRequest(BaseModel, QueueEventRequest):
     @validation_handler()
     def validate_event(cls, event: dict) -> "UpdateDaemonStatusRequest":
         return cls.model_validate(event)
+
+
+class RedeployAllDaemonsRequest(BaseModel):
+    # id of an interrupted redeploy run to resume, a new run is started when it is missing
+    run_id: Optional[str] = Field(alias="runId", default=None)
+
+    @classmethod
+    @validation_handler()
+    def validate_event(cls, event: dict) -> "RedeployAllDaemonsRequest":
+        return cls.model_validate(event or {})
+
+
+class RedeployDaemonRequest(BaseModel, QueueEventRequest):
+    run_id: str = Field(alias="runId")
+    daemon_id: str = Field(alias="daemonId")
+
+    @classmethod
+    @validation_handler()
+    def validate_event(cls, event: dict) -> "RedeployDaemonRequest":
+        return cls.model_validate(event)
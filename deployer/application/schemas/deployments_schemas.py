@@ -3,9 +3,9 @@ import json
 from typing import Optional, List
 
 from pydantic import BaseModel, Field, field_validator, model_validator
-from web3 import Web3
 
 from common.constant import RequestPayloadType
+from common.lazy_import import lazy_import
 from common.validation_handler import validation_handler
 from deployer.application.schemas.queue_schema import QueueEventRequest
 from deployer.config import REQUEST_MAX_LIMIT
@@ -17,6 +17,8 @@ from deployer.exceptions import (
     MissingServiceEventParameters,
 )
 
+web3 = lazy_import("web3")
+
 
 class InitiateDeploymentRequest(BaseModel):
     org_id: str = Field(alias="orgId")
@@ -96,7 +98,7 @@ class RegistryEventConsumerRequest(BaseModel, QueueEventRequest):
         for key, value in data.items():
             new_value = value
             if key != "name":
-                new_value = Web3.to_text(value).rstrip("\x00")
+                new_value = web3.Web3.to_text(value).rstrip("\x00")
             converted_data[key] = new_value
         return converted_data
 
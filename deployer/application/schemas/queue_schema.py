@@ -1,4 +1,5 @@
 import json
+from typing import List, Optional, Tuple
 
 
 class QueueEventRequest:
@@ -15,3 +16,21 @@ class QueueEventRequest:
                     if message:
                         converted_events.append(json.loads(message))
         return converted_events
+
+    @classmethod
+    def get_messages_from_queue(cls, event: dict) -> List[Tuple[str, Optional[str]]]:
+        """
+        SQS message id and raw body of every record. Bodies are parsed one by one with
+        parse_queue_message, so a malformed record fails alone.
+        """
+        return [(record["messageId"], record.get("body")) for record in event.get("Records", [])]
+
+    @staticmethod
+    def parse_queue_message(body: Optional[str]) -> Optional[dict]:
+        """The event published to SNS and wrapped into the SQS body, None for an empty message"""
+        if not body:
+            return None
+        message = json.loads(body).get("Message")
+        if not message:
+            return None
+        return json.loads(message)
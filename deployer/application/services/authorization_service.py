@@ -1,18 +1,31 @@
+from datetime import datetime, UTC
 from typing import Optional
 
+from common.cache import TTLCache
 from common.exceptions import ForbiddenException
 from common.request_context import RequestContext
+from deployer.config import AUTHORIZATION_CACHE_TTL_IN_SECONDS, AUTHORIZATION_CACHE_MAX_SIZE
 from deployer.infrastructure.clients.registry_client import RegistryClient
 from deployer.infrastructure.db import session_scope, DefaultSessionFactory
 from deployer.infrastructure.repositories.daemon_repository import DaemonRepository
 from deployer.infrastructure.repositories.hosted_service_repository import HostedServiceRepository
+from deployer.infrastructure.repositories.org_access_invalidation_repository import (
+    OrgAccessInvalidationRepository,
+)
 from deployer.infrastructure.repositories.order_repository import OrderRepository
 
 
+# Only granted access is cached, so a denial is always re-checked against the source of truth.
+# Ownership of daemons, orders and hosted services never changes, while org membership entries
+# are additionally checked against the invalidation marks written by the registry event consumer.
+access_cache = TTLCache(AUTHORIZATION_CACHE_TTL_IN_SECONDS, AUTHORIZATION_CACHE_MAX_SIZE)
+
+
 class AuthorizationService:
-    def __init__(self, session_factory=None, registry_client=None):
+    def __init__(self, session_factory=None, registry_client=None, cache=None):
         self.session_factory = DefaultSessionFactory if session_factory is None else session_factory
         self._registry_client = RegistryClient() if registry_client is None else registry_client
+        self._cache = access_cache if cache is None else cache
 
     def check_local_access(
         self,
@@ -29,6 +42,16 @@ class AuthorizationService:
                 "Exactly one of daemon_id, order_id or hosted_service_id must be provided"
             )
 
+        if daemon_id is not None:
+            cache_key = ("daemon", account_id, daemon_id)
+        elif order_id is not None:
+            cache_key = ("order", account_id, order_id)
+        else:
+            cache_key = ("hosted_service", account_id, hosted_service_id)
+
+        if self._cache.get(cache_key) is not None:
+            return
+
         with session_scope(self.session_factory) as session:
             if daemon_id is not None:
                 entity = DaemonRepository.get_daemon_by_account_and_daemon(
@@ -46,17 +69,39 @@ class AuthorizationService:
         if entity is None:
             raise ForbiddenException()
 
+        self._cache.set(cache_key, True)
+
     def check_service_access(self, request_context: RequestContext, org_id: str):
+        account_id = request_context.account_id
+        cached_at = self._cache.get(("org", account_id, org_id))
+
+        if cached_at is not None:
+            with session_scope(self.session_factory) as session:
+                invalidated_at = OrgAccessInvalidationRepository.get_org_access_invalidated_at(
+                    session, org_id
+                )
+            if invalidated_at is None or invalidated_at < cached_at:
+                return
+
+        checked_at = datetime.now(UTC).replace(tzinfo=None)
         orgs = self._registry_client.get_all_orgs(
-            request_context.username, request_context.account_id, request_context.origin
+            request_context.username, account_id, request_context.origin
         )
 
         is_accessed = False
 
         for org in orgs:
+            self._cache.set(("org", account_id, org["org_id"]), checked_at)
             if org["org_id"] == org_id:
                 is_accessed = True
-                break
 
         if not is_accessed:
             raise ForbiddenException()
+
+    def invalidate_org_access(self, org_id: str):
+        with session_scope(self.session_factory) as session:
+            OrgAccessInvalidationRepository.upsert_org_access_invalidation(
+                session, org_id, datetime.now(UTC).replace(tzinfo=None)
+            )
+
+        self._cache.invalidate_where(lambda key: key[0] == "org" and key[2] == org_id)
@@ -1,10 +1,13 @@
 import os
-from typing import Tuple, List
+from datetime import datetime, timedelta, UTC
+from collections import defaultdict
+from typing import Tuple, List, Union, Dict, Set
 
 from eth_typing import HexStr
-from web3 import Web3
 
 from common.blockchain_util import BlockChainUtil
+from common.cache import TTLCache
+from common.lazy_import import lazy_import
 from common.logger import get_logger
 from common.utils import generate_uuid
 from deployer.application.schemas.billing_schemas import (
@@ -21,11 +24,23 @@ from deployer.config import (
     TOKEN_JSON_FILE_NAME,
     TOKEN_NAME,
     TOKEN_DECIMALS,
+    HOSTED_SERVICE_ACCOUNT_CACHE_TTL_IN_SECONDS,
+    HOSTED_SERVICE_ACCOUNT_CACHE_MAX_SIZE,
+    TOKEN_RATE_UPDATE_INTERVAL_IN_MINUTES,
+    TOKEN_RATE_CACHE_MIN_TTL_IN_SECONDS,
+    PROCESSED_CALL_EVENT_RETENTION_IN_DAYS,
+    PROCESSED_CALL_EVENT_DELETE_BATCH_SIZE,
+)
+from deployer.constant import TypeOfMovementOfFunds, OrderType, IncomeStatus, PeriodType
+from deployer.domain.factory.call_event_rollup_factory import (
+    CallEventRollupFactory,
+    to_naive_utc,
 )
-from deployer.constant import TypeOfMovementOfFunds, OrderType, IncomeStatus
 from deployer.domain.models.account_balance import NewAccountBalanceDomain
+from deployer.domain.models.balance_history_cursor import BalanceHistoryCursor
 from deployer.domain.models.evm_transaction import NewEVMTransactionDomain
-from deployer.domain.models.order import NewOrderDomain
+from deployer.domain.models.order import NewOrderDomain, OrderDomain
+from deployer.domain.schemas.haas_responses import CallEventResponse
 from deployer.domain.models.token_rate import NewTokenRateDomain
 from deployer.domain.models.transactions_metadata import TransactionsMetadataDomain
 from deployer.exceptions import (
@@ -38,22 +53,43 @@ from deployer.infrastructure.clients.haas_client import HaaSClient
 from deployer.infrastructure.db import DefaultSessionFactory, session_scope
 from deployer.infrastructure.models import OrderStatus, EVMTransactionStatus
 from deployer.infrastructure.repositories.account_balance_repository import AccountBalanceRepository
+from deployer.infrastructure.repositories.call_event_rollup_repository import (
+    CallEventRollupRepository,
+)
 from deployer.infrastructure.repositories.daemon_repository import DaemonRepository
 from deployer.infrastructure.repositories.order_repository import OrderRepository
 from deployer.infrastructure.repositories.token_rate_repository import TokenRateRepository
 from deployer.infrastructure.repositories.transaction_repository import TransactionRepository
 
 
+web3 = lazy_import("web3")
+
 logger = get_logger(__name__)
 
+# (org_id, service_id) -> account_id of the hosted service owner, it never changes for a daemon
+hosted_service_account_cache = TTLCache(
+    HOSTED_SERVICE_ACCOUNT_CACHE_TTL_IN_SECONDS, HOSTED_SERVICE_ACCOUNT_CACHE_MAX_SIZE
+)
+# token symbol -> average cogs per usd, every entry expires with its own TTL
+average_cogs_per_usd_cache = TTLCache(TOKEN_RATE_UPDATE_INTERVAL_IN_MINUTES * 60)
+
 
 class BillingService:
-    def __init__(self, session_factory=None, haas_client=None, crypto_exchange_client=None):
+    def __init__(
+        self,
+        session_factory=None,
+        haas_client=None,
+        crypto_exchange_client=None,
+        token_rate_cache=None,
+    ):
         self.session_factory = DefaultSessionFactory if session_factory is None else session_factory
         self._haas_client = HaaSClient() if haas_client is None else haas_client
         self._crypto_exchange_client = (
             CryptoExchangeClient() if crypto_exchange_client is None else crypto_exchange_client
         )
+        self._token_rate_cache = (
+            average_cogs_per_usd_cache if token_rate_cache is None else token_rate_cache
+        )
 
     def create_order(self, request: CreateOrderRequest, account_id: str) -> dict:
         with session_scope(self.session_factory) as session:
@@ -148,17 +184,46 @@ class BillingService:
             if account_balance is not None:
                 balance = int(account_balance.balance_in_cogs)
 
+            average_cogs_per_usd = self._get_average_cogs_per_usd(session)
+
+        return {"balanceInCogs": balance, "cogsPerUsd": average_cogs_per_usd}
+
+    def _get_average_cogs_per_usd(self, session) -> int:
+        average_cogs_per_usd = self._token_rate_cache.get(TOKEN_NAME)
+        if average_cogs_per_usd is not None:
+            return average_cogs_per_usd
+
+        current_token_rate = TokenRateRepository.get_current_token_rate(session, TOKEN_NAME)
+        if current_token_rate is not None:
+            average_cogs_per_usd = current_token_rate.cogs_per_usd
+            # the rate is cached until the next scheduled update of the current rate
+            next_update_at = current_token_rate.updated_at + timedelta(
+                minutes=TOKEN_RATE_UPDATE_INTERVAL_IN_MINUTES
+            )
+            ttl = (next_update_at - datetime.now(UTC).replace(tzinfo=None)).total_seconds()
+        else:
+            # the current rate is not calculated yet, e.g. right after the deployment
             average_cogs_per_usd = TokenRateRepository.get_average_cogs_per_usd(session, TOKEN_NAME)
             if average_cogs_per_usd is None:
                 raise TokenRateUnavailableException()
+            ttl = TOKEN_RATE_CACHE_MIN_TTL_IN_SECONDS
 
-        return {"balanceInCogs": balance, "cogsPerUsd": average_cogs_per_usd}
+        self._token_rate_cache.set(
+            TOKEN_NAME, average_cogs_per_usd, max(ttl, TOKEN_RATE_CACHE_MIN_TTL_IN_SECONDS)
+        )
+
+        return average_cogs_per_usd
 
     def get_balance_history(self, request: GetBalanceHistoryRequest, account_id: str) -> dict:
+        status_filter = self._get_income_status_filter(request.income_status)
+
+        if request.type_of_movement == TypeOfMovementOfFunds.ALL:
+            return self._get_merged_balance_history(request, account_id, status_filter)
+
         balance_events = []
         total_count = 0
 
-        if request.type_of_movement != TypeOfMovementOfFunds.INCOME:
+        if request.type_of_movement == TypeOfMovementOfFunds.EXPENSE:
             with session_scope(self.session_factory) as session:
                 daemons = DaemonRepository.get_user_daemons(session, account_id)
             response = self._haas_client.get_call_events(
@@ -168,26 +233,12 @@ class BillingService:
                 period=request.period,
                 services=[(daemon.org_id, daemon.service_id) for daemon in daemons],
             )
-            for call_event in response.events:
-                balance_events.append(
-                    {
-                        "type": TypeOfMovementOfFunds.EXPENSE.value,
-                        "eventName": "Service Call",
-                        "amount": call_event.amount,
-                        "timestamp": call_event.timestamp.isoformat(),
-                    }
-                )
-            total_count += response.total_count
-
-        status_filter = request.income_status.value
-        if status_filter == IncomeStatus.ALL.value:
-            status_filter = None
-        elif status_filter == IncomeStatus.PENDING.value:
-            status_filter = OrderStatus.PROCESSING.value
-        elif status_filter == IncomeStatus.FAILED.value:
-            status_filter = [OrderStatus.FAILED, OrderStatus.CANCELLED, OrderStatus.EXPIRED]
+            balance_events = [
+                self._expense_to_balance_event(call_event) for call_event in response.events
+            ]
+            total_count = response.total_count
 
-        if request.type_of_movement != TypeOfMovementOfFunds.EXPENSE:
+        if request.type_of_movement == TypeOfMovementOfFunds.INCOME:
             with session_scope(self.session_factory) as session:
                 top_up_events = OrderRepository.get_orders(
                     session,
@@ -198,30 +249,157 @@ class BillingService:
                     request.period,
                     status_filter,
                 )
-                top_up_events_total_count = OrderRepository.get_orders_total_count(
+                total_count = OrderRepository.get_orders_total_count(
                     session, account_id, request.period, status_filter
                 )
-            for top_up_event in top_up_events:
-                balance_events.append(
-                    {
-                        "type": TypeOfMovementOfFunds.INCOME.value,
-                        "eventName": "Top Up",
-                        "amount": int(top_up_event.amount),
-                        "timestamp": top_up_event.updated_at.isoformat(),
-                        "evmTransactions": top_up_event.to_response(False)["evmTransactions"],
-                    }
-                )
-            total_count += top_up_events_total_count
+            balance_events = [
+                self._income_to_balance_event(top_up_event) for top_up_event in top_up_events
+            ]
 
-        if request.type_of_movement == TypeOfMovementOfFunds.ALL:
-            balance_events.sort(
-                key=lambda x: x["timestamp"], reverse=(request.order == OrderType.DESC)
+        return {"events": balance_events, "totalCount": total_count}
+
+    def _get_merged_balance_history(
+        self,
+        request: GetBalanceHistoryRequest,
+        account_id: str,
+        status_filter: Union[OrderStatus, List[OrderStatus], None],
+    ) -> dict:
+        """
+        Returns one page of the expense and income events merged by timestamp. Each source is asked
+        for at most one page worth of events after the position stored in the cursor, and the
+        cursor of the next page records how many events of each source were consumed.
+        """
+        cursor = BalanceHistoryCursor.decode(request.cursor)
+
+        with session_scope(self.session_factory) as session:
+            daemons = DaemonRepository.get_user_daemons(session, account_id)
+            top_up_events = OrderRepository.get_orders_after(
+                session,
+                account_id,
+                request.limit,
+                request.order,
+                request.period,
+                status_filter,
+                after_updated_at=cursor.income_updated_at,
+                after_id=cursor.income_id,
+            )
+            income_total_count = OrderRepository.get_orders_total_count(
+                session, account_id, request.period, status_filter
+            )
+
+        call_events, expense_total_count = self._get_call_events_from_offset(
+            services=[(daemon.org_id, daemon.service_id) for daemon in daemons],
+            offset=cursor.expense_offset,
+            limit=request.limit,
+            order=request.order,
+            period=request.period,
+        )
+
+        reverse = request.order == OrderType.DESC
+        balance_events = []
+        expense_index, income_index = 0, 0
+        while len(balance_events) < request.limit:
+            has_expense = expense_index < len(call_events)
+            has_income = income_index < len(top_up_events)
+            if not has_expense and not has_income:
+                break
+
+            take_expense = has_expense
+            if has_expense and has_income:
+                expense_timestamp = to_naive_utc(call_events[expense_index].timestamp)
+                income_timestamp = top_up_events[income_index].updated_at
+                if reverse:
+                    take_expense = expense_timestamp >= income_timestamp
+                else:
+                    take_expense = expense_timestamp <= income_timestamp
+
+            if take_expense:
+                balance_events.append(self._expense_to_balance_event(call_events[expense_index]))
+                expense_index += 1
+            else:
+                balance_events.append(self._income_to_balance_event(top_up_events[income_index]))
+                income_index += 1
+
+        next_cursor = BalanceHistoryCursor(
+            expense_offset=cursor.expense_offset + expense_index,
+            income_updated_at=cursor.income_updated_at,
+            income_id=cursor.income_id,
+        )
+        if income_index > 0:
+            next_cursor.income_updated_at = top_up_events[income_index - 1].updated_at
+            next_cursor.income_id = top_up_events[income_index - 1].id
+
+        has_more_expenses = next_cursor.expense_offset < expense_total_count
+        has_more_incomes = income_index < len(top_up_events) or len(top_up_events) == request.limit
+
+        return {
+            "events": balance_events,
+            "totalCount": expense_total_count + income_total_count,
+            "nextCursor": next_cursor.encode() if has_more_expenses or has_more_incomes else None,
+        }
+
+    def _get_call_events_from_offset(
+        self,
+        services: List[Tuple[str, str]],
+        offset: int,
+        limit: int,
+        order: OrderType,
+        period: PeriodType,
+    ) -> Tuple[List[CallEventResponse], int]:
+        """
+        HaaS paginates call events by pages only, so the events starting from an arbitrary offset
+        are taken from at most two adjacent pages of the requested size.
+        """
+        page = offset // limit + 1
+        skip = offset % limit
+
+        response = self._haas_client.get_call_events(
+            limit=limit, page=page, order=order, period=period, services=services
+        )
+        call_events = response.events[skip : skip + limit]
+
+        if (
+            skip
+            and len(response.events) == limit
+            and offset + len(call_events) < response.total_count
+        ):
+            next_response = self._haas_client.get_call_events(
+                limit=limit, page=page + 1, order=order, period=period, services=services
             )
+            call_events += next_response.events[: limit - len(call_events)]
 
-            if len(balance_events) > request.limit:
-                balance_events = balance_events[: request.limit]
+        return call_events, response.total_count
 
-        return {"events": balance_events, "totalCount": total_count}
+    @staticmethod
+    def _get_income_status_filter(
+        income_status: IncomeStatus,
+    ) -> Union[OrderStatus, List[OrderStatus], None]:
+        if income_status == IncomeStatus.PENDING:
+            return OrderStatus.PROCESSING
+        elif income_status == IncomeStatus.SUCCESS:
+            return OrderStatus.SUCCESS
+        elif income_status == IncomeStatus.FAILED:
+            return [OrderStatus.FAILED, OrderStatus.CANCELLED, OrderStatus.EXPIRED]
+        return None
+
+    @staticmethod
+    def _expense_to_balance_event(call_event: CallEventResponse) -> dict:
+        return {
+            "type": TypeOfMovementOfFunds.EXPENSE.value,
+            "eventName": "Service Call",
+            "amount": call_event.amount,
+            "timestamp": call_event.timestamp.isoformat(),
+        }
+
+    @staticmethod
+    def _income_to_balance_event(top_up_event: OrderDomain) -> dict:
+        return {
+            "type": TypeOfMovementOfFunds.INCOME.value,
+            "eventName": "Top Up",
+            "amount": int(top_up_event.amount),
+            "timestamp": top_up_event.updated_at.isoformat(),
+            "evmTransactions": top_up_event.to_response(False)["evmTransactions"],
+        }
 
     def update_transaction_status(self):
         with session_scope(self.session_factory) as session:
@@ -279,7 +457,7 @@ class BillingService:
             OrderRepository.fail_old_orders(session)
             OrderRepository.expire_old_orders(session)
 
-    def process_call_event(self, request: CallEventConsumerRequest):
+    def process_call_event(self, message_id: str, request: CallEventConsumerRequest):
         with session_scope(self.session_factory) as session:
             daemon = DaemonRepository.search_daemon(session, request.org_id, request.service_id)
 
@@ -288,10 +466,142 @@ class BillingService:
                     org_id=request.org_id, service_id=request.service_id
                 )
 
+            self._apply_call_events(
+                session,
+                {message_id: request},
+                {(request.org_id, request.service_id): daemon.account_id},
+            )
+
+    def process_call_events(self, requests: Dict[str, CallEventConsumerRequest]) -> List[str]:
+        """
+        Applies a batch of call events keyed by queue message id with one balance decrement per
+        account. Returns message ids of the events that could not be processed. Redelivered
+        messages that were already applied are skipped.
+        """
+        account_ids = self._get_hosted_service_account_ids(
+            {(request.org_id, request.service_id) for request in requests.values()}
+        )
+
+        failed_message_ids = []
+        resolved_requests = {}
+        for message_id, request in requests.items():
+            if (request.org_id, request.service_id) in account_ids:
+                resolved_requests[message_id] = request
+            else:
+                logger.error(
+                    HostedServiceNotFoundException(
+                        org_id=request.org_id, service_id=request.service_id
+                    )
+                )
+                failed_message_ids.append(message_id)
+
+        if not resolved_requests:
+            return failed_message_ids
+
+        try:
+            with session_scope(self.session_factory) as session:
+                self._apply_call_events(session, resolved_requests, account_ids)
+        except Exception:
+            # one broken event must not block the whole batch, so events are retried one by one
+            logger.exception("Failed to process call events batch, processing events one by one")
+            for message_id, request in resolved_requests.items():
+                try:
+                    self.process_call_event(message_id, request)
+                except Exception:
+                    logger.exception(f"Failed to process call event {message_id}")
+                    failed_message_ids.append(message_id)
+
+        self._delete_expired_processed_call_events()
+
+        return failed_message_ids
+
+    def _delete_expired_processed_call_events(self) -> None:
+        # SQS does not redeliver a message after its retention period
+        before = datetime.now(UTC).replace(tzinfo=None) - timedelta(
+            days=PROCESSED_CALL_EVENT_RETENTION_IN_DAYS
+        )
+        try:
+            with session_scope(self.session_factory) as session:
+                CallEventRollupRepository.delete_processed_call_events(
+                    session, before, limit=PROCESSED_CALL_EVENT_DELETE_BATCH_SIZE
+                )
+        except Exception:
+            logger.exception("Failed to delete expired processed call events")
+
+    def _get_hosted_service_account_ids(
+        self, org_service_ids: Set[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], str]:
+        account_ids = {}
+        missing_org_service_ids = []
+        for org_service_id in org_service_ids:
+            account_id = hosted_service_account_cache.get(org_service_id)
+            if account_id is None:
+                missing_org_service_ids.append(org_service_id)
+            else:
+                account_ids[org_service_id] = account_id
+
+        if missing_org_service_ids:
+            with session_scope(self.session_factory) as session:
+                found_account_ids = DaemonRepository.get_hosted_service_account_ids(
+                    session, missing_org_service_ids
+                )
+            for org_service_id, account_id in found_account_ids.items():
+                hosted_service_account_cache.set(org_service_id, account_id)
+            account_ids.update(found_account_ids)
+
+        return account_ids
+
+    @staticmethod
+    def _apply_call_events(
+        session,
+        requests: Dict[str, CallEventConsumerRequest],
+        account_ids: Dict[Tuple[str, str], str],
+    ) -> None:
+        # the balance and the rollups are changed by deltas, so an event must be applied only once
+        processed_message_ids = CallEventRollupRepository.get_processed_call_event_ids(
+            session, requests
+        )
+        if processed_message_ids:
+            logger.info(f"Skipping already processed call events {sorted(processed_message_ids)}")
+        requests = {
+            message_id: request
+            for message_id, request in requests.items()
+            if message_id not in processed_message_ids
+        }
+        if not requests:
+            return
+        CallEventRollupRepository.add_processed_call_events(session, requests)
+
+        amounts_by_account = defaultdict(int)
+        requests_by_service = defaultdict(list)
+        for request in requests.values():
+            org_service_id = (request.org_id, request.service_id)
+            amounts_by_account[account_ids[org_service_id]] += request.amount
+            requests_by_service[org_service_id].append(request)
+
+        # the same order of row locks in all consumers prevents deadlocks between batches
+        for account_id in sorted(amounts_by_account):
             AccountBalanceRepository.decrease_account_balance(
-                session, daemon.account_id, request.amount
+                session, account_id, amounts_by_account[account_id]
             )
 
+        rollups = []
+        for (org_id, service_id), service_requests in requests_by_service.items():
+            rollups.extend(
+                CallEventRollupFactory.call_event_rollups_from_call_events(
+                    org_id, service_id, service_requests
+                )
+            )
+            timestamps = [to_naive_utc(request.timestamp) for request in service_requests]
+            CallEventRollupRepository.upsert_call_event_rollup_state(
+                session,
+                org_id,
+                service_id,
+                first_event_at=min(timestamps),
+                last_event_at=max(timestamps),
+            )
+        CallEventRollupRepository.upsert_call_event_rollups(session, rollups)
+
     def update_token_rate(self) -> None:
         token_symbol = TOKEN_NAME.lower()
         token_rate = self._crypto_exchange_client.get_token_rate(token_symbol)
@@ -306,6 +616,11 @@ class BillingService:
                 ),
             )
             TokenRateRepository.delete_old_token_rates(session)
+            TokenRateRepository.upsert_current_token_rate(
+                session,
+                token_symbol,
+                TokenRateRepository.get_average_cogs_per_usd(session, token_symbol),
+            )
 
     @staticmethod
     def _get_transactions_from_blockchain(
@@ -370,7 +685,7 @@ class BillingService:
         return contract_instance
 
     @staticmethod
-    def _get_order_id_from_transaction(tx_hash: HexStr, w3: Web3) -> str:
+    def _get_order_id_from_transaction(tx_hash: HexStr, w3: "web3.Web3") -> str:
         try:
             transaction = w3.eth.get_transaction(tx_hash)
             input_data = transaction["input"]
@@ -1,13 +1,24 @@
-from typing import List, Tuple
+import time
+from typing import List, Iterator, Optional, Callable
 
 from common.boto_utils import BotoUtils
 from common.logger import get_logger
+from common.utils import generate_uuid
 from deployer.application.schemas.daemon_schemas import (
     DaemonRequest,
     UpdateConfigRequest,
     UpdateDaemonStatusRequest,
+    RedeployAllDaemonsRequest,
+    RedeployDaemonRequest,
 )
-from deployer.config import REGION_NAME
+from deployer.application.services.file_export_service import FileExportService
+from deployer.config import (
+    REGION_NAME,
+    REDEPLOY_DAEMONS_PAGE_SIZE,
+    REDEPLOY_DAEMONS_MAX_MESSAGES_PER_SECOND,
+    REDEPLOY_DAEMONS_TIME_RESERVE_IN_MILLISECONDS,
+)
+from deployer.domain.models.file_export import FileExportDomain
 from deployer.exceptions import (
     DaemonNotFoundException,
     UpdateConfigNotAvailableException,
@@ -17,7 +28,10 @@ from deployer.exceptions import (
 from deployer.infrastructure.clients.deployer_client import DeployerClient
 from deployer.infrastructure.clients.haas_client import HaaSClient
 from deployer.infrastructure.db import DefaultSessionFactory, session_scope
-from deployer.infrastructure.models import DaemonStatus
+from deployer.infrastructure.models import DaemonStatus, DaemonRedeployStatus
+from deployer.infrastructure.repositories.daemon_redeploy_repository import (
+    DaemonRedeployRepository,
+)
 from deployer.infrastructure.repositories.daemon_repository import DaemonRepository
 
 
@@ -26,12 +40,22 @@ logger = get_logger(__name__)
 
 class DaemonService:
     def __init__(
-        self, session_factory=None, deployer_client=None, haas_client=None, boto_utils=None
+        self,
+        session_factory=None,
+        deployer_client=None,
+        haas_client=None,
+        boto_utils=None,
+        file_export_service=None,
     ):
         self.session_factory = DefaultSessionFactory if session_factory is None else session_factory
         self._deployer_client = DeployerClient() if deployer_client is None else deployer_client
         self._haas_client = HaaSClient() if haas_client is None else haas_client
         self._boto_utils = BotoUtils(REGION_NAME) if boto_utils is None else boto_utils
+        self._file_export_service = (
+            FileExportService(self._boto_utils)
+            if file_export_service is None
+            else file_export_service
+        )
 
     def get_daemon(self, request: DaemonRequest) -> dict:
         with session_scope(self.session_factory) as session:
@@ -57,17 +81,107 @@ class DaemonService:
 
         return daemon_logs
 
-    def download_daemon_logs(self, request: DaemonRequest) -> Tuple[str, str]:
+    def download_daemon_logs(self, request: DaemonRequest) -> FileExportDomain:
         daemon_logs = self.get_daemon_logs(request)
 
-        return "\n".join(daemon_logs), f"daemon_{request.daemon_id}_logs.txt"
+        return self._file_export_service.export_text_file(
+            self._generate_log_lines(daemon_logs),
+            f"daemon_{request.daemon_id}_logs.txt",
+            "text/plain; charset=utf-8",
+        )
+
+    @staticmethod
+    def _generate_log_lines(logs: List[str]) -> Iterator[str]:
+        for i, line in enumerate(logs):
+            yield line if i == 0 else f"\n{line}"
+
+    def redeploy_all_daemons(
+        self,
+        request: RedeployAllDaemonsRequest,
+        get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
+    ) -> dict:
+        run_id = request.run_id
+        if run_id is None:
+            run_id = generate_uuid()
+            with session_scope(self.session_factory) as session:
+                daemon_ids = DaemonRepository.get_all_daemon_ids(session, status=DaemonStatus.UP)
+                DaemonRedeployRepository.create_redeploy_tasks(session, run_id, daemon_ids)
+            logger.info(f"Started redeploy run {run_id} for {len(daemon_ids)} daemons")
+        else:
+            logger.info(f"Resuming redeploy run {run_id}")
+
+        last_daemon_id = None
+        next_page_allowed_at = time.monotonic()
+        while True:
+            if (
+                get_remaining_time_in_millis is not None
+                and get_remaining_time_in_millis() < REDEPLOY_DAEMONS_TIME_RESERVE_IN_MILLISECONDS
+            ):
+                logger.info(f"Redeploy run {run_id} is interrupted, it can be resumed later")
+                break
+
+            with session_scope(self.session_factory) as session:
+                daemon_ids = DaemonRedeployRepository.get_redeploy_daemon_ids(
+                    session,
+                    run_id,
+                    statuses=[DaemonRedeployStatus.PENDING, DaemonRedeployStatus.FAILED],
+                    after_daemon_id=last_daemon_id,
+                    limit=REDEPLOY_DAEMONS_PAGE_SIZE,
+                )
+            if not daemon_ids:
+                break
+            last_daemon_id = daemon_ids[-1]
+
+            # keeps the redeploy rate within the limit, so HaaS and Lambda are not throttled
+            sleep_time = next_page_allowed_at - time.monotonic()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            next_page_allowed_at = (
+                time.monotonic() + len(daemon_ids) / REDEPLOY_DAEMONS_MAX_MESSAGES_PER_SECOND
+            )
+
+            failed_daemon_ids = set(
+                self._deployer_client.enqueue_daemon_redeploys(run_id, daemon_ids)
+            )
+            with session_scope(self.session_factory) as session:
+                DaemonRedeployRepository.update_redeploy_status(
+                    session,
+                    run_id,
+                    [daemon_id for daemon_id in daemon_ids if daemon_id not in failed_daemon_ids],
+                    DaemonRedeployStatus.ENQUEUED,
+                    from_statuses=[DaemonRedeployStatus.PENDING, DaemonRedeployStatus.FAILED],
+                )
+
+        with session_scope(self.session_factory) as session:
+            progress = DaemonRedeployRepository.get_redeploy_progress(session, run_id)
+
+        return {
+            "runId": run_id,
+            "progress": {status.value: progress.get(status, 0) for status in DaemonRedeployStatus},
+        }
 
-    def redeploy_all_daemons(self) -> dict:
+    def redeploy_daemon(self, request: RedeployDaemonRequest) -> None:
         with session_scope(self.session_factory) as session:
-            daemon_ids = DaemonRepository.get_all_daemon_ids(session, status=DaemonStatus.UP)
-            for daemon_id in daemon_ids:
-                self._deployer_client.deploy_daemon(daemon_id, asynchronous=True)
-        return {}
+            status = DaemonRedeployRepository.get_redeploy_status(
+                session, request.run_id, request.daemon_id
+            )
+        if status == DaemonRedeployStatus.DONE:
+            logger.info(f"Daemon {request.daemon_id} is already redeployed in run {request.run_id}")
+            return
+
+        try:
+            self._deploy_daemon(request.daemon_id)
+        except Exception:
+            with session_scope(self.session_factory) as session:
+                DaemonRedeployRepository.update_redeploy_status(
+                    session, request.run_id, [request.daemon_id], DaemonRedeployStatus.FAILED
+                )
+            raise
+
+        with session_scope(self.session_factory) as session:
+            DaemonRedeployRepository.update_redeploy_status(
+                session, request.run_id, [request.daemon_id], DaemonRedeployStatus.DONE
+            )
 
     def update_daemon_status(self, request: UpdateDaemonStatusRequest):
         with session_scope(self.session_factory) as session:
@@ -104,8 +218,9 @@ class DaemonService:
         logger.info(f"Status for daemon {daemon.id} updated to {request.status}")
 
     def deploy_daemon(self, request: DaemonRequest):
-        daemon_id = request.daemon_id
+        return self._deploy_daemon(request.daemon_id)
 
+    def _deploy_daemon(self, daemon_id: str) -> dict:
         with session_scope(self.session_factory) as session:
             daemon = DaemonRepository.get_daemon(session, daemon_id)
 
@@ -0,0 +1,53 @@
+from datetime import UTC, datetime
+from itertools import chain
+from typing import Iterable
+
+from common.boto_utils import BotoUtils
+from common.logger import get_logger
+from common.utils import generate_uuid
+from deployer.config import (
+    REGION_NAME,
+    EXPORT_BUCKET,
+    EXPORT_URL_EXPIRATION_IN_SECONDS,
+    EXPORT_INLINE_MAX_SIZE_IN_BYTES,
+)
+from deployer.domain.models.file_export import FileExportDomain
+
+
+logger = get_logger(__name__)
+
+
+class FileExportService:
+    def __init__(self, boto_utils=None, inline_max_size: int = EXPORT_INLINE_MAX_SIZE_IN_BYTES):
+        self._boto_utils = BotoUtils(REGION_NAME) if boto_utils is None else boto_utils
+        self._inline_max_size = inline_max_size
+
+    def export_text_file(
+        self, chunks: Iterable[str], filename: str, content_type: str
+    ) -> FileExportDomain:
+        """
+        Reads text chunks until they exceed the inline size limit. Small files are returned as is,
+        the rest is streamed through gzip into S3 and returned as a presigned url.
+        """
+        chunks = iter(chunks)
+        head = []
+        head_size = 0
+        for chunk in chunks:
+            head.append(chunk)
+            head_size += len(chunk.encode("utf-8"))
+            if head_size > self._inline_max_size:
+                break
+        else:
+            return FileExportDomain(filename=filename, content="".join(head))
+
+        key = f"exports/{datetime.now(UTC).strftime('%Y/%m/%d')}/{generate_uuid()}/{filename}"
+        logger.info(f"Export {filename} exceeds {self._inline_max_size} bytes, uploading to {key}")
+
+        self._boto_utils.s3_upload_gzip_text_stream(
+            chain(head, chunks), EXPORT_BUCKET, key, content_type
+        )
+        url = self._boto_utils.generate_s3_presigned_url(
+            EXPORT_BUCKET, key, EXPORT_URL_EXPIRATION_IN_SECONDS, filename
+        )
+
+        return FileExportDomain(filename=filename, url=url)
@@ -1,24 +1,67 @@
-from typing import Dict, List, Any, Tuple
-
-from pandas import DataFrame, date_range
+from datetime import UTC, datetime
+from typing import Dict, List, Any, Optional, Iterator
 
+from common.cache import TTLCache
+from common.lazy_import import lazy_import
 from deployer.application.schemas.billing_schemas import GetMetricsRequest
-from deployer.config import REQUEST_MAX_LIMIT
-from deployer.constant import OrderType, PeriodType, FREQUENCY_BY_PERIOD
+from deployer.application.services.file_export_service import FileExportService
+from deployer.config import (
+    FIRST_CALL_EVENT_CACHE_MAX_SIZE,
+    FIRST_CALL_EVENT_CACHE_TTL_IN_SECONDS,
+    REQUEST_MAX_LIMIT,
+)
+from deployer.constant import OrderType, PeriodType, FREQUENCY_BY_PERIOD, PERIOD_TYPE_TIMEDELTA
+from deployer.domain.factory.call_event_rollup_factory import to_naive_utc, ceil_to_granularity
+from deployer.domain.models.call_event_rollup import CallEventRollupDomain
+from deployer.domain.models.daemon import DaemonDomain
+from deployer.domain.models.file_export import FileExportDomain
 from deployer.domain.schemas.haas_responses import CallEventResponse
 from deployer.infrastructure.clients.haas_client import HaaSClient
 from deployer.infrastructure.db import DefaultSessionFactory, session_scope
+from deployer.infrastructure.models import CallEventRollupGranularity
+from deployer.infrastructure.repositories.call_event_rollup_repository import (
+    CallEventRollupRepository,
+)
 from deployer.infrastructure.repositories.daemon_repository import DaemonRepository
 
+# Only the metrics handlers use pandas, the other billing handlers import this module too
+pandas = lazy_import("pandas")
+
+# (org_id, service_id) -> timestamp of the oldest call event, it never changes once there is one
+first_call_event_cache = TTLCache(
+    FIRST_CALL_EVENT_CACHE_TTL_IN_SECONDS, FIRST_CALL_EVENT_CACHE_MAX_SIZE
+)
+
+# Rollup granularity that is fine enough for the grouping frequency of the period.
+# The hour period is grouped by minutes, so it is always calculated from the raw call events.
+ROLLUP_GRANULARITY_BY_PERIOD = {
+    PeriodType.DAY: CallEventRollupGranularity.HOUR,
+    PeriodType.WEEK: CallEventRollupGranularity.HOUR,
+    PeriodType.MONTH: CallEventRollupGranularity.DAY,
+    PeriodType.YEAR: CallEventRollupGranularity.DAY,
+    PeriodType.ALL: CallEventRollupGranularity.DAY,
+}
+
 
 class MetricsService:
-    def __init__(self, session_factory=None, haas_client=None):
+    def __init__(self, session_factory=None, haas_client=None, file_export_service=None):
         self.session_factory = DefaultSessionFactory if session_factory is None else session_factory
         self._haas_client = HaaSClient() if haas_client is None else haas_client
+        self._file_export_service = (
+            FileExportService() if file_export_service is None else file_export_service
+        )
         self.datetime_format = "%Y-%m-%dT%H:%M:%S"
 
     def get_metrics(self, request: GetMetricsRequest) -> dict:
-        events = self._get_all_events(request)
+        daemon = self._get_daemon(request.hosted_service_id)
+
+        granularity = ROLLUP_GRANULARITY_BY_PERIOD.get(request.period)
+        if granularity is not None:
+            metrics = self._get_metrics_from_rollups(daemon, request.period, granularity)
+            if metrics is not None:
+                return metrics
+
+        events = self._get_all_events(daemon, request.period)
 
         if not events:
             return self._get_empty_metrics_response()
@@ -31,48 +74,185 @@ class MetricsService:
 
         return metrics
 
-    def download_metrics(self, request: GetMetricsRequest) -> Tuple[str, str]:
-        file_content = "orgId,serviceId,duration,amount,timestamp"
+    def download_metrics(self, request: GetMetricsRequest) -> FileExportDomain:
         filename = f"hosted_service_{request.hosted_service_id}_metrics.csv"
 
-        events = self._get_all_events(request)
+        daemon = self._get_daemon(request.hosted_service_id)
 
-        for event in events:
-            file_content += f"\n{event.org_id},{event.service_id},{event.duration},{event.amount},{event.timestamp}"
+        return self._file_export_service.export_text_file(
+            self._generate_metrics_csv(daemon, request.period), filename, "text/csv; charset=utf-8"
+        )
 
-        return file_content, filename
+    def _generate_metrics_csv(self, daemon: DaemonDomain, period: PeriodType) -> Iterator[str]:
+        yield "orgId,serviceId,duration,amount,timestamp"
 
-    def _get_all_events(self, request: GetMetricsRequest) -> List[CallEventResponse]:
+        for event in self._iterate_all_events(daemon, period):
+            yield f"\n{event.org_id},{event.service_id},{event.duration},{event.amount},{event.timestamp}"
+
+    def _get_daemon(self, hosted_service_id: str) -> DaemonDomain:
         with session_scope(self.session_factory) as session:
-            daemon = DaemonRepository.get_daemon_by_hosted_service(
-                session, request.hosted_service_id
-            )
+            daemon = DaemonRepository.get_daemon_by_hosted_service(session, hosted_service_id)
 
         # In this case, the daemon and hosted_service will never be None, because otherwise the verification will not pass at the authorization stage earlier
 
+        return daemon
+
+    def _get_metrics_from_rollups(
+        self, daemon: DaemonDomain, period: PeriodType, granularity: CallEventRollupGranularity
+    ) -> Optional[dict]:
+        """
+        Calculates metrics from the pre-aggregated call event rollups and the call events that are
+        newer than the last rolled up one. Only the buckets that lie entirely within the period are
+        read from the rollups, the partial bucket at the start of the period is calculated from the
+        raw call events. Returns None if the rollups don't cover the whole period, in which case
+        the metrics have to be calculated from the raw call events.
+        """
+        period_start = None
+        first_bucket_start = None
+        if period != PeriodType.ALL:
+            period_start = datetime.now(UTC).replace(tzinfo=None) - PERIOD_TYPE_TIMEDELTA[period]
+            first_bucket_start = ceil_to_granularity(period_start, granularity)
+
+        with session_scope(self.session_factory) as session:
+            rollup_state = CallEventRollupRepository.get_call_event_rollup_state(
+                session, daemon.org_id, daemon.service_id
+            )
+
+        if rollup_state is None:
+            return None
+
+        if not rollup_state.is_complete:
+            if self._has_events_before(daemon, rollup_state.tracked_since):
+                if period_start is None or period_start < rollup_state.tracked_since:
+                    return None
+            else:
+                with session_scope(self.session_factory) as session:
+                    CallEventRollupRepository.mark_call_event_rollup_state_complete(
+                        session, daemon.org_id, daemon.service_id
+                    )
+
+        # the state and rollups are read in one transaction to get the consistent watermark
+        with session_scope(self.session_factory) as session:
+            rollup_state = CallEventRollupRepository.get_call_event_rollup_state(
+                session, daemon.org_id, daemon.service_id
+            )
+            rollups = CallEventRollupRepository.get_call_event_rollups(
+                session,
+                daemon.org_id,
+                daemon.service_id,
+                granularity,
+                start=first_bucket_start,
+            )
+
+        edge_events = []
+        if period_start is not None and period_start < first_bucket_start:
+            edge_events = self._get_rolled_up_events_between(
+                daemon, period, period_start, first_bucket_start, rollup_state.last_event_at
+            )
+        tail_events = self._get_events_after(daemon, period, rollup_state.last_event_at)
+
+        if not rollups and not edge_events and not tail_events:
+            return self._get_empty_metrics_response()
+
+        df = self._create_rollups_dataframe(rollups, edge_events + tail_events)
+        grouped_data = self._group_events_by_timeframe(df, period)
+
+        metrics = self._prepare_aggregated_rollup_metrics(grouped_data)
+        metrics["summary"] = self._prepare_rollup_metrics_summary(df)
+
+        return metrics
+
+    def _has_events_before(self, daemon: DaemonDomain, timestamp: datetime) -> bool:
+        first_event_at = first_call_event_cache.get((daemon.org_id, daemon.service_id))
+        if first_event_at is None:
+            response = self._haas_client.get_call_events(
+                services=(daemon.org_id, daemon.service_id),
+                limit=1,
+                page=1,
+                order=OrderType.ASC,
+                period=PeriodType.ALL,
+            )
+            if not response.events:
+                return False
+
+            first_event_at = to_naive_utc(response.events[0].timestamp)
+            first_call_event_cache.set((daemon.org_id, daemon.service_id), first_event_at)
+
+        return first_event_at < timestamp
+
+    def _get_rolled_up_events_between(
+        self,
+        daemon: DaemonDomain,
+        period: PeriodType,
+        start: datetime,
+        end: datetime,
+        watermark: datetime,
+    ) -> List[CallEventResponse]:
+        """
+        Call events in [start, end) that are not newer than the watermark, the newer ones are
+        fetched as the tail events. The oldest events of the period are on the first pages.
+        """
+        events = []
+        for event in self._iterate_all_events(daemon, period):
+            timestamp = to_naive_utc(event.timestamp)
+            if timestamp >= end or timestamp > watermark:
+                break
+            if timestamp >= start:
+                events.append(event)
+        return events
+
+    def _get_events_after(
+        self, daemon: DaemonDomain, period: PeriodType, timestamp: datetime
+    ) -> List[CallEventResponse]:
         events = []
         page = 1
-        response = self._haas_client.get_call_events(
+        while True:
+            response = self._haas_client.get_call_events(
+                services=(daemon.org_id, daemon.service_id),
+                limit=REQUEST_MAX_LIMIT,
+                page=page,
+                order=OrderType.DESC,
+                period=period,
+            )
+            for event in response.events:
+                if to_naive_utc(event.timestamp) <= timestamp:
+                    return events
+                events.append(event)
+
+            if not response.events or page * REQUEST_MAX_LIMIT >= response.total_count:
+                return events
+            page += 1
+
+    def _get_all_events(self, daemon: DaemonDomain, period: PeriodType) -> List[CallEventResponse]:
+        return self._haas_client.get_all_call_events(
             services=(daemon.org_id, daemon.service_id),
-            limit=REQUEST_MAX_LIMIT,
-            page=page,
             order=OrderType.ASC,
-            period=request.period,
+            period=period,
+            page_size=REQUEST_MAX_LIMIT,
         )
-        events.extend(response.events)
 
-        while response.total_count > len(events):
-            page += 1
+    def _iterate_all_events(
+        self, daemon: DaemonDomain, period: PeriodType
+    ) -> Iterator[CallEventResponse]:
+        """
+        Yields the call events page by page, so only one page is kept in memory at a time.
+        """
+        fetched_count = 0
+        page = 1
+        while True:
             response = self._haas_client.get_call_events(
                 services=(daemon.org_id, daemon.service_id),
                 limit=REQUEST_MAX_LIMIT,
                 page=page,
                 order=OrderType.ASC,
-                period=request.period,
+                period=period,
             )
-            events.extend(response.events)
+            yield from response.events
+            fetched_count += len(response.events)
 
-        return events
+            if not response.events or fetched_count >= response.total_count:
+                return
+            page += 1
 
     def _prepare_aggregated_metrics(self, grouped_data: dict):
         df = grouped_data["grouped_df"]
@@ -95,6 +275,32 @@ class MetricsService:
 
         return {"labels": labels.tolist(), "values": aggregated_metrics}
 
+    def _prepare_aggregated_rollup_metrics(self, grouped_data: dict):
+        df = grouped_data["grouped_df"]
+        time_groups = grouped_data["time_groups"]
+
+        grouped_df = df.groupby("time_group")
+        requests_count = grouped_df["calls_count"].sum()
+        costs_sum = grouped_df["amount_sum"].sum()
+        durations_sum = grouped_df["duration_sum"].sum()
+
+        aggregated_metrics = {
+            "requestsCount": requests_count,
+            "costsSum": costs_sum,
+            "costsAvg": costs_sum / requests_count,
+            "durationsSum": durations_sum,
+            "durationsAvg": durations_sum / requests_count,
+        }
+
+        full_series = aggregated_metrics["requestsCount"].reindex(time_groups, fill_value=0)
+        labels = full_series.index.strftime(self.datetime_format)
+
+        for name, data in aggregated_metrics.items():
+            full_series = data.reindex(time_groups, fill_value=0)
+            aggregated_metrics[name] = full_series.values.tolist()
+
+        return {"labels": labels.tolist(), "values": aggregated_metrics}
+
     def _get_empty_metrics_response(self) -> dict:
         return {
             "labels": [],
@@ -112,7 +318,7 @@ class MetricsService:
             },
         }
 
-    def _create_events_dataframe(self, events: List[CallEventResponse]) -> DataFrame:
+    def _create_events_dataframe(self, events: List[CallEventResponse]) -> "pandas.DataFrame":
         events_data = []
         for event in events:
             events_data.append(
@@ -123,14 +329,49 @@ class MetricsService:
                 }
             )
 
-        return DataFrame(events_data)
+        return pandas.DataFrame(events_data)
 
-    def _group_events_by_timeframe(self, df: DataFrame, period: PeriodType) -> Dict[str, Any]:
+    def _create_rollups_dataframe(
+        self, rollups: List[CallEventRollupDomain], events: List[CallEventResponse]
+    ) -> "pandas.DataFrame":
+        rollups_data = []
+        for rollup in rollups:
+            rollups_data.append(
+                {
+                    "timestamp": rollup.bucket_start,
+                    "calls_count": rollup.calls_count,
+                    "amount_sum": rollup.amount_sum,
+                    "amount_min": rollup.amount_min,
+                    "amount_max": rollup.amount_max,
+                    "duration_sum": rollup.duration_sum,
+                    "duration_min": rollup.duration_min,
+                    "duration_max": rollup.duration_max,
+                }
+            )
+        for event in events:
+            rollups_data.append(
+                {
+                    "timestamp": to_naive_utc(event.timestamp),
+                    "calls_count": 1,
+                    "amount_sum": event.amount,
+                    "amount_min": event.amount,
+                    "amount_max": event.amount,
+                    "duration_sum": event.duration,
+                    "duration_min": event.duration,
+                    "duration_max": event.duration,
+                }
+            )
+
+        return pandas.DataFrame(rollups_data)
+
+    def _group_events_by_timeframe(
+        self, df: "pandas.DataFrame", period: PeriodType
+    ) -> Dict[str, Any]:
         df = df.sort_values("timestamp")
         df = df.copy()
         df["time_group"] = df["timestamp"].dt.floor(FREQUENCY_BY_PERIOD[period])
 
-        time_groups = date_range(
+        time_groups = pandas.date_range(
             start=df["time_group"].min(),
             end=df["time_group"].max(),
             freq=FREQUENCY_BY_PERIOD[period],
@@ -138,7 +379,7 @@ class MetricsService:
 
         return {"grouped_df": df, "time_groups": time_groups, "period": period}
 
-    def _prepare_metrics_summary(self, df: DataFrame) -> Dict:
+    def _prepare_metrics_summary(self, df: "pandas.DataFrame") -> Dict:
         cost_stats = df["amount"].describe()
         duration_stats = df["duration"].describe()
 
@@ -157,3 +398,24 @@ class MetricsService:
                 "min": round(float(duration_stats["min"]), 2),
             },
         }
+
+    def _prepare_rollup_metrics_summary(self, df: "pandas.DataFrame") -> Dict:
+        requests_total = int(df["calls_count"].sum())
+        costs_total = int(df["amount_sum"].sum())
+        durations_total = int(df["duration_sum"].sum())
+
+        return {
+            "requests": {"total": requests_total},
+            "costs": {
+                "total": costs_total,
+                "avg": round(costs_total / requests_total, 2),
+                "max": round(float(df["amount_max"].max()), 2),
+                "min": round(float(df["amount_min"].min()), 2),
+            },
+            "durations": {
+                "total": durations_total,
+                "avg": round(durations_total / requests_total, 2),
+                "max": round(float(df["duration_max"].max()), 2),
+                "min": round(float(df["duration_min"].min()), 2),
+            },
+        }
@@ -42,11 +42,43 @@ HAAS_GET_PUBLIC_KEY_PATH = ""
 HAAS_DELETE_HOSTED_SERVICE_PATH = ""
 HAAS_GET_HOSTED_SERVICE_LOGS_PATH = ""
 HAAS_GET_CALL_EVENTS_PATH = ""
+HAAS_MAX_CONCURRENT_REQUESTS = 5
+HAAS_PUBLIC_KEY_CACHE_TTL_IN_SECONDS = 3600
+
+AUTHORIZATION_CACHE_TTL_IN_SECONDS = 300
+AUTHORIZATION_CACHE_MAX_SIZE = 10000
+
+HOSTED_SERVICE_ACCOUNT_CACHE_TTL_IN_SECONDS = 600
+HOSTED_SERVICE_ACCOUNT_CACHE_MAX_SIZE = 10000
+
+FIRST_CALL_EVENT_CACHE_TTL_IN_SECONDS = 24 * 60 * 60
+FIRST_CALL_EVENT_CACHE_MAX_SIZE = 10000
+
+# the maximum retention period of an SQS message
+PROCESSED_CALL_EVENT_RETENTION_IN_DAYS = 14
+PROCESSED_CALL_EVENT_DELETE_BATCH_SIZE = 1000
+
+# must match the schedule of the update-token-rate function in serverless.yml
+TOKEN_RATE_UPDATE_INTERVAL_IN_MINUTES = 30
+# the cached rate is kept at least this long when the next update is overdue
+TOKEN_RATE_CACHE_MIN_TTL_IN_SECONDS = 60
+
+HTTP_CONNECT_TIMEOUT_IN_SECONDS = 3.05
+HTTP_READ_TIMEOUT_IN_SECONDS = 20
+HTTP_MAX_RETRIES = 2
+HTTP_RETRY_BACKOFF_IN_SECONDS = 0.3
+HTTP_POOL_MAX_SIZE = 10
 
 START_DAEMON_ARN = ""
 GET_ALL_ORGS_ARN = ""
 
 DEPLOY_SERVICE_TOPIC_ARN = ""
+REDEPLOY_DAEMON_TOPIC_ARN = ""
+
+REDEPLOY_DAEMONS_PAGE_SIZE = 500
+REDEPLOY_DAEMONS_MAX_MESSAGES_PER_SECOND = 50
+# the fan-out stops and reports progress when less time than this is left for the invocation
+REDEPLOY_DAEMONS_TIME_RESERVE_IN_MILLISECONDS = 10000
 
 DEFAULT_DAEMON_STORAGE_TYPE = DaemonStorageType.ETCD
 
@@ -59,5 +91,10 @@ GITHUB_PRIVATE_KEY = """
 
 REQUEST_MAX_LIMIT = 100
 
+EXPORT_BUCKET = ""
+EXPORT_URL_EXPIRATION_IN_SECONDS = 3600
+# bigger exports are uploaded to S3, because the base64 encoded response must fit into the Lambda response limit
+EXPORT_INLINE_MAX_SIZE_IN_BYTES = 4 * 1024 * 1024
+
 CONTRACT_BASE_PATH = ""
 TOKEN_JSON_FILE_NAME = ""
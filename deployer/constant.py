@@ -16,6 +16,11 @@ class AllowedRegistryEventNames(str, Enum):
     SERVICE_DELETED = "ServiceDeleted"
 
 
+class OrganizationRegistryEventNames(str, Enum):
+    ORGANIZATION_MODIFIED = "OrganizationModified"
+    ORGANIZATION_DELETED = "OrganizationDeleted"
+
+
 class PeriodType(str, Enum):
     HOUR = "hour"
     DAY = "day"
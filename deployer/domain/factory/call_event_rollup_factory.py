@@ -0,0 +1,122 @@
+from datetime import UTC, datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from deployer.domain.models.call_event_rollup import (
+    CallEventRollupDomain,
+    CallEventRollupStateDomain,
+    NewCallEventRollupDomain,
+)
+from deployer.infrastructure.models import (
+    CallEventRollup,
+    CallEventRollupGranularity,
+    CallEventRollupState,
+)
+
+
+class CallEventRollupFactory:
+    @staticmethod
+    def call_event_rollup_from_db_model(
+        call_event_rollup_db_model: CallEventRollup,
+    ) -> CallEventRollupDomain:
+        return CallEventRollupDomain(
+            id=call_event_rollup_db_model.id,
+            org_id=call_event_rollup_db_model.org_id,
+            service_id=call_event_rollup_db_model.service_id,
+            granularity=call_event_rollup_db_model.granularity,
+            bucket_start=call_event_rollup_db_model.bucket_start,
+            calls_count=int(call_event_rollup_db_model.calls_count),
+            amount_sum=int(call_event_rollup_db_model.amount_sum),
+            amount_min=int(call_event_rollup_db_model.amount_min),
+            amount_max=int(call_event_rollup_db_model.amount_max),
+            duration_sum=int(call_event_rollup_db_model.duration_sum),
+            duration_min=int(call_event_rollup_db_model.duration_min),
+            duration_max=int(call_event_rollup_db_model.duration_max),
+            created_at=call_event_rollup_db_model.created_at,
+            updated_at=call_event_rollup_db_model.updated_at,
+        )
+
+    @staticmethod
+    def call_event_rollups_from_db_model(
+        call_event_rollups_db_model: Iterable[CallEventRollup],
+    ) -> List[CallEventRollupDomain]:
+        return [
+            CallEventRollupFactory.call_event_rollup_from_db_model(call_event_rollup_db_model)
+            for call_event_rollup_db_model in call_event_rollups_db_model
+        ]
+
+    @staticmethod
+    def call_event_rollup_state_from_db_model(
+        call_event_rollup_state_db_model: CallEventRollupState,
+    ) -> CallEventRollupStateDomain:
+        return CallEventRollupStateDomain(
+            org_id=call_event_rollup_state_db_model.org_id,
+            service_id=call_event_rollup_state_db_model.service_id,
+            tracked_since=call_event_rollup_state_db_model.tracked_since,
+            last_event_at=call_event_rollup_state_db_model.last_event_at,
+            is_complete=call_event_rollup_state_db_model.is_complete,
+            created_at=call_event_rollup_state_db_model.created_at,
+            updated_at=call_event_rollup_state_db_model.updated_at,
+        )
+
+    @staticmethod
+    def call_event_rollups_from_call_events(
+        org_id: str, service_id: str, call_events: Iterable
+    ) -> List[NewCallEventRollupDomain]:
+        """
+        Aggregates call events (any objects with amount, duration and timestamp fields) of one
+        service into hourly and daily rollups. Buckets are computed in naive UTC, the same way
+        they are stored in the database.
+        """
+        rollups: Dict[Tuple[CallEventRollupGranularity, datetime], NewCallEventRollupDomain] = {}
+
+        for call_event in call_events:
+            timestamp = to_naive_utc(call_event.timestamp)
+            for granularity in CallEventRollupGranularity:
+                bucket_start = floor_to_granularity(timestamp, granularity)
+                rollup = rollups.get((granularity, bucket_start))
+                if rollup is None:
+                    rollups[(granularity, bucket_start)] = NewCallEventRollupDomain(
+                        org_id=org_id,
+                        service_id=service_id,
+                        granularity=granularity,
+                        bucket_start=bucket_start,
+                        calls_count=1,
+                        amount_sum=call_event.amount,
+                        amount_min=call_event.amount,
+                        amount_max=call_event.amount,
+                        duration_sum=call_event.duration,
+                        duration_min=call_event.duration,
+                        duration_max=call_event.duration,
+                    )
+                    continue
+
+                rollup.calls_count += 1
+                rollup.amount_sum += call_event.amount
+                rollup.amount_min = min(rollup.amount_min, call_event.amount)
+                rollup.amount_max = max(rollup.amount_max, call_event.amount)
+                rollup.duration_sum += call_event.duration
+                rollup.duration_min = min(rollup.duration_min, call_event.duration)
+                rollup.duration_max = max(rollup.duration_max, call_event.duration)
+
+        return list(rollups.values())
+
+
+def to_naive_utc(timestamp: datetime) -> datetime:
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(UTC).replace(tzinfo=None)
+
+
+def floor_to_granularity(timestamp: datetime, granularity: CallEventRollupGranularity) -> datetime:
+    if granularity == CallEventRollupGranularity.DAY:
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_to_granularity(timestamp: datetime, granularity: CallEventRollupGranularity) -> datetime:
+    bucket_start = floor_to_granularity(timestamp, granularity)
+    if bucket_start == timestamp:
+        return bucket_start
+    if granularity == CallEventRollupGranularity.DAY:
+        return bucket_start + timedelta(days=1)
+    return bucket_start + timedelta(hours=1)
@@ -0,0 +1,46 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from deployer.exceptions import InvalidBalanceHistoryCursorException
+
+
+@dataclass
+class BalanceHistoryCursor:
+    """
+    Position in the merged stream of expense (HaaS call events) and income (top-up orders) events.
+    HaaS can only be paged by offset, so the expense position is the number of consumed events.
+    Orders are paged by keyset, so the income position is (updated_at, id) of the last consumed one.
+    """
+
+    expense_offset: int = 0
+    income_updated_at: Optional[datetime] = None
+    income_id: Optional[str] = None
+
+    def encode(self) -> str:
+        data = {"e": self.expense_offset}
+        if self.income_updated_at is not None:
+            data["iu"] = self.income_updated_at.isoformat()
+            data["ii"] = self.income_id
+        return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("utf-8")
+
+    @classmethod
+    def decode(cls, cursor: Optional[str]) -> "BalanceHistoryCursor":
+        if not cursor:
+            return cls()
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+            expense_offset = int(data["e"])
+            income_updated_at = datetime.fromisoformat(data["iu"]) if "iu" in data else None
+            income_id = str(data["ii"]) if "ii" in data else None
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise InvalidBalanceHistoryCursorException()
+
+        if expense_offset < 0 or (income_updated_at is None) != (income_id is None):
+            raise InvalidBalanceHistoryCursorException()
+
+        return cls(expense_offset, income_updated_at, income_id)
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from deployer.domain.models.base_domain import BaseDomain
+from deployer.infrastructure.models import CallEventRollupGranularity
+
+
+@dataclass
+class NewCallEventRollupDomain:
+    org_id: str
+    service_id: str
+    granularity: CallEventRollupGranularity
+    bucket_start: datetime
+    calls_count: int
+    amount_sum: int
+    amount_min: int
+    amount_max: int
+    duration_sum: int
+    duration_min: int
+    duration_max: int
+
+
+@dataclass
+class CallEventRollupDomain(NewCallEventRollupDomain, BaseDomain):
+    id: int
+
+
+@dataclass
+class CallEventRollupStateDomain(BaseDomain):
+    org_id: str
+    service_id: str
+    tracked_since: datetime
+    last_event_at: datetime
+    is_complete: bool
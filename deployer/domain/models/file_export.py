@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class FileExportDomain:
+    filename: str
+    content: Optional[str] = None  # set when the file is small enough to be returned inline
+    url: Optional[str] = None  # presigned url of the gzip-compressed file uploaded to S3
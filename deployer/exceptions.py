@@ -84,6 +84,11 @@ class WrongIncomeStatusForTypeException(BadRequestException):
         super().__init__(message="There must be only 'all' status parameter for 'expense' type!")
 
 
+class PageForAllTypeException(BadRequestException):
+    def __init__(self):
+        super().__init__(message="The 'all' type is paginated with the cursor parameter only!")
+
+
 class TokenRateUnavailableException(NotFoundException):
     def __init__(self):
         super().__init__(message="There is no data about token rate for now!")
@@ -97,3 +102,8 @@ class ArchiveError(Exception):
 class LogsAreNotAvailableException(BadRequestException):
     def __init__(self):
         super().__init__(message="Logs are not available! Deployment must have UP status!")
+
+
+class InvalidBalanceHistoryCursorException(BadRequestException):
+    def __init__(self):
+        super().__init__(message="Invalid balance history cursor!")
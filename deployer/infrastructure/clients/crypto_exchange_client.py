@@ -1,4 +1,4 @@
-import requests
+from deployer.infrastructure.clients.http_transport import get_default_transport
 
 
 class CryptoExchangeClientError(Exception):
@@ -7,12 +7,15 @@ class CryptoExchangeClientError(Exception):
 
 
 class CryptoExchangeClient:
+    def __init__(self, transport=None):
+        self._transport = get_default_transport() if transport is None else transport
+
     def get_token_rate(self, token_symbol: str) -> float:
         try:
             url = "https://api.coingecko.com/api/v3/simple/price"
             query_params = {"symbols": token_symbol, "vs_currencies": "usd"}
 
-            response = requests.get(url, params=query_params)
+            response = self._transport.get(url, "coingecko_simple_price", params=query_params)
 
             return float(response.json()[token_symbol]["usd"])
         except Exception as e:
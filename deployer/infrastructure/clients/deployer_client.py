@@ -1,17 +1,24 @@
+from typing import List
+
+from common.boto_utils import BotoUtils
 from common.lambda_client import LambdaClient
 from common.logger import get_logger
 from deployer.config import (
     REGION_NAME,
     START_DAEMON_ARN,
+    REDEPLOY_DAEMON_TOPIC_ARN,
 )
 
 
 logger = get_logger(__name__)
 
+SNS_PUBLISH_BATCH_MAX_SIZE = 10
+
 
 class DeployerClient(LambdaClient):
-    def __init__(self):
+    def __init__(self, boto_utils=None):
         super().__init__(REGION_NAME)
+        self._boto_utils = BotoUtils(REGION_NAME) if boto_utils is None else boto_utils
 
     def deploy_daemon(self, daemon_id: str, asynchronous=False):
         return self._invoke_lambda(
@@ -19,3 +26,21 @@ class DeployerClient(LambdaClient):
             path_parameters={"daemonId": daemon_id},
             asynchronous=asynchronous,
         )
+
+    def enqueue_daemon_redeploys(self, run_id: str, daemon_ids: List[str]) -> List[str]:
+        """Returns ids of the daemons that could not be enqueued."""
+        failed_daemon_ids = []
+
+        for i in range(0, len(daemon_ids), SNS_PUBLISH_BATCH_MAX_SIZE):
+            batch = daemon_ids[i : i + SNS_PUBLISH_BATCH_MAX_SIZE]
+            payloads = [{"runId": run_id, "daemonId": daemon_id} for daemon_id in batch]
+            try:
+                failed_indexes = self._boto_utils.publish_batch_to_sns_topic(
+                    REDEPLOY_DAEMON_TOPIC_ARN, payloads
+                )
+            except Exception as e:
+                logger.exception(f"Failed to enqueue daemon redeploys: {e}")
+                failed_indexes = range(len(batch))
+            failed_daemon_ids.extend(batch[index] for index in failed_indexes)
+
+        return failed_daemon_ids
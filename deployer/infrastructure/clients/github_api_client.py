@@ -1,12 +1,18 @@
 import time
 from typing import Tuple
 
-import requests
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 import jwt
 
+from common.cache import TTLCache
 from deployer.config import GITHUB_PRIVATE_KEY, GITHUB_APP_ID, JWT_EXPIRATION_IN_MINUTES
+from deployer.infrastructure.clients.http_transport import get_default_transport
+
+
+# the token is reused until shortly before its expiration to avoid signing it on every request
+JWT_CACHE_MARGIN_IN_SECONDS = 30
+jwt_cache = TTLCache(max(60 * JWT_EXPIRATION_IN_MINUTES - JWT_CACHE_MARGIN_IN_SECONDS, 0))
 
 
 class GithubAPIClientError(Exception):
@@ -15,6 +21,10 @@ class GithubAPIClientError(Exception):
 
 
 class GithubAPIClient:
+    @staticmethod
+    def __get_jwt() -> str:
+        return jwt_cache.get_or_set(GITHUB_APP_ID, GithubAPIClient.__generate_jwt)
+
     @staticmethod
     def __generate_jwt() -> str:
         private_key = serialization.load_pem_private_key(
@@ -33,12 +43,12 @@ class GithubAPIClient:
     @staticmethod
     def _get_installation(account_name: str, repository_name: str) -> Tuple[int, dict]:
         try:
-            token = GithubAPIClient.__generate_jwt()
+            token = GithubAPIClient.__get_jwt()
 
             url = f"https://api.github.com/repos/{account_name}/{repository_name}/installation"
             headers = {"Authorization": f"Bearer {token}", "Accept": "application/vnd.github+json"}
 
-            response = requests.get(url, headers=headers)
+            response = get_default_transport().get(url, "github_get_installation", headers=headers)
 
             return response.status_code, response.json()
         except Exception as e:
@@ -1,9 +1,11 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List, Union
 
-import requests
 from requests.auth import HTTPBasicAuth
 
 from common.boto_utils import BotoUtils
+from common.cache import TTLCache
 from common.logger import get_logger
 from deployer.config import (
     HAAS_BASE_URL,
@@ -17,14 +19,20 @@ from deployer.config import (
     HAAS_DELETE_HOSTED_SERVICE_PATH,
     HAAS_GET_HOSTED_SERVICE_LOGS_PATH,
     HAAS_GET_CALL_EVENTS_PATH,
+    HAAS_MAX_CONCURRENT_REQUESTS,
+    HAAS_PUBLIC_KEY_CACHE_TTL_IN_SECONDS,
     REGION_NAME,
     DEPLOY_SERVICE_TOPIC_ARN,
 )
 from deployer.constant import PeriodType, OrderType
-from deployer.domain.schemas.haas_responses import GetCallEventsResponse
+from deployer.domain.schemas.haas_responses import GetCallEventsResponse, CallEventResponse
+from deployer.infrastructure.clients.http_transport import get_default_transport
 
 logger = get_logger(__name__)
 
+# the public key is rotated rarely, so it is kept between invocations of a warm container
+public_key_cache = TTLCache(HAAS_PUBLIC_KEY_CACHE_TTL_IN_SECONDS)
+
 
 class HaaSClientError(Exception):
     def __init__(self, message: str):
@@ -32,9 +40,10 @@ class HaaSClientError(Exception):
 
 
 class HaaSClient:
-    def __init__(self, boto_utils=None):
+    def __init__(self, boto_utils=None, transport=None):
         self.auth = HTTPBasicAuth(HAAS_LOGIN, HAAS_PASSWORD)
         self._boto_utils = BotoUtils(REGION_NAME) if boto_utils is None else boto_utils
+        self._transport = get_default_transport() if transport is None else transport
 
     # ========== DAEMON ==========
 
@@ -60,7 +69,7 @@ class HaaSClient:
         logger.debug(f"Deploying daemon url: {url}")
         logger.debug(f"Deploying daemon body: {request_data}")
         try:
-            result = requests.post(url, json=request_data, auth=self.auth)
+            result = self._transport.post(url, "deploy_daemon", json=request_data, auth=self.auth)
             if not result.ok:
                 raise HaaSClientError(result.text)
         except Exception as e:
@@ -71,7 +80,7 @@ class HaaSClient:
 
         logger.debug(f"Deleting daemon url: {url}")
         try:
-            result = requests.delete(url, auth=self.auth)
+            result = self._transport.delete(url, "delete_daemon", auth=self.auth)
             if not result.ok:
                 raise HaaSClientError(result.text)
         except Exception as e:
@@ -83,7 +92,7 @@ class HaaSClient:
 
         logger.debug(f"Getting daemon logs url: {url}")
         try:
-            result = requests.get(url, auth=self.auth)
+            result = self._transport.get(url, "get_daemon_logs", auth=self.auth)
             if result.ok:
                 return result.json()["data"]["logs"]
             else:
@@ -92,11 +101,14 @@ class HaaSClient:
             raise HaaSClientError(str(e))
 
     def get_public_key(self) -> str:
+        return public_key_cache.get_or_set(HAAS_BASE_URL, self._fetch_public_key)
+
+    def _fetch_public_key(self) -> str:
         url = HAAS_BASE_URL + HAAS_GET_PUBLIC_KEY_PATH
 
         logger.debug(f"Getting public key url: {url}")
         try:
-            result = requests.get(url, auth=self.auth)
+            result = self._transport.get(url, "get_public_key", auth=self.auth)
             if result.ok:
                 return result.json()["data"]["publicKey"]
             else:
@@ -111,7 +123,7 @@ class HaaSClient:
 
         logger.debug(f"Deleting hosted service url: {url}")
         try:
-            result = requests.delete(url, auth=self.auth)
+            result = self._transport.delete(url, "delete_hosted_service", auth=self.auth)
             if not result.ok:
                 raise HaaSClientError(result.text)
         except Exception as e:
@@ -123,7 +135,7 @@ class HaaSClient:
 
         logger.debug(f"Getting hosted service logs url: {url}")
         try:
-            result = requests.get(url, auth=self.auth)
+            result = self._transport.get(url, "get_hosted_service_logs", auth=self.auth)
             if result.ok:
                 return result.json()["data"]["logs"]
             else:
@@ -180,10 +192,41 @@ class HaaSClient:
         logger.debug(f"Getting call events url: {url}")
         logger.debug(f"Getting call events body: {request_body}")
         try:
-            response = requests.post(url, json=request_body, auth=self.auth)
+            response = self._transport.post(
+                url, "get_call_events", idempotent=True, json=request_body, auth=self.auth
+            )
             if response.ok:
                 return GetCallEventsResponse(**response.json())
             else:
                 raise HaaSClientError(response.text)
         except Exception as e:
             raise HaaSClientError(str(e))
+
+    def get_all_call_events(
+        self,
+        order: OrderType,
+        period: PeriodType,
+        services: Union[List[Tuple[str, str]], Tuple[str, str], None] = None,
+        page_size: int = 100,
+    ) -> List[CallEventResponse]:
+        """
+        Fetches the first page to learn the total count and then the rest of the pages concurrently.
+        """
+        first_page = self.get_call_events(page_size, 1, order, period, services)
+        pages_count = math.ceil(first_page.total_count / page_size)
+        if pages_count <= 1:
+            return first_page.events
+
+        with ThreadPoolExecutor(
+            max_workers=min(HAAS_MAX_CONCURRENT_REQUESTS, pages_count - 1)
+        ) as executor:
+            next_pages = executor.map(
+                lambda page: self.get_call_events(page_size, page, order, period, services),
+                range(2, pages_count + 1),
+            )
+
+            events = list(first_page.events)
+            for response in next_pages:
+                events.extend(response.events)
+
+        return events
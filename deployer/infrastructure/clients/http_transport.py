@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.handler_metrics import record_endpoint
+from common.logger import get_logger
+from deployer.config import (
+    HTTP_CONNECT_TIMEOUT_IN_SECONDS,
+    HTTP_READ_TIMEOUT_IN_SECONDS,
+    HTTP_MAX_RETRIES,
+    HTTP_RETRY_BACKOFF_IN_SECONDS,
+    HTTP_POOL_MAX_SIZE,
+)
+
+
+logger = get_logger(__name__)
+
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class HTTPTransport:
+    """
+    Keep-alive transport on top of requests.Session shared by the HTTP clients of a warm container.
+    Idempotent calls are retried with exponential backoff on connection errors, timeouts and
+    retryable status codes. Latency of every call is recorded per endpoint name in the handler
+    metrics, or logged when the handler metrics are not collected.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT_IN_SECONDS,
+        read_timeout: float = HTTP_READ_TIMEOUT_IN_SECONDS,
+        max_retries: int = HTTP_MAX_RETRIES,
+        retry_backoff: float = HTTP_RETRY_BACKOFF_IN_SECONDS,
+        pool_max_size: int = HTTP_POOL_MAX_SIZE,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_max_size, pool_maxsize=pool_max_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def request(
+        self, method: str, url: str, endpoint: str, idempotent: bool = False, **kwargs
+    ) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        attempts = self.max_retries + 1 if idempotent else 1
+
+        for attempt in range(1, attempts + 1):
+            start = time.perf_counter()
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record_latency(endpoint, time.perf_counter() - start)
+                if attempt == attempts:
+                    raise
+                logger.warning(f"{method} {endpoint} failed ({e}), attempt {attempt}/{attempts}")
+            else:
+                self._record_latency(endpoint, time.perf_counter() - start)
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt == attempts:
+                    return response
+                logger.warning(
+                    f"{method} {endpoint} returned {response.status_code}, "
+                    f"attempt {attempt}/{attempts}"
+                )
+
+            time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
+    def get(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, endpoint, idempotent=True, **kwargs)
+
+    def post(
+        self, url: str, endpoint: str, idempotent: bool = False, **kwargs
+    ) -> requests.Response:
+        return self.request("POST", url, endpoint, idempotent=idempotent, **kwargs)
+
+    def delete(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, endpoint, idempotent=True, **kwargs)
+
+    @staticmethod
+    def _record_latency(endpoint: str, latency: float) -> None:
+        if not record_endpoint(endpoint, latency):
+            logger.info(f"HTTP call {endpoint} took {latency * 1000:.1f} ms")
+
+
+_default_transport: Optional[HTTPTransport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> HTTPTransport:
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = HTTPTransport()
+    return _default_transport
@@ -10,10 +10,13 @@ from sqlalchemy import (
     ForeignKey,
     Enum,
     Integer,
+    BigInteger,
+    Boolean,
     UniqueConstraint,
+    Index,
     DECIMAL,
 )
-from sqlalchemy.dialects.mysql import FLOAT
+from sqlalchemy.dialects.mysql import FLOAT, TIMESTAMP as MYSQL_TIMESTAMP
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -61,6 +64,18 @@ class EVMTransactionStatus(PythonEnum):
     FAILED = "FAILED"  # transaction failed
 
 
+class DaemonRedeployStatus(PythonEnum):
+    PENDING = "PENDING"
+    ENQUEUED = "ENQUEUED"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class CallEventRollupGranularity(PythonEnum):
+    HOUR = "HOUR"
+    DAY = "DAY"
+
+
 class AccountBalance(Base):
     __tablename__ = "account_balance"
     account_id: Mapped[str] = mapped_column("account_id", VARCHAR(128), primary_key=True)
@@ -169,6 +184,8 @@ class Order(Base):
         "EVMTransaction", backref="order", lazy="select", uselist=True
     )
 
+    __table_args__ = (Index("ix_order_account_updated", account_id, updated_at, id),)
+
 
 class EVMTransaction(Base):
     __tablename__ = "evm_transaction"
@@ -223,3 +240,118 @@ class TokenRate(Base):
     updated_at: Mapped[datetime] = mapped_column(
         "updated_at", TIMESTAMP(timezone=False), nullable=False, server_default=UpdateTimestamp
     )
+
+
+class CurrentTokenRate(Base):
+    __tablename__ = "current_token_rate"
+    token_symbol: Mapped[str] = mapped_column("token_symbol", VARCHAR(128), primary_key=True)
+    # average of token_rate.cogs_per_usd, recalculated every time a new token rate is added
+    cogs_per_usd: Mapped[int] = mapped_column("cogs_per_usd", DECIMAL(38, 0), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        "created_at", TIMESTAMP(timezone=False), nullable=False, server_default=CreateTimestamp
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        "updated_at", TIMESTAMP(timezone=False), nullable=False, server_default=UpdateTimestamp
+    )
+
+
+class CallEventRollup(Base):
+    __tablename__ = "call_event_rollup"
+    id: Mapped[int] = mapped_column("id", Integer, autoincrement=True, primary_key=True)
+    org_id: Mapped[str] = mapped_column("org_id", VARCHAR(256), nullable=False)
+    service_id: Mapped[str] = mapped_column("service_id", VARCHAR(256), nullable=False)
+    granularity: Mapped[CallEventRollupGranularity] = mapped_column(
+        "granularity", Enum(CallEventRollupGranularity), nullable=False
+    )
+    bucket_start: Mapped[datetime] = mapped_column(
+        "bucket_start", TIMESTAMP(timezone=False), nullable=False
+    )
+    calls_count: Mapped[int] = mapped_column("calls_count", BigInteger, nullable=False)
+    amount_sum: Mapped[int] = mapped_column("amount_sum", DECIMAL(38, 0), nullable=False)
+    amount_min: Mapped[int] = mapped_column("amount_min", DECIMAL(38, 0), nullable=False)
+    amount_max: Mapped[int] = mapped_column("amount_max", DECIMAL(38, 0), nullable=False)
+    duration_sum: Mapped[int] = mapped_column("duration_sum", BigInteger, nullable=False)
+    duration_min: Mapped[int] = mapped_column("duration_min", BigInteger, nullable=False)
+    duration_max: Mapped[int] = mapped_column("duration_max", BigInteger, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        "created_at", TIMESTAMP(timezone=False), nullable=False, server_default=CreateTimestamp
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        "updated_at", TIMESTAMP(timezone=False), nullable=False, server_default=UpdateTimestamp
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            org_id, service_id, granularity, bucket_start, name="uq_org_srvc_granularity_bucket"
+        ),
+    )
+
+
+class CallEventRollupState(Base):
+    __tablename__ = "call_event_rollup_state"
+    org_id: Mapped[str] = mapped_column("org_id", VARCHAR(256), primary_key=True)
+    service_id: Mapped[str] = mapped_column("service_id", VARCHAR(256), primary_key=True)
+    # timestamp of the earliest call event that was rolled up for the service
+    tracked_since: Mapped[datetime] = mapped_column(
+        "tracked_since", MYSQL_TIMESTAMP(fsp=6), nullable=False
+    )
+    # timestamp of the latest call event that was rolled up for the service
+    last_event_at: Mapped[datetime] = mapped_column(
+        "last_event_at", MYSQL_TIMESTAMP(fsp=6), nullable=False
+    )
+    # True when it is verified that HaaS has no call events older than tracked_since
+    is_complete: Mapped[bool] = mapped_column("is_complete", Boolean, nullable=False, default=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        "created_at", TIMESTAMP(timezone=False), nullable=False, server_default=CreateTimestamp
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        "updated_at", TIMESTAMP(timezone=False), nullable=False, server_default=UpdateTimestamp
+    )
+
+
+class ProcessedCallEvent(Base):
+    __tablename__ = "processed_call_event"
+    # SQS message id of a call event applied to the balance and the rollups, a redelivered
+    # message is skipped
+    message_id: Mapped[str] = mapped_column("message_id", VARCHAR(128), primary_key=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        "created_at", TIMESTAMP(timezone=False), nullable=False, server_default=CreateTimestamp
+    )
+
+    __table_args__ = (Index("ix_processed_call_event_created", created_at),)
+
+
+class OrgAccessInvalidation(Base):
+    __tablename__ = "org_access_invalidation"
+    org_id: Mapped[str] = mapped_column("org_id", VARCHAR(256), primary_key=True)
+    # access decisions for the organization cached before this moment must not be trusted
+    invalidated_at: Mapped[datetime] = mapped_column(
+        "invalidated_at", MYSQL_TIMESTAMP(fsp=6), nullable=False
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        "created_at", TIMESTAMP(timezone=False), nullable=False, server_default=CreateTimestamp
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        "updated_at", TIMESTAMP(timezone=False), nullable=False, server_default=UpdateTimestamp
+    )
+
+
+class DaemonRedeployTask(Base):
+    __tablename__ = "daemon_redeploy_task"
+    run_id: Mapped[str] = mapped_column("run_id", VARCHAR(128), primary_key=True)
+    daemon_id: Mapped[str] = mapped_column("daemon_id", VARCHAR(128), primary_key=True)
+    status: Mapped[DaemonRedeployStatus] = mapped_column(
+        "status", Enum(DaemonRedeployStatus), nullable=False, default=DaemonRedeployStatus.PENDING
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        "created_at", TIMESTAMP(timezone=False), nullable=False, server_default=CreateTimestamp
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        "updated_at", TIMESTAMP(timezone=False), nullable=False, server_default=UpdateTimestamp
+    )
@@ -0,0 +1,186 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import delete, select, update, func
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session
+
+from deployer.domain.factory.call_event_rollup_factory import CallEventRollupFactory
+from deployer.domain.models.call_event_rollup import (
+    CallEventRollupDomain,
+    CallEventRollupStateDomain,
+    NewCallEventRollupDomain,
+)
+from deployer.infrastructure.models import (
+    CallEventRollup,
+    CallEventRollupGranularity,
+    CallEventRollupState,
+    ProcessedCallEvent,
+)
+
+
+class CallEventRollupRepository:
+    @staticmethod
+    def upsert_call_event_rollups(
+        session: Session, call_event_rollups: List[NewCallEventRollupDomain]
+    ) -> None:
+        if not call_event_rollups:
+            return
+
+        query = insert(CallEventRollup).values(
+            [
+                {
+                    "org_id": rollup.org_id,
+                    "service_id": rollup.service_id,
+                    "granularity": rollup.granularity,
+                    "bucket_start": rollup.bucket_start,
+                    "calls_count": rollup.calls_count,
+                    "amount_sum": rollup.amount_sum,
+                    "amount_min": rollup.amount_min,
+                    "amount_max": rollup.amount_max,
+                    "duration_sum": rollup.duration_sum,
+                    "duration_min": rollup.duration_min,
+                    "duration_max": rollup.duration_max,
+                }
+                for rollup in call_event_rollups
+            ]
+        )
+
+        query = query.on_duplicate_key_update(
+            calls_count=CallEventRollup.calls_count + query.inserted.calls_count,
+            amount_sum=CallEventRollup.amount_sum + query.inserted.amount_sum,
+            amount_min=func.least(CallEventRollup.amount_min, query.inserted.amount_min),
+            amount_max=func.greatest(CallEventRollup.amount_max, query.inserted.amount_max),
+            duration_sum=CallEventRollup.duration_sum + query.inserted.duration_sum,
+            duration_min=func.least(CallEventRollup.duration_min, query.inserted.duration_min),
+            duration_max=func.greatest(CallEventRollup.duration_max, query.inserted.duration_max),
+        )
+
+        session.execute(query)
+
+    @staticmethod
+    def get_call_event_rollups(
+        session: Session,
+        org_id: str,
+        service_id: str,
+        granularity: CallEventRollupGranularity,
+        start: Optional[datetime] = None,
+    ) -> List[CallEventRollupDomain]:
+        query = select(CallEventRollup).where(
+            CallEventRollup.org_id == org_id,
+            CallEventRollup.service_id == service_id,
+            CallEventRollup.granularity == granularity,
+        )
+        if start is not None:
+            query = query.where(CallEventRollup.bucket_start >= start)
+        query = query.order_by(CallEventRollup.bucket_start.asc())
+
+        result = session.execute(query)
+        call_event_rollups_db = result.scalars().all()
+
+        return CallEventRollupFactory.call_event_rollups_from_db_model(call_event_rollups_db)
+
+    @staticmethod
+    def upsert_call_event_rollup_state(
+        session: Session,
+        org_id: str,
+        service_id: str,
+        first_event_at: datetime,
+        last_event_at: datetime,
+    ) -> None:
+        query = insert(CallEventRollupState).values(
+            org_id=org_id,
+            service_id=service_id,
+            tracked_since=first_event_at,
+            last_event_at=last_event_at,
+            is_complete=False,
+        )
+
+        query = query.on_duplicate_key_update(
+            tracked_since=func.least(
+                CallEventRollupState.tracked_since, query.inserted.tracked_since
+            ),
+            last_event_at=func.greatest(
+                CallEventRollupState.last_event_at, query.inserted.last_event_at
+            ),
+        )
+
+        session.execute(query)
+
+    @staticmethod
+    def get_call_event_rollup_state(
+        session: Session, org_id: str, service_id: str
+    ) -> Optional[CallEventRollupStateDomain]:
+        query = (
+            select(CallEventRollupState)
+            .where(
+                CallEventRollupState.org_id == org_id,
+                CallEventRollupState.service_id == service_id,
+            )
+            .limit(1)
+        )
+
+        result = session.execute(query)
+
+        call_event_rollup_state_db = result.scalar_one_or_none()
+        if call_event_rollup_state_db is None:
+            return None
+
+        return CallEventRollupFactory.call_event_rollup_state_from_db_model(
+            call_event_rollup_state_db
+        )
+
+    @staticmethod
+    def mark_call_event_rollup_state_complete(
+        session: Session, org_id: str, service_id: str
+    ) -> None:
+        query = (
+            update(CallEventRollupState)
+            .where(
+                CallEventRollupState.org_id == org_id,
+                CallEventRollupState.service_id == service_id,
+            )
+            .values(is_complete=True)
+        )
+
+        session.execute(query)
+
+    @staticmethod
+    def get_processed_call_event_ids(session: Session, message_ids: Iterable[str]) -> Set[str]:
+        message_ids = list(message_ids)
+        if not message_ids:
+            return set()
+
+        query = select(ProcessedCallEvent.message_id).where(
+            ProcessedCallEvent.message_id.in_(message_ids)
+        )
+
+        result = session.execute(query)
+        return set(result.scalars().all())
+
+    @staticmethod
+    def add_processed_call_events(session: Session, message_ids: Iterable[str]) -> None:
+        """
+        A message applied concurrently by another consumer violates the primary key, so the
+        transaction applying it fails instead of counting the event twice
+        """
+        message_ids = list(message_ids)
+        if not message_ids:
+            return
+
+        query = insert(ProcessedCallEvent).values(
+            [{"message_id": message_id} for message_id in message_ids]
+        )
+
+        session.execute(query)
+
+    @staticmethod
+    def delete_processed_call_events(session: Session, before: datetime, limit: int) -> int:
+        query = (
+            delete(ProcessedCallEvent)
+            .where(ProcessedCallEvent.created_at < before)
+            .with_dialect_options(mysql_limit=limit)
+        )
+
+        result = session.execute(query)
+        return result.rowcount
@@ -0,0 +1,90 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session
+
+from deployer.infrastructure.models import DaemonRedeployTask, DaemonRedeployStatus
+
+
+class DaemonRedeployRepository:
+    @staticmethod
+    def create_redeploy_tasks(session: Session, run_id: str, daemon_ids: List[str]) -> None:
+        if not daemon_ids:
+            return
+
+        query = insert(DaemonRedeployTask).prefix_with("IGNORE")
+
+        session.execute(
+            query,
+            [
+                {"run_id": run_id, "daemon_id": daemon_id, "status": DaemonRedeployStatus.PENDING}
+                for daemon_id in daemon_ids
+            ],
+        )
+
+    @staticmethod
+    def get_redeploy_daemon_ids(
+        session: Session,
+        run_id: str,
+        statuses: List[DaemonRedeployStatus],
+        after_daemon_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        query = select(DaemonRedeployTask.daemon_id).where(
+            DaemonRedeployTask.run_id == run_id, DaemonRedeployTask.status.in_(statuses)
+        )
+        if after_daemon_id is not None:
+            query = query.where(DaemonRedeployTask.daemon_id > after_daemon_id)
+        query = query.order_by(DaemonRedeployTask.daemon_id)
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = session.scalars(query).all()
+
+        return list(result)
+
+    @staticmethod
+    def get_redeploy_status(
+        session: Session, run_id: str, daemon_id: str
+    ) -> Optional[DaemonRedeployStatus]:
+        query = select(DaemonRedeployTask.status).where(
+            DaemonRedeployTask.run_id == run_id, DaemonRedeployTask.daemon_id == daemon_id
+        )
+
+        result = session.execute(query)
+
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def update_redeploy_status(
+        session: Session,
+        run_id: str,
+        daemon_ids: List[str],
+        status: DaemonRedeployStatus,
+        from_statuses: Optional[List[DaemonRedeployStatus]] = None,
+    ) -> None:
+        if not daemon_ids:
+            return
+
+        query = update(DaemonRedeployTask).where(
+            DaemonRedeployTask.run_id == run_id, DaemonRedeployTask.daemon_id.in_(daemon_ids)
+        )
+        # the consumer may finish a redeploy before the producer records it as enqueued
+        if from_statuses is not None:
+            query = query.where(DaemonRedeployTask.status.in_(from_statuses))
+        query = query.values(status=status)
+
+        session.execute(query)
+
+    @staticmethod
+    def get_redeploy_progress(session: Session, run_id: str) -> Dict[DaemonRedeployStatus, int]:
+        query = (
+            select(DaemonRedeployTask.status, func.count())
+            .where(DaemonRedeployTask.run_id == run_id)
+            .group_by(DaemonRedeployTask.status)
+        )
+
+        result = session.execute(query)
+
+        return {status: count for status, count in result.all()}
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict, Tuple
 
-from sqlalchemy import update, select, func
+from sqlalchemy import update, select, func, tuple_
 from sqlalchemy.orm import Session, joinedload
 
 from deployer.constant import OrderType, OrderByType
@@ -119,6 +119,23 @@ class DaemonRepository:
 
         return DaemonFactory.daemon_from_db_model(daemon_db)
 
+    @staticmethod
+    def get_hosted_service_account_ids(
+        session: Session, org_service_ids: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], str]:
+        if not org_service_ids:
+            return {}
+
+        query = (
+            select(Daemon.org_id, Daemon.service_id, Daemon.account_id)
+            .join(HostedService, HostedService.daemon_id == Daemon.id)
+            .where(tuple_(Daemon.org_id, Daemon.service_id).in_(org_service_ids))
+        )
+
+        result = session.execute(query)
+
+        return {(org_id, service_id): account_id for org_id, service_id, account_id in result.all()}
+
     @staticmethod
     def get_all_daemon_ids(
         session: Session, status: Union[DaemonStatus, List[DaemonStatus], None] = None
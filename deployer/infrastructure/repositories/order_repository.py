@@ -1,7 +1,7 @@
 from datetime import datetime, UTC, timedelta
 from typing import Optional, List, Union
 
-from sqlalchemy import select, update, func
+from sqlalchemy import select, update, func, tuple_, Select
 from sqlalchemy.orm import Session
 
 from deployer.config import TRANSACTION_TTL_IN_MINUTES
@@ -23,16 +23,7 @@ class OrderRepository:
         status: Union[OrderStatus, List[OrderStatus], None] = None,
     ) -> List[OrderDomain]:
         query = select(Order).where(Order.account_id == account_id)
-
-        if status is not None:
-            if isinstance(status, list):
-                query = query.where(Order.status.in_(status))
-            else:
-                query = query.where(Order.status == status)
-
-        if period != PeriodType.ALL:
-            current_time = datetime.now(UTC)
-            query = query.where(Order.updated_at > current_time - PERIOD_TYPE_TIMEDELTA[period])
+        query = OrderRepository._filter_orders(query, period, status)
 
         if order == OrderType.ASC:
             query = query.order_by(Order.updated_at.asc())
@@ -46,6 +37,45 @@ class OrderRepository:
 
         return OrderFactory.orders_from_db_model(orders_db)
 
+    @staticmethod
+    def get_orders_after(
+        session: Session,
+        account_id: str,
+        limit: int,
+        order: OrderType,
+        period: PeriodType,
+        status: Union[OrderStatus, List[OrderStatus], None] = None,
+        after_updated_at: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+    ) -> List[OrderDomain]:
+        """
+        Keyset pagination over (updated_at, id), so the cost of a page doesn't depend on its depth.
+        """
+        query = select(Order).where(Order.account_id == account_id)
+        query = OrderRepository._filter_orders(query, period, status)
+
+        if after_updated_at is not None:
+            if order == OrderType.ASC:
+                query = query.where(
+                    tuple_(Order.updated_at, Order.id) > (after_updated_at, after_id)
+                )
+            else:
+                query = query.where(
+                    tuple_(Order.updated_at, Order.id) < (after_updated_at, after_id)
+                )
+
+        if order == OrderType.ASC:
+            query = query.order_by(Order.updated_at.asc(), Order.id.asc())
+        else:
+            query = query.order_by(Order.updated_at.desc(), Order.id.desc())
+
+        query = query.limit(limit)
+
+        result = session.execute(query)
+        orders_db = result.scalars().all()
+
+        return OrderFactory.orders_from_db_model(orders_db)
+
     @staticmethod
     def get_orders_total_count(
         session: Session,
@@ -54,7 +84,16 @@ class OrderRepository:
         status: Union[OrderStatus, List[OrderStatus], None] = None,
     ) -> int:
         query = select(func.count()).select_from(Order).where(Order.account_id == account_id)
+        query = OrderRepository._filter_orders(query, period, status)
+
+        result = session.execute(query)
+
+        return result.scalar()
 
+    @staticmethod
+    def _filter_orders(
+        query: Select, period: PeriodType, status: Union[OrderStatus, List[OrderStatus], None]
+    ) -> Select:
         if status is not None:
             if isinstance(status, list):
                 query = query.where(Order.status.in_(status))
@@ -65,9 +104,7 @@ class OrderRepository:
             current_time = datetime.now(UTC)
             query = query.where(Order.updated_at > current_time - PERIOD_TYPE_TIMEDELTA[period])
 
-        result = session.execute(query)
-
-        return result.scalar()
+        return query
 
     @staticmethod
     def get_order(
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session
+
+from deployer.infrastructure.models import OrgAccessInvalidation
+
+
+class OrgAccessInvalidationRepository:
+    @staticmethod
+    def upsert_org_access_invalidation(
+        session: Session, org_id: str, invalidated_at: datetime
+    ) -> None:
+        query = insert(OrgAccessInvalidation).values(org_id=org_id, invalidated_at=invalidated_at)
+
+        query = query.on_duplicate_key_update(
+            invalidated_at=func.greatest(
+                OrgAccessInvalidation.invalidated_at, query.inserted.invalidated_at
+            )
+        )
+
+        session.execute(query)
+
+    @staticmethod
+    def get_org_access_invalidated_at(session: Session, org_id: str) -> Optional[datetime]:
+        query = select(OrgAccessInvalidation.invalidated_at).where(
+            OrgAccessInvalidation.org_id == org_id
+        )
+
+        result = session.execute(query)
+
+        return result.scalar_one_or_none()
@@ -2,10 +2,11 @@ from datetime import UTC, datetime, timedelta
 from typing import Optional
 
 from sqlalchemy import select, func, delete
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.orm import Session
 
-from deployer.domain.models.token_rate import NewTokenRateDomain
-from deployer.infrastructure.models import TokenRate
+from deployer.domain.models.token_rate import NewTokenRateDomain, CurrentTokenRateDomain
+from deployer.infrastructure.models import TokenRate, CurrentTokenRate
 
 
 class TokenRateRepository:
@@ -37,3 +38,32 @@ class TokenRateRepository:
         query = delete(TokenRate).where(TokenRate.created_at < minimal_datetime)
 
         session.execute(query)
+
+    @staticmethod
+    def get_current_token_rate(
+        session: Session, token_symbol: str
+    ) -> Optional[CurrentTokenRateDomain]:
+        query = select(CurrentTokenRate).where(CurrentTokenRate.token_symbol == token_symbol)
+
+        current_token_rate_db = session.execute(query).scalar_one_or_none()
+        if current_token_rate_db is None:
+            return None
+
+        return CurrentTokenRateDomain(
+            token_symbol=current_token_rate_db.token_symbol,
+            cogs_per_usd=int(current_token_rate_db.cogs_per_usd),
+            updated_at=current_token_rate_db.updated_at,
+        )
+
+    @staticmethod
+    def upsert_current_token_rate(session: Session, token_symbol: str, cogs_per_usd: int) -> None:
+        query = insert(CurrentTokenRate).values(
+            token_symbol=token_symbol, cogs_per_usd=cogs_per_usd
+        )
+
+        # updated_at is set explicitly, because ON UPDATE keeps it when the value is the same
+        query = query.on_duplicate_key_update(
+            cogs_per_usd=query.inserted.cogs_per_usd, updated_at=func.current_timestamp()
+        )
+
+        session.execute(query)
@@ -108,15 +108,27 @@ def test_haas_client():
         def get_call_events(self, *args, **kwargs):
             return self.call_events
 
+        def get_all_call_events(self, *args, **kwargs):
+            return self.call_events.events
+
     return TestHaaSClient()
 
 
 @pytest.fixture(scope="function")
 def test_deployer_client():
     class TestDeployerClient:
+        def __init__(self):
+            self.enqueued_daemon_ids = []
+            self.failed_daemon_ids = []
+
         def deploy_daemon(self, *args, **kwargs):
             return None
 
+        def enqueue_daemon_redeploys(self, run_id, daemon_ids):
+            failed_daemon_ids = [d for d in daemon_ids if d in self.failed_daemon_ids]
+            self.enqueued_daemon_ids.extend(d for d in daemon_ids if d not in failed_daemon_ids)
+            return failed_daemon_ids
+
     return TestDeployerClient()
 
 
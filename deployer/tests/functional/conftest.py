@@ -6,6 +6,7 @@ from typing import List
 
 import pytest
 
+from common.cache import TTLCache
 from deployer.application.services.authorization_service import AuthorizationService
 from deployer.application.services.billing_service import BillingService
 from deployer.application.services.daemon_service import DaemonService
@@ -31,12 +32,14 @@ from deployer.tests.functional.utils import create_order_and_transaction, add_da
 
 @pytest.fixture(scope="function")
 def test_auth_service(test_session_factory, test_registry_client):
-    return AuthorizationService(test_session_factory, test_registry_client)
+    return AuthorizationService(test_session_factory, test_registry_client, TTLCache(60))
 
 
 @pytest.fixture(scope="function")
 def test_billing_service(test_session_factory, test_haas_client, test_crypto_exchange_client):
-    return BillingService(test_session_factory, test_haas_client, test_crypto_exchange_client)
+    return BillingService(
+        test_session_factory, test_haas_client, test_crypto_exchange_client, TTLCache(60)
+    )
 
 
 @pytest.fixture(scope="function")
@@ -1,7 +1,11 @@
+import base64
+import datetime
+from datetime import timedelta
 from decimal import Decimal
 
 import deepdiff
 import pytest
+from sqlalchemy import delete
 
 from common.logger import get_logger
 from deployer.application.handlers.billing_handlers import (
@@ -10,18 +14,32 @@ from deployer.application.handlers.billing_handlers import (
     get_balance,
     get_balance_history,
     get_metrics,
+    download_metrics,
     get_balance_and_rate,
     update_transaction_status,
     call_event_consumer,
+    call_event_batch_consumer,
     update_token_rate,
 )
 from deployer.application.services.billing_service import BillingService
+from deployer.application.services.file_export_service import FileExportService
+from common.cache import TTLCache
+from deployer.application.services import metrics_service as metrics_service_module
 from deployer.application.services.metrics_service import MetricsService
 from deployer.config import TOKEN_DECIMALS, TOKEN_NAME
+from deployer.domain.schemas.haas_responses import CallEventResponse, GetCallEventsResponse
 from deployer.exceptions import HostedServiceNotFoundException
 from deployer.infrastructure.db import session_scope
-from deployer.infrastructure.models import OrderStatus, EVMTransactionStatus
+from deployer.infrastructure.models import (
+    OrderStatus,
+    EVMTransactionStatus,
+    CallEventRollupGranularity,
+    TokenRate,
+)
 from deployer.infrastructure.repositories.account_balance_repository import AccountBalanceRepository
+from deployer.infrastructure.repositories.call_event_rollup_repository import (
+    CallEventRollupRepository,
+)
 from deployer.infrastructure.repositories.order_repository import OrderRepository
 from deployer.infrastructure.repositories.token_rate_repository import TokenRateRepository
 from deployer.tests.functional.utils import (
@@ -267,6 +285,62 @@ class TestGetBalanceHistory:
         assert expense_count == 2
         assert expense_sum == 201
 
+    def test_get_balance_history_cursor_ok(
+        self, test_haas_client_with_events, test_session_factory, add_test_orders
+    ):
+        all_call_events = test_haas_client_with_events.call_events.events
+
+        def get_call_events_page(limit, page, *args, **kwargs):
+            return GetCallEventsResponse(
+                events=all_call_events[(page - 1) * limit : page * limit],
+                totalCount=len(all_call_events),
+            )
+
+        test_haas_client_with_events.get_call_events = get_call_events_page
+        billing_service = BillingService(
+            session_factory=test_session_factory, haas_client=test_haas_client_with_events
+        )
+
+        events = []
+        cursor = None
+        while True:
+            query_parameters = {"limit": 5, "order": "desc", "period": "day"}
+            if cursor is not None:
+                query_parameters["cursor"] = cursor
+
+            response = get_balance_history(
+                generate_request_event(query_parameters=query_parameters), None, billing_service
+            )
+            _, data = validate_response_ok(response)
+
+            assert len(data["events"]) <= 5
+            events.extend(data["events"])
+            cursor = data["nextCursor"]
+            if cursor is None:
+                break
+
+        assert len(events) == 23
+        assert len([event for event in events if event["type"] == "income"]) == 3
+        assert sum(event["amount"] for event in events if event["type"] == "expense") == sum(
+            call_event.amount for call_event in all_call_events
+        )
+
+    def test_get_balance_history_invalid_cursor(self, test_billing_service):
+        event = generate_request_event(query_parameters={"limit": 5, "cursor": "not-a-cursor"})
+
+        response = get_balance_history(event, None, test_billing_service)
+        _, message = validate_response_bad_request(response)
+
+        assert message == "Invalid balance history cursor!"
+
+    def test_get_balance_history_page_for_all_type(self, test_billing_service):
+        event = generate_request_event(query_parameters={"limit": 5, "page": 2, "type": "all"})
+
+        response = get_balance_history(event, None, test_billing_service)
+        _, message = validate_response_bad_request(response)
+
+        assert message == "The 'all' type is paginated with the cursor parameter only!"
+
     def test_get_balance_history_empty_ok(self, test_billing_service, test_session_factory):
         event = generate_request_event(
             query_parameters={"limit": 5, "page": 1, "order": "desc", "period": "day"}
@@ -321,6 +395,135 @@ class TestGetMetrics:
         assert data["summary"]["requests"]["total"] in [20, 21]
         assert all(len(value) in [20, 21] for value in data["values"].values())
 
+    def test_get_metrics_from_rollups_ok(
+        self,
+        test_auth_service,
+        test_haas_client_with_events,
+        test_session_factory,
+        add_test_daemon_and_service,
+        test_hosted_service_id,
+        test_org_id,
+        test_service_id,
+    ):
+        billing_service = BillingService(
+            session_factory=test_session_factory, haas_client=test_haas_client_with_events
+        )
+        events = [
+            generate_request_event(
+                orgId=call_event.org_id,
+                serviceId=call_event.service_id,
+                duration=call_event.duration,
+                amount=call_event.amount,
+                timestamp=call_event.timestamp.isoformat(),
+            )
+            for call_event in test_haas_client_with_events.call_events.events
+        ]
+        call_event_consumer(create_common_queue_event(events), None, billing_service)
+
+        metrics_service = MetricsService(
+            session_factory=test_session_factory, haas_client=test_haas_client_with_events
+        )
+        raw_metrics = metrics_service._prepare_metrics_summary(
+            metrics_service._create_events_dataframe(
+                test_haas_client_with_events.call_events.events
+            )
+        )
+
+        event = generate_request_event(
+            path_parameters={"hostedServiceId": test_hosted_service_id},
+            query_parameters={"period": "week"},
+        )
+
+        response = get_metrics(event, None, metrics_service, test_auth_service)
+        _, data = validate_response_ok(response)
+
+        assert data["summary"] == raw_metrics
+
+        with session_scope(test_session_factory) as session:
+            rollup_state = CallEventRollupRepository.get_call_event_rollup_state(
+                session, test_org_id, test_service_id
+            )
+            hourly_rollups = CallEventRollupRepository.get_call_event_rollups(
+                session, test_org_id, test_service_id, CallEventRollupGranularity.HOUR
+            )
+
+        assert rollup_state.is_complete
+        assert sum(rollup.calls_count for rollup in hourly_rollups) == len(events)
+
+    def test_get_metrics_from_rollups_without_events_before_period_ok(
+        self,
+        test_auth_service,
+        test_haas_client,
+        test_session_factory,
+        add_test_daemon_and_service,
+        test_hosted_service_id,
+        test_org_id,
+        test_service_id,
+        monkeypatch,
+    ):
+        now = datetime.datetime.now(datetime.UTC).replace(minute=30, second=0, microsecond=0)
+
+        class FixedDatetime(datetime.datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return now
+
+        monkeypatch.setattr(metrics_service_module, "datetime", FixedDatetime)
+        monkeypatch.setattr(metrics_service_module, "first_call_event_cache", TTLCache(60))
+
+        period_start = now - timedelta(days=1)
+        # the first event shares the hourly rollup with the second one, but is out of the period
+        timestamps = [
+            period_start - timedelta(minutes=10),
+            period_start + timedelta(minutes=10),
+            now - timedelta(hours=1),
+        ]
+        call_events = [
+            CallEventResponse(
+                orgId=test_org_id,
+                serviceId=test_service_id,
+                duration=10 + i,
+                amount=100 + i,
+                timestamp=timestamp,
+            )
+            for i, timestamp in enumerate(timestamps)
+        ]
+        test_haas_client.call_events = GetCallEventsResponse(
+            events=call_events, totalCount=len(call_events)
+        )
+
+        billing_service = BillingService(
+            session_factory=test_session_factory, haas_client=test_haas_client
+        )
+        events = [
+            generate_request_event(
+                orgId=call_event.org_id,
+                serviceId=call_event.service_id,
+                duration=call_event.duration,
+                amount=call_event.amount,
+                timestamp=call_event.timestamp.isoformat(),
+            )
+            for call_event in call_events
+        ]
+        call_event_consumer(create_common_queue_event(events), None, billing_service)
+
+        metrics_service = MetricsService(
+            session_factory=test_session_factory, haas_client=test_haas_client
+        )
+        expected_summary = metrics_service._prepare_metrics_summary(
+            metrics_service._create_events_dataframe(call_events[1:])
+        )
+
+        event = generate_request_event(
+            path_parameters={"hostedServiceId": test_hosted_service_id},
+            query_parameters={"period": "day"},
+        )
+
+        response = get_metrics(event, None, metrics_service, test_auth_service)
+        _, data = validate_response_ok(response)
+
+        assert data["summary"] == expected_summary
+
     def test_get_metrics_empty_ok(
         self,
         test_metrics_service,
@@ -359,6 +562,66 @@ class TestGetMetrics:
         assert message == "Access denied"
 
 
+class TestDownloadMetrics:
+    def test_download_metrics_inline_ok(
+        self,
+        test_auth_service,
+        test_haas_client_with_events,
+        test_session_factory,
+        add_test_daemon_and_service,
+        test_hosted_service_id,
+    ):
+        metrics_service = MetricsService(
+            session_factory=test_session_factory, haas_client=test_haas_client_with_events
+        )
+
+        event = generate_request_event(
+            path_parameters={"hostedServiceId": test_hosted_service_id},
+            query_parameters={"period": "day"},
+        )
+
+        response = download_metrics(event, None, metrics_service, test_auth_service)
+
+        assert response["statusCode"] == 200
+        content = base64.b64decode(response["body"]).decode("utf-8")
+        assert len(content.split("\n")) == 21
+
+    def test_download_metrics_to_s3_ok(
+        self,
+        test_auth_service,
+        test_haas_client_with_events,
+        test_session_factory,
+        add_test_daemon_and_service,
+        test_hosted_service_id,
+    ):
+        class TestBotoUtils:
+            def s3_upload_gzip_text_stream(self, chunks, bucket, key, content_type):
+                self.content = "".join(chunks)
+
+            def generate_s3_presigned_url(self, bucket, key, expires_in, filename=None):
+                return f"https://{bucket}.s3.amazonaws.com/{key}"
+
+        boto_utils = TestBotoUtils()
+        metrics_service = MetricsService(
+            session_factory=test_session_factory,
+            haas_client=test_haas_client_with_events,
+            file_export_service=FileExportService(boto_utils, inline_max_size=100),
+        )
+
+        event = generate_request_event(
+            path_parameters={"hostedServiceId": test_hosted_service_id},
+            query_parameters={"period": "day"},
+        )
+
+        response = download_metrics(event, None, metrics_service, test_auth_service)
+
+        status_code, data = validate_response_ok(response)
+        assert status_code == 200
+        assert data["filename"] == f"hosted_service_{test_hosted_service_id}_metrics.csv"
+        assert data["url"].endswith(data["filename"])
+        assert len(boto_utils.content.split("\n")) == 21
+
+
 class TestGetBalanceAndRate:
     def test_get_balance_and_rate_ok(
         self,
@@ -511,6 +774,97 @@ class TestCallEventConsumer:
         )
 
 
+class TestCallEventBatchConsumer:
+    def test_call_event_batch_consumer_ok(
+        self,
+        test_billing_service,
+        test_session_factory,
+        add_test_account_balance,
+        add_test_daemon_and_service,
+        test_org_id,
+        test_service_id,
+        test_account_id,
+    ):
+        amounts = [10, 20, 30]
+        balance = add_test_account_balance
+
+        events = [
+            generate_request_event(
+                orgId=test_org_id,
+                serviceId=test_service_id,
+                duration=10,
+                amount=amount,
+                timestamp="2025-10-16T18:08:42.782000",
+            )
+            for amount in amounts
+        ]
+        events.append(
+            generate_request_event(
+                orgId="UNKNOWN_ORG_ID",
+                serviceId=test_service_id,
+                duration=10,
+                amount=100,
+                timestamp="2025-10-16T18:08:42.782000",
+            )
+        )
+        events.append({"orgId": test_org_id})
+        queue_event = create_common_queue_event(events)
+
+        response = call_event_batch_consumer(queue_event, None, test_billing_service)
+
+        assert response == {"batchItemFailures": [{"itemIdentifier": "4"}, {"itemIdentifier": "3"}]}
+
+        with session_scope(test_session_factory) as session:
+            account_balance = AccountBalanceRepository.get_account_balance(session, test_account_id)
+            hourly_rollups = CallEventRollupRepository.get_call_event_rollups(
+                session, test_org_id, test_service_id, CallEventRollupGranularity.HOUR
+            )
+
+        assert account_balance.balance_in_cogs == balance - sum(amounts)
+        assert hourly_rollups[0].calls_count == len(amounts)
+
+    def test_call_event_batch_consumer_redelivery(
+        self,
+        test_billing_service,
+        test_session_factory,
+        add_test_account_balance,
+        add_test_daemon_and_service,
+        test_org_id,
+        test_service_id,
+        test_account_id,
+    ):
+        amounts = [10, 20]
+        balance = add_test_account_balance
+
+        events = [
+            generate_request_event(
+                orgId=test_org_id,
+                serviceId=test_service_id,
+                duration=10,
+                amount=amount,
+                timestamp="2025-10-16T18:08:42.782000",
+            )
+            for amount in amounts
+        ]
+        call_event_batch_consumer(create_common_queue_event(events[:1]), None, test_billing_service)
+        # the first message is redelivered together with a new one
+        response = call_event_batch_consumer(
+            create_common_queue_event(events), None, test_billing_service
+        )
+
+        assert response == {"batchItemFailures": []}
+
+        with session_scope(test_session_factory) as session:
+            account_balance = AccountBalanceRepository.get_account_balance(session, test_account_id)
+            hourly_rollups = CallEventRollupRepository.get_call_event_rollups(
+                session, test_org_id, test_service_id, CallEventRollupGranularity.HOUR
+            )
+
+        assert account_balance.balance_in_cogs == balance - sum(amounts)
+        assert hourly_rollups[0].calls_count == len(amounts)
+        assert hourly_rollups[0].amount_sum == sum(amounts)
+
+
 class TestUpdateTokenRate:
     def test_update_token_rate(
         self, test_billing_service, test_session_factory, add_token_rate_records
@@ -523,8 +877,33 @@ class TestUpdateTokenRate:
 
         with session_scope(test_session_factory) as session:
             token_rate = TokenRateRepository.get_average_cogs_per_usd(session, TOKEN_NAME)
+            current_token_rate = TokenRateRepository.get_current_token_rate(session, TOKEN_NAME)
 
         new_cogs_per_usd = round(
             Decimal(add_token_rate_records * 10 + test_cogs_per_usd) / Decimal(11)
         )
         assert token_rate == new_cogs_per_usd
+        assert current_token_rate.cogs_per_usd == new_cogs_per_usd
+
+    def test_get_balance_and_rate_uses_current_token_rate(
+        self,
+        test_billing_service,
+        test_session_factory,
+        add_token_rate_records,
+        test_org_id,
+        test_service_id,
+    ):
+        update_token_rate(None, None, billing_service=test_billing_service)
+
+        with session_scope(test_session_factory) as session:
+            current_token_rate = TokenRateRepository.get_current_token_rate(session, TOKEN_NAME)
+            # the history is not read anymore when the current rate exists
+            session.execute(delete(TokenRate))
+
+        event = generate_request_event(
+            query_parameters={"orgId": test_org_id, "serviceId": test_service_id}
+        )
+        response = get_balance_and_rate(event, None, test_billing_service)
+        _, data = validate_response_ok(response)
+
+        assert data["cogsPerUsd"] == current_token_rate.cogs_per_usd
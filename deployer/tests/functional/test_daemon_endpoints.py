@@ -9,6 +9,8 @@ from deployer.application.handlers.daemon_handlers import (
     update_config,
     update_daemon_status,
     redeploy_daemon_forcibly,
+    redeploy_all_daemons,
+    redeploy_daemon_event_consumer,
 )
 from deployer.exceptions import DaemonNotFoundForServiceException
 from deployer.infrastructure.db import session_scope
@@ -456,6 +458,49 @@ class TestRedeployDaemonForcibly:
         assert message == f"Daemon with id {test_daemon_id} not found!"
 
 
+class TestRedeployAllDaemons:
+    def test_redeploy_all_daemons_resume_ok(
+        self,
+        test_daemon_service,
+        test_deployer_client,
+        test_session_factory,
+        add_test_daemon,
+        test_daemon_id,
+    ):
+        test_deployer_client.failed_daemon_ids = [test_daemon_id]
+
+        response = redeploy_all_daemons({}, None, test_daemon_service)
+        _, data = validate_response_ok(response)
+
+        assert data["progress"]["PENDING"] == 1
+        assert test_deployer_client.enqueued_daemon_ids == []
+
+        test_deployer_client.failed_daemon_ids = []
+
+        response = redeploy_all_daemons({"runId": data["runId"]}, None, test_daemon_service)
+        _, data = validate_response_ok(response)
+
+        assert data["progress"]["ENQUEUED"] == 1
+        assert test_deployer_client.enqueued_daemon_ids == [test_daemon_id]
+
+        test_event = create_common_queue_event(
+            [{"runId": data["runId"], "daemonId": test_daemon_id}]
+        )
+        redeploy_daemon_event_consumer(test_event, None, test_daemon_service)
+
+        with session_scope(test_session_factory) as session:
+            daemon = DaemonRepository.get_daemon(session, test_daemon_id)
+
+        assert daemon.status == DaemonStatus.STARTING
+
+        # already handled daemons are skipped on resume
+        response = redeploy_all_daemons({"runId": data["runId"]}, None, test_daemon_service)
+        _, data = validate_response_ok(response)
+
+        assert data["progress"]["DONE"] == 1
+        assert test_deployer_client.enqueued_daemon_ids == [test_daemon_id]
+
+
 class TestDaemonEndpoints:
     pass
     # def test_deploy_daemon_ok(self, test_daemon_service):
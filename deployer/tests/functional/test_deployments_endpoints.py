@@ -1,3 +1,5 @@
+from common.cache import TTLCache
+from common.request_context import RequestContext
 from deployer.application.handlers.deployments_handlers import (
     initiate_deployment,
     get_user_deployments,
@@ -5,6 +7,7 @@ from deployer.application.handlers.deployments_handlers import (
     get_public_key,
     registry_event_consumer,
 )
+from deployer.application.services.authorization_service import AuthorizationService
 from deployer.config import REQUEST_MAX_LIMIT
 from deployer.infrastructure.db import session_scope
 from deployer.infrastructure.models import DaemonStatus, HostedServiceStatus
@@ -450,3 +453,44 @@ class TestRegistryEventConsumer:
 
         assert daemon.daemon_config["daemon_group"] == group_name
         assert daemon.daemon_config["service_class"] == service_class
+
+    def test_registry_event_consumer_organization_modified_ok(
+        self, test_deployments_service, test_session_factory, test_org_id
+    ):
+        class CountingRegistryClient:
+            def __init__(self):
+                self.calls = 0
+
+            def get_all_orgs(self, *args, **kwargs):
+                self.calls += 1
+                return [{"org_id": test_org_id}]
+
+        registry_client = CountingRegistryClient()
+        auth_service = AuthorizationService(test_session_factory, registry_client, TTLCache(60))
+        req_ctx = RequestContext(generate_request_event())
+
+        auth_service.check_service_access(req_ctx, test_org_id)
+        auth_service.check_service_access(req_ctx, test_org_id)
+        assert registry_client.calls == 1
+
+        test_event = create_common_queue_event(
+            [
+                {
+                    "blockchain_event": {
+                        "name": "OrganizationModified",
+                        "data": {
+                            "json_str": "{'orgId': b'TEST_ORG_ID\\x00\\x00\\x00\\x00\\x00\\x00\\x00\\x00\\x00\\x00\\x00\\x00\\x00\\x00\\x00'}"
+                        },
+                    }
+                }
+            ]
+        )
+
+        # the event is consumed in another container with its own cache
+        consumer_auth_service = AuthorizationService(
+            test_session_factory, registry_client, TTLCache(60)
+        )
+        registry_event_consumer(test_event, None, test_deployments_service, consumer_auth_service)
+
+        auth_service.check_service_access(req_ctx, test_org_id)
+        assert registry_client.calls == 2
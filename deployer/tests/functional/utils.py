@@ -184,6 +184,7 @@ def add_daemon(
 def create_common_queue_event(events: list) -> dict:
     return {
         "Records": [
-            {"body": json.dumps({"Message": json.dumps(event_data)})} for event_data in events
+            {"messageId": str(i), "body": json.dumps({"Message": json.dumps(event_data)})}
+            for i, event_data in enumerate(events)
         ]
     }
@@ -0,0 +1,49 @@
+import json
+from unittest.mock import Mock
+
+from deployer.application.handlers.billing_handlers import call_event_batch_consumer
+
+
+def make_record(message_id: str, body) -> dict:
+    return {"messageId": message_id, "body": body}
+
+
+def make_body(event: dict) -> str:
+    return json.dumps({"Message": json.dumps(event)})
+
+
+class TestCallEventBatchConsumer:
+    def test_malformed_record_fails_alone(self):
+        billing_service = Mock()
+        billing_service.process_call_events.return_value = []
+        call_event = {
+            "orgId": "test_org_id",
+            "serviceId": "test_service_id",
+            "duration": 10,
+            "amount": 10,
+            "timestamp": "2025-10-16T18:08:42.782000",
+        }
+        queue_event = {
+            "Records": [
+                make_record("0", make_body(call_event)),
+                make_record("1", "{not json"),
+                make_record("2", json.dumps({"Message": "{not json"})),
+                make_record("3", json.dumps(["not", "an", "object"])),
+                make_record("4", make_body({"orgId": "test_org_id"})),
+                make_record("5", json.dumps({"Message": ""})),
+            ]
+        }
+
+        response = call_event_batch_consumer(queue_event, None, billing_service)
+
+        assert response == {
+            "batchItemFailures": [
+                {"itemIdentifier": "1"},
+                {"itemIdentifier": "2"},
+                {"itemIdentifier": "3"},
+                {"itemIdentifier": "4"},
+            ]
+        }
+        requests = billing_service.process_call_events.call_args.args[0]
+        assert list(requests) == ["0"]
+        assert requests["0"].org_id == "test_org_id"
@@ -0,0 +1,149 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from common.handler_metrics import handler_metrics
+from deployer.infrastructure.clients import http_transport
+from deployer.infrastructure.clients.http_transport import HTTPTransport
+
+
+def make_response(status_code: int) -> Mock:
+    response = Mock(spec=requests.Response)
+    response.status_code = status_code
+    return response
+
+
+@pytest.fixture(scope="function")
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(http_transport.time, "sleep", sleeps.append)
+    return sleeps
+
+
+@pytest.fixture(scope="function")
+def transport():
+    transport = HTTPTransport(connect_timeout=1, read_timeout=2, max_retries=2, retry_backoff=0.5)
+    transport._session = Mock()
+    return transport
+
+
+class TestHTTPTransport:
+    def test_request_ok(self, transport, sleeps):
+        transport._session.request.return_value = make_response(200)
+
+        response = transport.get("https://haas/events", "get_call_events")
+
+        assert response.status_code == 200
+        transport._session.request.assert_called_once_with(
+            "GET", "https://haas/events", timeout=(1, 2)
+        )
+        assert sleeps == []
+
+    def test_request_custom_timeout(self, transport, sleeps):
+        transport._session.request.return_value = make_response(200)
+
+        transport.get("https://haas/events", "get_call_events", timeout=5)
+
+        transport._session.request.assert_called_once_with("GET", "https://haas/events", timeout=5)
+
+    def test_retryable_status_code_retried_with_backoff(self, transport, sleeps):
+        transport._session.request.side_effect = [
+            make_response(503),
+            make_response(429),
+            make_response(200),
+        ]
+
+        response = transport.get("https://haas/events", "get_call_events")
+
+        assert response.status_code == 200
+        assert transport._session.request.call_count == 3
+        assert sleeps == [0.5, 1.0]
+
+    def test_retryable_status_code_returned_after_last_attempt(self, transport, sleeps):
+        transport._session.request.return_value = make_response(502)
+
+        response = transport.delete("https://haas/daemon", "delete_daemon")
+
+        assert response.status_code == 502
+        assert transport._session.request.call_count == 3
+        assert sleeps == [0.5, 1.0]
+
+    def test_not_retryable_status_code_not_retried(self, transport, sleeps):
+        transport._session.request.return_value = make_response(400)
+
+        response = transport.get("https://haas/events", "get_call_events")
+
+        assert response.status_code == 400
+        assert transport._session.request.call_count == 1
+        assert sleeps == []
+
+    def test_timeout_retried(self, transport, sleeps):
+        transport._session.request.side_effect = [requests.Timeout(), make_response(200)]
+
+        response = transport.get("https://haas/events", "get_call_events")
+
+        assert response.status_code == 200
+        assert sleeps == [0.5]
+
+    def test_connection_error_raised_after_last_attempt(self, transport, sleeps):
+        transport._session.request.side_effect = requests.ConnectionError()
+
+        with pytest.raises(requests.ConnectionError):
+            transport.get("https://haas/events", "get_call_events")
+
+        assert transport._session.request.call_count == 3
+        assert sleeps == [0.5, 1.0]
+
+    def test_not_idempotent_request_not_retried(self, transport, sleeps):
+        transport._session.request.side_effect = [requests.Timeout(), make_response(200)]
+
+        with pytest.raises(requests.Timeout):
+            transport.post("https://haas/daemon", "deploy_daemon")
+
+        transport._session.request.return_value = make_response(503)
+        transport._session.request.side_effect = None
+        response = transport.post("https://haas/daemon", "deploy_daemon")
+
+        assert response.status_code == 503
+        assert transport._session.request.call_count == 2
+        assert sleeps == []
+
+    def test_idempotent_post_retried(self, transport, sleeps):
+        transport._session.request.side_effect = [make_response(500), make_response(200)]
+
+        response = transport.post("https://haas/events", "get_call_events", idempotent=True)
+
+        assert response.status_code == 200
+        assert sleeps == [0.5]
+
+    def test_latency_recorded_per_endpoint_in_handler_metrics(self, transport, sleeps, capsys):
+        transport._session.request.side_effect = [
+            make_response(503),
+            make_response(200),
+            make_response(200),
+        ]
+
+        with handler_metrics("get_metrics", namespace="Test"):
+            transport.get("https://haas/events", "get_call_events")
+            transport.get("https://haas/logs", "get_logs")
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        endpoints = {line["Endpoint"]: line for line in lines if "Endpoint" in line}
+        assert endpoints.keys() == {"get_call_events", "get_logs"}
+        assert endpoints["get_call_events"]["EndpointCalls"] == 2
+        assert endpoints["get_logs"]["EndpointCalls"] == 1
+        assert endpoints["get_logs"]["Handler"] == "get_metrics"
+        assert endpoints["get_logs"]["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [
+            ["Handler", "Endpoint"]
+        ]
+
+    def test_latency_logged_outside_of_handler_metrics(self, transport, sleeps):
+        transport._session.request.return_value = make_response(200)
+
+        with patch.object(http_transport.logger, "info") as log_info:
+            transport.get("https://haas/events", "get_call_events")
+
+        log_info.assert_called_once()
+        assert "get_call_events" in log_info.call_args.args[0]
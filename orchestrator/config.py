@@ -36,8 +36,10 @@ SIGNER_ADDRESS = ""
 EXECUTOR_ADDRESS = ""
 ORDER_EXPIRATION_THRESHOLD_IN_MINUTES = 15
 GET_CHANNELS_FOR_GROUP = ""
+GET_CHANNELS_FOR_GROUP_MAX_WORKERS = 8
 GET_GROUP_FOR_ORG_API_ARN = ""
 GET_ALL_ORG_API_ARN = ""
+ORG_NAME_CACHE_TTL_IN_SECONDS = 600
 USD_TO_COGS_CONVERSION_FACTOR = 1
 REGISTRY_ARN = {
     "REGISTER_MEMBER_ARN": "",
@@ -9,14 +9,16 @@ from web3 import Web3
 
 from common.blockchain_util import BlockChainUtil
 from common.boto_utils import BotoUtils
+from common.cache import TTLCache
 from common.constant import TransactionStatus, COGS_TO_AGI
 from common.logger import get_logger
+from common.secret_cache import get_secret_cache
 from common.utils import Utils
 from orchestrator.config import CREATE_ORDER_SERVICE_ARN, INITIATE_PAYMENT_SERVICE_ARN, \
     EXECUTE_PAYMENT_SERVICE_ARN, ORDER_DETAILS_ORDER_ID_ARN, ORDER_DETAILS_BY_USERNAME_ARN, \
     REGION_NAME, SIGNER_ADDRESS, EXECUTOR_ADDRESS, NETWORKS, NETWORK_ID, SIGNER_SERVICE_ARN, \
     GET_GROUP_FOR_ORG_API_ARN, GET_ALL_ORG_API_ARN, USD_TO_COGS_CONVERSION_FACTOR, CREATE_AND_REGISTER_WALLET_ARN, \
-    CHANNEL_ADD_FUNDS_ARN, GET_CHANNEL_TRANSACTIONS_ARN
+    CHANNEL_ADD_FUNDS_ARN, GET_CHANNEL_TRANSACTIONS_ARN, ORG_NAME_CACHE_TTL_IN_SECONDS
 from orchestrator.dao.transaction_history_dao import TransactionHistoryDAO
 from orchestrator.exceptions import PaymentInitiateFailed, ChannelCreationFailed, FundChannelFailed
 from orchestrator.order_status import OrderStatus
@@ -25,6 +27,9 @@ from orchestrator.transaction_history import TransactionHistory
 
 logger = get_logger(__name__)
 
+# org names rarely change, the mapping is shared by all invocations of a warm container
+org_name_cache = TTLCache(ORG_NAME_CACHE_TTL_IN_SECONDS)
+
 
 class Status(Enum):
     SUCCESS = "SUCCESS"
@@ -361,7 +366,7 @@ class OrderService:
                 # 1 block no is mined in 15 sec on average, setting expiration as 10 years
                 expiration = current_block_no + (10 * 365 * 24 * 60 * 4)
                 message_nonce = current_block_no
-                self.EXECUTOR_WALLET_ADDRESS = self.boto_client.get_ssm_parameter(EXECUTOR_ADDRESS)
+                self.EXECUTOR_WALLET_ADDRESS = get_secret_cache(REGION_NAME).get_ssm_parameter(EXECUTOR_ADDRESS)
                 group_id_in_hex = "0x" + base64.b64decode(group_id).hex()
                 signature_details = self.generate_signature_for_open_channel_for_third_party(
                     recipient=recipient, group_id=group_id_in_hex,
@@ -458,10 +463,15 @@ class OrderService:
         if order_details_response["statusCode"] != 200:
             raise Exception(f"Failed to fetch order details for username{username}")
 
-        org_id_name_mapping = self.get_organizations_from_contract()
-
         order_details_response_body = json.loads(order_details_response["body"])
         orders = order_details_response_body["orders"]
+        if not orders:
+            return {"orders": orders}
+
+        org_id_name_mapping = org_name_cache.get_or_set("org_id_name_mapping", self.get_organizations_from_contract)
+        wallet_transactions = self.get_wallet_transactions_for_orders(
+            order_ids=[order["order_id"] for order in orders]
+        )
 
         for order in orders:
             order_id = order["order_id"]
@@ -471,19 +481,7 @@ class OrderService:
                 if org_id in org_id_name_mapping:
                     order["item_details"]["organization_name"] = org_id_name_mapping[org_id]
 
-            transaction_details_event = {
-                "body": json.dumps({"order_id": order_id})
-            }
-            transaction_details_lambda_response = self.lambda_client.invoke(
-                FunctionName=GET_CHANNEL_TRANSACTIONS_ARN,
-                InvocationType='RequestResponse',
-                Payload=json.dumps(transaction_details_event)
-            )
-            transaction_details_response = json.loads(transaction_details_lambda_response.get('Payload').read())
-            if transaction_details_response["statusCode"] != 200:
-                raise Exception(f"Failed to fetch transaction details for username{order_id}")
-            transaction_details_response_body = json.loads(transaction_details_response["body"])
-            order["wallet_transactions"] = transaction_details_response_body["data"]["transactions"]
+            order["wallet_transactions"] = wallet_transactions.get(order_id, [])
             order_status = TransactionStatus.SUCCESS
             for payment in order["payments"]:
                 if payment["payment_status"] != TransactionStatus.SUCCESS:
@@ -498,6 +496,24 @@ class OrderService:
             order["order_status"] = order_status
         return {"orders": orders}
 
+    def get_wallet_transactions_for_orders(self, order_ids):
+        transaction_details_event = {
+            "body": json.dumps({"order_ids": order_ids})
+        }
+        transaction_details_lambda_response = self.lambda_client.invoke(
+            FunctionName=GET_CHANNEL_TRANSACTIONS_ARN,
+            InvocationType='RequestResponse',
+            Payload=json.dumps(transaction_details_event)
+        )
+        transaction_details_response = json.loads(transaction_details_lambda_response.get('Payload').read())
+        if transaction_details_response["statusCode"] != 200:
+            raise Exception(f"Failed to fetch transaction details for orders {order_ids}")
+        transaction_details_response_body = json.loads(transaction_details_response["body"])
+        return {
+            order["order_id"]: order["transactions"]
+            for order in transaction_details_response_body["data"]["orders"]
+        }
+
     def get_organizations_from_contract(self):
         org_details_response = self.boto_client.invoke_lambda(
             lambda_function_arn=GET_ALL_ORG_API_ARN,
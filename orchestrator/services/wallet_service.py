@@ -1,8 +1,10 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+
 from common.boto_utils import BotoUtils
 from common.constant import TransactionStatus
 from common.logger import get_logger
-from orchestrator.config import REGION_NAME, GET_CHANNELS_FOR_GROUP, \
+from orchestrator.config import REGION_NAME, GET_CHANNELS_FOR_GROUP, GET_CHANNELS_FOR_GROUP_MAX_WORKERS, \
     CREATE_CHANNEL_EVENT_ARN, GET_CHANNEL_TRANSACTIONS_ARN, GET_WALLETS_ARN, REGISTER_WALLET_ARN, SET_DEFAULT_WALLET_ARN
 
 logger = get_logger(__name__)
@@ -40,13 +42,13 @@ class WalletService:
                 "group_id": group_id,
                 "wallets": wallet_channel_transactions
             }
+            wallet_channels = self.get_channels_for_wallets(
+                user_addresses=[wallet["address"] for wallet in wallet_response["wallets"]],
+                org_id=org_id,
+                group_id=group_id
+            )
             for wallet in wallet_response["wallets"]:
-                user_address = wallet["address"]
-                wallet["channels"] = self.get_channels_from_contract(
-                    user_address=user_address,
-                    org_id=org_id,
-                    group_id=group_id
-                )
+                wallet["channels"] = wallet_channels[wallet["address"]]
                 for trxn_data in wallet["transactions"]:
                     if trxn_data["status"] in [TransactionStatus.PROCESSING, TransactionStatus.NOT_SUBMITTED]:
                         trxn_data["status"] = TransactionStatus.PENDING
@@ -77,6 +79,43 @@ class WalletService:
         channel_transactions = channel_transactions_response_body["data"]["wallets"]
         return channel_transactions
 
+    def get_channels_for_wallets(self, user_addresses, org_id, group_id):
+        """ Returns channels of every wallet address, with one contract API call when it supports several addresses. """
+        if not user_addresses:
+            return {}
+
+        event = {
+            "queryStringParameters": {
+                "user_addresses": ",".join(user_addresses),
+                "org_id": org_id,
+                "group_id": group_id
+            }
+        }
+        channel_details_response = self.boto_client.invoke_lambda(
+            lambda_function_arn=GET_CHANNELS_FOR_GROUP,
+            invocation_type="RequestResponse",
+            payload=json.dumps(event)
+        )
+        if channel_details_response.get("statusCode") == 200:
+            channel_details = json.loads(channel_details_response["body"])["data"]
+            if "user_addresses" in channel_details:
+                address_channels = {
+                    address_details["user_address"]: address_details["channels"]
+                    for address_details in channel_details["user_addresses"]
+                }
+                return {address: address_channels.get(address, []) for address in user_addresses}
+
+        # older contract API deployments only accept a single user_address
+        logger.info(f"Falling back to per wallet channel requests for {len(user_addresses)} wallets")
+        with ThreadPoolExecutor(max_workers=min(len(user_addresses), GET_CHANNELS_FOR_GROUP_MAX_WORKERS)) as executor:
+            channels = executor.map(
+                lambda user_address: self.get_channels_from_contract(
+                    user_address=user_address, org_id=org_id, group_id=group_id
+                ),
+                user_addresses
+            )
+            return dict(zip(user_addresses, channels))
+
     def get_channels_from_contract(self, user_address, org_id, group_id):
         event = {
             "queryStringParameters": {
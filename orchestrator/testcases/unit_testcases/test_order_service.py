@@ -1,11 +1,12 @@
 import json
 import unittest
+from io import BytesIO
 from unittest.mock import patch
 
 from common.repository import Repository
 from common.utils import validate_dict
 from orchestrator.config import NETWORK_ID, NETWORKS
-from orchestrator.services.order_service import OrderService
+from orchestrator.services.order_service import OrderService, org_name_cache
 
 
 class TestOrderService(unittest.TestCase):
@@ -82,5 +83,35 @@ class TestOrderService(unittest.TestCase):
     def test_get_order_details_by_order_id(self):
         pass
 
-    def test_get_order_details_by_username(self):
-        pass
+    @patch("common.boto_utils.BotoUtils.invoke_lambda")
+    def test_get_order_details_by_username(self, mock_lambda_invoke):
+        org_name_cache.clear()
+        mock_lambda_invoke.side_effect = [
+            {
+                "statusCode": 200,
+                "body": json.dumps({"orders": [
+                    {"order_id": "order_1", "item_details": {"org_id": "snet"},
+                     "payments": [{"payment_status": "SUCCESS"}]},
+                    {"order_id": "order_2", "item_details": {"org_id": "snet"},
+                     "payments": [{"payment_status": "SUCCESS"}]}
+                ]})
+            },
+            {"statusCode": 200, "body": json.dumps({"data": [{"org_id": "snet", "org_name": "SingularityNET"}]})}
+        ]
+        transactions_response = {
+            "statusCode": 200,
+            "body": json.dumps({"status": "success", "data": {"orders": [
+                {"order_id": "order_1", "transactions": [{"status": "PENDING"}]},
+                {"order_id": "order_2", "transactions": []}
+            ]}})
+        }
+        with patch.object(self.order_service, "lambda_client") as mock_lambda_client:
+            mock_lambda_client.invoke.return_value = {"Payload": BytesIO(json.dumps(transactions_response).encode())}
+            orders = self.order_service.get_order_details_by_username("dummy@dummy.io")["orders"]
+
+        mock_lambda_client.invoke.assert_called_once()
+        assert json.loads(json.loads(mock_lambda_client.invoke.call_args.kwargs["Payload"])["body"]) == \
+            {"order_ids": ["order_1", "order_2"]}
+        assert [order["order_status"] for order in orders] == ["PENDING", "SUCCESS"]
+        assert orders[0]["item_details"]["organization_name"] == "SingularityNET"
+        assert orders[1]["wallet_transactions"] == []
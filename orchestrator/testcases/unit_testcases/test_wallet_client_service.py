@@ -8,9 +8,12 @@ from orchestrator.services.wallet_service import WalletService
 
 class TestWalletClientService(unittest.TestCase):
 
+    @patch("common.boto_utils.BotoUtils.invoke_lambda")
     @patch("orchestrator.services.wallet_service.WalletService.get_channel_transactions")
     @patch("orchestrator.services.wallet_service.WalletService.get_channels_from_contract")
-    def test_get_channel_details(self, mock_channels_from_contract, mock_channel_transactions):
+    def test_get_channel_details(self, mock_channels_from_contract, mock_channel_transactions, invoke_lambda_mock):
+        # contract API without support for several addresses
+        invoke_lambda_mock.return_value = {"statusCode": 400, "body": json.dumps({"status": "failed"})}
         mock_channel_transactions.return_value = [
             {
                 "address": "0x123",
@@ -53,6 +56,30 @@ class TestWalletClientService(unittest.TestCase):
         assert validate_dict(channel_details["wallets"][0], ["channels"])
         assert isinstance(channel_details["wallets"][0]["channels"], list)
 
+    @patch("common.boto_utils.BotoUtils.invoke_lambda")
+    def test_get_channels_for_wallets(self, invoke_lambda_mock):
+        invoke_lambda_mock.return_value = {
+            "statusCode": 200,
+            "body": json.dumps(
+                {
+                    "status": "success",
+                    "data": {
+                        "org_id": "dummy",
+                        "group_id": "dummy-group",
+                        "user_addresses": [
+                            {"user_address": "0x123", "channels": [{"channel_id": 117}]},
+                            {"user_address": "0x456", "channels": []}
+                        ]
+                    }
+                }
+            )
+        }
+        wallet_channels = WalletService().get_channels_for_wallets(["0x123", "0x456"], "dummy", "dummy-group")
+        invoke_lambda_mock.assert_called_once()
+        event = json.loads(invoke_lambda_mock.call_args.kwargs["payload"])
+        self.assertEqual(event["queryStringParameters"]["user_addresses"], "0x123,0x456")
+        self.assertEqual(wallet_channels, {"0x123": [{"channel_id": 117}], "0x456": []})
+
     @patch("common.boto_utils.BotoUtils.invoke_lambda")
     def test_get_channel_transactions(self, invoke_lambda_mock):
         invoke_lambda_mock.return_value = {
@@ -5,10 +5,10 @@ from typing import Union
 from urllib.parse import urlparse
 
 import requests
-from web3 import Web3
 
 from common import utils
 from common.boto_utils import BotoUtils
+from common.lazy_import import lazy_import
 from common.logger import get_logger
 from registry.settings import settings
 from registry.constants import (
@@ -56,6 +56,8 @@ from registry.mail_templates import (
 )
 from registry.mail_templates import get_org_member_invite_mail
 
+web3 = lazy_import("web3")
+
 org_repo = OrganizationPublisherRepository()
 
 logger = get_logger(__name__)
@@ -275,7 +277,7 @@ class OrganizationPublisherService:
 
     def register_member(self, username: str, request: RegisterMemberRequest):
         logger.info(f"register user: {username} with invite_code: {request.invite_code}")
-        if Web3.is_address(request.wallet_address):
+        if web3.Web3.is_address(request.wallet_address):
             org_uuid = org_repo.get_org_member(username=username, invite_code=request.invite_code)[
                 0
             ].org_uuid
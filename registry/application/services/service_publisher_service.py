@@ -6,7 +6,6 @@ from typing import Any, Dict, Union
 from urllib.request import urlretrieve
 from uuid import uuid4
 
-from deepdiff import DeepDiff
 from cerberus import Validator
 
 from common import utils
@@ -15,7 +14,7 @@ from common.blockchain_util import BlockChainUtil
 from common.constant import StatusCode
 from common.logger import get_logger
 
-from common.utils import send_email_notification
+from common.utils import get_canonical_json_hash, send_email_notification
 from registry.settings import settings
 
 from registry.constants import (
@@ -587,10 +586,36 @@ class ServicePublisherService:
             )
         return existing_offchain_configs
 
-    def are_blockchain_attributes_got_updated(self, existing_metadata, current_service_metadata):
-        change = DeepDiff(current_service_metadata, existing_metadata)
+    def are_blockchain_attributes_got_updated(
+        self,
+        current_service: Service,
+        existing_metadata_uri: str | None,
+        current_service_metadata: dict,
+    ) -> bool:
+        """
+        Compares canonical JSON hashes of the metadata. The hash of the published metadata is stored
+        with the service, the metadata is fetched from the storage provider only when its URI changed.
+        """
+        if not existing_metadata_uri:
+            return True
+
+        service_repo = ServicePublisherRepository()
+        metadata_hash_uri, existing_metadata_hash = service_repo.get_service_metadata_hash(
+            current_service.org_uuid, current_service.uuid
+        )
+        if metadata_hash_uri != existing_metadata_uri or existing_metadata_hash is None:
+            existing_metadata = self._storage_provider.get(existing_metadata_uri)
+            existing_metadata_hash = get_canonical_json_hash(existing_metadata)
+            service_repo.save_service_metadata_hash(
+                current_service.org_uuid,
+                current_service.uuid,
+                existing_metadata_uri,
+                existing_metadata_hash,
+            )
+
+        change = existing_metadata_hash != get_canonical_json_hash(current_service_metadata)
         logger.info(f"Change in blockchain attributes::{change}")
-        return True if change else False
+        return change
 
     def get_offchain_changes(
         self, current_offchain_config, existing_offchain_config, current_service
@@ -674,13 +699,10 @@ class ServicePublisherService:
         )
         logger.debug(f"Existing service data :: {existing_service_data}")
 
-        existing_metadata = (
-            self._storage_provider.get(existing_service_data["hash_uri"])
-            if existing_service_data
-            else {}
-        )
         publish_to_blockchain = self.are_blockchain_attributes_got_updated(
-            existing_metadata, current_service.to_metadata()
+            current_service,
+            existing_service_data.get("hash_uri") if existing_service_data else None,
+            current_service.to_metadata(),
         )
         logger.debug(f"Publish to blockchain :: {publish_to_blockchain}")
 
@@ -725,12 +747,20 @@ class ServicePublisherService:
         status: Dict[str, str | bool] = {"publish_to_blockchain": publish_to_blockchain}
 
         if publish_to_blockchain:
-            filepath = FileUtils.create_temp_json_file(current_service.to_metadata())
+            service_metadata = current_service.to_metadata()
+            filepath = FileUtils.create_temp_json_file(service_metadata)
             # filename = f"{METADATA_FILE_PATH}/{current_service.uuid}_service_metadata.json"
             status["service_metadata_uri"] = self._storage_provider.publish(
                 filepath, storage_provider
             )
             current_service.metadata_uri = status["service_metadata_uri"]
+            # once the new URI is on the blockchain the next check doesn't need to fetch it
+            ServicePublisherRepository().save_service_metadata_hash(
+                current_service.org_uuid,
+                current_service.uuid,
+                status["service_metadata_uri"],
+                get_canonical_json_hash(service_metadata),
+            )
 
         logger.info("Publish offchain service configs to contract_api")
         self.publish_offchain_service_configs(
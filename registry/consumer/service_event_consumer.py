@@ -111,8 +111,17 @@ class ServiceCreatedEventConsumer(ServiceEventConsumer):
     def on_event(self, event):
         org_id, service_id, transaction_hash = self._get_service_details_from_blockchain(event)
         metadata_uri = self._get_metadata_uri_from_event(event)
+        org_uuid, existing_service = self._get_existing_service_details(org_id, service_id)
+        if self._is_already_published(existing_service, metadata_uri, transaction_hash):
+            logger.info(
+                f"Service {org_id}/{service_id} is already published with metadata {metadata_uri} "
+                f"in transaction {transaction_hash}, skipping the event"
+            )
+            return
         service_data = self._storage_provider.get(metadata_uri)
         self._process_service_data(
+            org_uuid=org_uuid,
+            existing_service=existing_service,
             org_id=org_id,
             service_id=service_id,
             service_metadata=service_data,
@@ -132,8 +141,15 @@ class ServiceCreatedEventConsumer(ServiceEventConsumer):
 
         return org_uuid, existing_service
 
-    def _is_same_transaction(self):
-        pass
+    @staticmethod
+    def _is_already_published(existing_service, metadata_uri, transaction_hash):
+        # metadata URIs are content addressed, the same URI means the same metadata
+        return (
+            existing_service is not None
+            and existing_service.metadata_uri == metadata_uri
+            and existing_service.service_state.transaction_hash == transaction_hash
+            and existing_service.service_state.state == ServiceStatus.PUBLISHED.value
+        )
 
     def _add_validation_attribute_to_endpoint(self, groups):
         for group in groups:
@@ -143,10 +159,15 @@ class ServiceCreatedEventConsumer(ServiceEventConsumer):
             group["endpoints"] = changed_endpoints
 
     def _process_service_data(
-        self, org_id, service_id, service_metadata, transaction_hash, metadata_uri
+        self,
+        org_uuid,
+        existing_service,
+        org_id,
+        service_id,
+        service_metadata,
+        transaction_hash,
+        metadata_uri,
     ):
-        org_uuid, existing_service = self._get_existing_service_details(org_id, service_id)
-
         logger.info(f"org_id: {org_id}, service_id: {service_id}, org_uuid: {org_uuid}")
 
         service_uuid = str(uuid4())
@@ -2,9 +2,8 @@ from typing import Any, List
 from uuid import uuid4
 from dataclasses import dataclass, field
 
-from deepdiff import DeepDiff
-
 from common.exceptions import OperationNotAllowed
+from common.lazy_import import lazy_import
 from common.logger import get_logger
 from common.utils import datetime_to_string
 from registry.constants import (
@@ -16,6 +15,9 @@ from registry.constants import (
 from registry.domain.models.organization_address import OrganizationAddress
 from registry.infrastructure.storage_provider import get_storage_provider_by_uri
 
+# deepdiff is needed only to compare an organization with its update
+deepdiff = lazy_import("deepdiff")
+
 logger = get_logger(__name__)
 
 BLOCKCHAIN_EXCLUDE_PATHS = [
@@ -164,7 +166,7 @@ class Organization:
         )
 
     def is_blockchain_major_change(self, updated_organization):
-        diff = DeepDiff(
+        diff = deepdiff.DeepDiff(
             self,
             updated_organization,
             exclude_types=[OrganizationAddress, OrganizationState],
@@ -175,7 +177,7 @@ class Organization:
         return bool(diff), diff
 
     def is_major_change(self, updated_organization):
-        diff = DeepDiff(
+        diff = deepdiff.DeepDiff(
             self,
             updated_organization,
             exclude_types=[OrganizationState],
@@ -1,12 +1,13 @@
-import web3
-
 from common.blockchain_util import BlockChainUtil
 from common.exceptions import MethodNotImplemented
+from common.lazy_import import lazy_import
 from common.logger import get_logger
 from registry.config import NETWORK_ID, NETWORKS, TOKEN_NAME, STAGE
 from registry.constants import EnvironmentType, REG_CNTRCT_PATH, REG_ADDR_PATH
 from registry.exceptions import OrganizationNotFoundException
 
+web3 = lazy_import("web3")
+
 logger = get_logger(__name__)
 
 
@@ -188,6 +188,9 @@ class Service(Base):
     service_id: Mapped[str | None] = mapped_column("service_id", VARCHAR(128))
     metadata_uri: Mapped[str | None] = mapped_column("metadata_uri", VARCHAR(255))
     storage_provider: Mapped[str | None] = mapped_column("storage_provider", VARCHAR(128))
+    # canonical JSON hash of the metadata stored at metadata_hash_uri
+    metadata_hash: Mapped[str | None] = mapped_column("metadata_hash", VARCHAR(64))
+    metadata_hash_uri: Mapped[str | None] = mapped_column("metadata_hash_uri", VARCHAR(255))
     proto: Mapped[dict] = mapped_column("proto", JSON, nullable=False, default={})
     short_description: Mapped[str] = mapped_column(
         "short_description", VARCHAR(1024), nullable=False, default=""
@@ -274,6 +274,31 @@ class ServicePublisherRepository(BaseRepository):
                     )
                 )
 
+    def get_service_metadata_hash(
+        self, org_uuid: str, service_uuid: str
+    ) -> tuple[str | None, str | None]:
+        result = (
+            self.session.query(Service.metadata_hash_uri, Service.metadata_hash)
+            .filter(Service.org_uuid == org_uuid, Service.uuid == service_uuid)
+            .first()
+        )
+        self.session.commit()
+        if result is None:
+            return None, None
+        return result.metadata_hash_uri, result.metadata_hash
+
+    @BaseRepository.write_ops
+    def save_service_metadata_hash(
+        self, org_uuid: str, service_uuid: str, metadata_uri: str, metadata_hash: str
+    ):
+        self.session.query(Service).filter(
+            Service.org_uuid == org_uuid, Service.uuid == service_uuid
+        ).update(
+            {Service.metadata_hash_uri: metadata_uri, Service.metadata_hash: metadata_hash},
+            synchronize_session=False,
+        )
+        self.session.commit()
+
     @BaseRepository.write_ops
     def delete_service(self, org_uuid: str, service_uuid: str):
         self.session.query(Service).filter(
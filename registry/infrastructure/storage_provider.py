@@ -1,21 +1,26 @@
 import json
 from enum import EnumMeta, Enum
 import os
-import tarfile
 import tempfile
 from typing import List, Tuple, Union
-from zipfile import ZipFile
 
+from common.cache import TTLCache
 from common.exceptions import BadRequestException
 from registry.config import IPFS_URL
 from common.exceptions import LighthouseInternalException, TooLargeFileException
+from common.lazy_import import lazy_import
 from common.logger import get_logger
+from common.utils import get_zip_content_hash, transcode_zip_to_tar_gz
 
 import ipfshttpclient
-from lighthouseweb3 import Lighthouse
+
+lighthouseweb3 = lazy_import("lighthouseweb3")
 
 logger = get_logger(__name__)
 
+# content hash of a published zip archive -> its URI, for every provider type
+published_archive_cache = TTLCache(ttl_in_seconds=24 * 60 * 60, max_size=1000)
+
 
 class MetaEnum(EnumMeta):
     def __contains__(cls, item):
@@ -48,7 +53,7 @@ class StorageProvider:
         if lighthouse_token is None or lighthouse_token == "":
             lighthouse_token = "read_only_token"
         self.__ipfs_util = IPFSUtil(IPFS_URL["url"], IPFS_URL["port"])
-        self.__lighthouse_client = Lighthouse(lighthouse_token)
+        self.__lighthouse_client = lighthouseweb3.Lighthouse(lighthouse_token)
 
     def get(self, metadata_uri: str) -> dict:
         """
@@ -111,11 +116,17 @@ class StorageProvider:
 
         temp_tar_path: str | None = None
         if zip_archive:
+            content_key = (provider_type.value, get_zip_content_hash(source, exclude_files))
+            hash_uri = published_archive_cache.get(content_key)
+            if hash_uri is not None:
+                logger.info(f"Archive content is already published, hash_uri = {hash_uri}")
+                return hash_uri
             try:
                 temp_tar_path = FileUtils.convert_zip_to_temp_tar(source, exclude_files)
                 logger.info(f"temp_tar_path = {temp_tar_path}")
                 hash_uri = self.__upload_to_provider(temp_tar_path, provider_type)
                 logger.info(f"hash_uri = {hash_uri}")
+                published_archive_cache.set(content_key, hash_uri)
                 return hash_uri
             finally:
                 if (
@@ -177,13 +188,16 @@ class IPFSUtil:
 
 
 class FileUtils:
+    DETERMINISTIC_MTIME = 123456781234
+
     @staticmethod
     def convert_zip_to_temp_tar(zip_path: str, exclude_files: List[str] | None = None) -> str:
         """
         Convert a zip archive into a tar file and save it as a temporary file.
+        Zip entries are streamed into the tar one by one, nothing is extracted to disk.
 
         :param zip_path: str, full path to the zip file
-        :param ignored_files: list, files to ignore during tar creation (default is None)
+        :param exclude_files: list, files to ignore during tar creation (default is None)
         :return: str, path to the temporary tar file
         """
 
@@ -196,21 +210,14 @@ class FileUtils:
             tar_path = temp_tar.name
 
         try:
-            # Extract the zip archive to a temporary directory
-            with tempfile.TemporaryDirectory() as temp_dir:
-                logger.debug(f"Extracting zip file: {zip_path}")
-                with ZipFile(zip_path, "r") as zip_obj:
-                    zip_obj.extractall(temp_dir)
-
-                # Create the tar file and write to the temporary tar path
-                with tarfile.open(tar_path, mode="w:gz") as tar:
-                    for file_path in os.scandir(temp_dir):
-                        logger.info(f"Adding file to tar: {file_path}")
-                        tar.add(
-                            file_path.path,
-                            arcname=os.path.basename(file_path),
-                            filter=FileUtils.reset,
-                        )
+            logger.debug(f"Transcoding zip file: {zip_path}")
+            with open(tar_path, "wb") as tar_file:
+                transcode_zip_to_tar_gz(
+                    zip_path,
+                    tar_file,
+                    exclude_files=exclude_files,
+                    mtime=FileUtils.DETERMINISTIC_MTIME,
+                )
 
             return tar_path  # Return the path to the temporary tar file
         except Exception as e:
@@ -219,17 +226,6 @@ class FileUtils:
                 os.remove(tar_path)
             raise e
 
-    @staticmethod
-    def reset(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
-        """
-        Reset metadata of tarinfo to ensure deterministic output.
-
-        :param tarinfo: tarfile.TarInfo, metadata of a file being added to the tar
-        :return: tarfile.TarInfo, updated metadata
-        """
-        tarinfo.mtime = 123456781234
-        return tarinfo
-
     @staticmethod
     def create_temp_json_file(data: dict) -> str:
         with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as temp_file:
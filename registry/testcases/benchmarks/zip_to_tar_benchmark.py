@@ -0,0 +1,85 @@
+"""
+Compares the extract-and-retar conversion of zip archives with the streaming transcoder.
+
+Run from the repository root:
+    python -m registry.testcases.benchmarks.zip_to_tar_benchmark --files 200 --file-size-kb 512
+"""
+
+import argparse
+import os
+import tarfile
+import tempfile
+import time
+import tracemalloc
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from common.utils import transcode_zip_to_tar_gz
+
+
+def create_zip(zip_path: str, files: int, file_size: int) -> None:
+    with ZipFile(zip_path, "w", compression=ZIP_DEFLATED) as zip_obj:
+        for i in range(files):
+            # half random, half repeated text, roughly like generated stubs and demo bundles
+            content = os.urandom(file_size // 2) + b"message Request { string text = 1; }\n" * (
+                file_size // 74
+            )
+            zip_obj.writestr(f"dir_{i % 10}/file_{i}.bin", content)
+
+
+def directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def extract_and_retar(zip_path: str, tar_path: str) -> int:
+    """The previous conversion, returns the peak disk usage in bytes"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with ZipFile(zip_path, "r") as zip_obj:
+            zip_obj.extractall(temp_dir)
+        extracted_size = directory_size(temp_dir)
+        with tarfile.open(tar_path, mode="w:gz") as tar:
+            for file_path in os.scandir(temp_dir):
+                tar.add(file_path.path, arcname=os.path.basename(file_path))
+    return extracted_size + os.path.getsize(tar_path)
+
+
+def stream_transcode(zip_path: str, tar_path: str) -> int:
+    with open(tar_path, "wb") as tar_file:
+        transcode_zip_to_tar_gz(zip_path, tar_file)
+    return os.path.getsize(tar_path)
+
+
+def measure(name: str, convert, zip_path: str, work_dir: str) -> None:
+    tar_path = os.path.join(work_dir, f"{name}.tar.gz")
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    peak_disk = convert(zip_path, tar_path)
+    wall_time = time.perf_counter() - started_at
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    os.remove(tar_path)
+    print(
+        f"{name:<20} wall time {wall_time:8.3f} s   peak python memory {peak_memory / 2**20:8.2f} MiB   "
+        f"peak temp disk {peak_disk / 2**20:8.2f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--file-size-kb", type=int, default=512)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        zip_path = os.path.join(work_dir, "archive.zip")
+        create_zip(zip_path, args.files, args.file_size_kb * 1024)
+        print(f"zip archive: {args.files} files, {os.path.getsize(zip_path) / 2**20:.2f} MiB")
+        measure("extract_and_retar", extract_and_retar, zip_path, work_dir)
+        measure("stream_transcode", stream_transcode, zip_path, work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import tarfile
+import tempfile
+from unittest import TestCase
+from zipfile import ZipFile
+
+from common.utils import get_zip_content_hash
+from registry.infrastructure.storage_provider import FileUtils
+
+
+class TestFileUtils(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.zip_path = os.path.join(self.temp_dir.name, "proto.zip")
+        with ZipFile(self.zip_path, "w") as zip_obj:
+            zip_obj.writestr("service.proto", 'syntax = "proto3";')
+            zip_obj.writestr("nested/", "")
+            zip_obj.writestr("nested/types.proto", "message Empty {}")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_convert_zip_to_temp_tar(self):
+        tar_path = FileUtils.convert_zip_to_temp_tar(self.zip_path)
+        try:
+            with tarfile.open(tar_path, "r:gz") as tar:
+                members = {member.name: member for member in tar.getmembers()}
+                self.assertEqual(set(members), {"service.proto", "nested", "nested/types.proto"})
+                self.assertTrue(members["nested"].isdir())
+                self.assertEqual(members["service.proto"].mtime, FileUtils.DETERMINISTIC_MTIME)
+                self.assertEqual(tar.extractfile("nested/types.proto").read(), b"message Empty {}")
+        finally:
+            os.remove(tar_path)
+
+    def test_zip_content_hash_ignores_compression(self):
+        stored_zip_path = os.path.join(self.temp_dir.name, "stored.zip")
+        with ZipFile(self.zip_path, "r") as source, ZipFile(stored_zip_path, "w") as target:
+            for info in source.infolist():
+                target.writestr(info.filename, source.read(info), compress_type=8)
+
+        self.assertEqual(get_zip_content_hash(self.zip_path), get_zip_content_hash(stored_zip_path))
+        self.assertNotEqual(
+            get_zip_content_hash(self.zip_path),
+            get_zip_content_hash(self.zip_path, exclude_files=["types.proto"]),
+        )
@@ -0,0 +1,82 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from registry.constants import ServiceStatus
+from registry.consumer.service_event_consumer import ServiceCreatedEventConsumer
+
+
+class TestReplayedServiceCreatedEvent(TestCase):
+    metadata_uri = "ipfs://QmYVYBxjCxLWYYnz6bK5kHYVW8JBfFLwn4MGzEpMiF7LZ1"
+    transaction_hash = "0x7b1fd2c5e3fa0b8d9a4c6e2f1d3b5a7c9e0f2d4b6a8c0e1f3d5b7a9c1e3f5d7b"
+
+    def setUp(self):
+        with (
+            patch("registry.consumer.service_event_consumer.blockchain_util.BlockChainUtil"),
+            patch("registry.consumer.service_event_consumer.StorageProvider"),
+        ):
+            self.consumer = ServiceCreatedEventConsumer(
+                ws_provider="wss://ws.provider",
+                service_repository=Mock(),
+                organization_repository=Mock(),
+            )
+        self.storage_provider = self.consumer._storage_provider
+        self.event = {
+            "data": {
+                "json_str": str(
+                    {
+                        "orgId": b"test_org_id".ljust(32, b"\x00"),
+                        "serviceId": b"test_service_id".ljust(32, b"\x00"),
+                        "metadataURI": self.metadata_uri.encode(),
+                    }
+                ),
+                "transaction_hash": self.transaction_hash,
+            }
+        }
+
+    def on_event(self, existing_service):
+        with (
+            patch.object(
+                self.consumer,
+                "_get_existing_service_details",
+                return_value=("test_org_uuid", existing_service),
+            ),
+            patch.object(self.consumer, "_process_service_data") as process_service_data,
+        ):
+            self.consumer.on_event(self.event)
+        return process_service_data
+
+    def get_existing_service(
+        self, transaction_hash=transaction_hash, state=ServiceStatus.PUBLISHED
+    ):
+        return Mock(
+            metadata_uri=self.metadata_uri,
+            service_state=Mock(transaction_hash=transaction_hash, state=state.value),
+        )
+
+    def test_replayed_event_is_skipped(self):
+        process_service_data = self.on_event(self.get_existing_service())
+
+        process_service_data.assert_not_called()
+        self.storage_provider.get.assert_not_called()
+
+    def test_event_of_another_transaction_is_processed(self):
+        process_service_data = self.on_event(self.get_existing_service(transaction_hash="0x1"))
+
+        self.storage_provider.get.assert_called_once_with(self.metadata_uri)
+        process_service_data.assert_called_once()
+        self.assertEqual(
+            process_service_data.call_args.kwargs["transaction_hash"], self.transaction_hash
+        )
+
+    def test_unpublished_service_is_processed(self):
+        process_service_data = self.on_event(
+            self.get_existing_service(state=ServiceStatus.APPROVED)
+        )
+
+        process_service_data.assert_called_once()
+
+    def test_new_service_is_processed(self):
+        process_service_data = self.on_event(None)
+
+        process_service_data.assert_called_once()
+        self.assertIsNone(process_service_data.call_args.kwargs["existing_service"])
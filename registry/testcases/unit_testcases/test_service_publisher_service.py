@@ -0,0 +1,61 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from common.utils import get_canonical_json_hash
+from registry.application.services.service_publisher_service import ServicePublisherService
+
+
+@patch("registry.application.services.service_publisher_service.ServicePublisherRepository")
+class TestBlockchainAttributesChange(TestCase):
+    metadata_uri = "ipfs://QmYVYBxjCxLWYYnz6bK5kHYVW8JBfFLwn4MGzEpMiF7LZ1"
+
+    def setUp(self):
+        with patch("registry.application.services.service_publisher_service.StorageProvider"):
+            self.service_publisher_service = ServicePublisherService()
+        self.storage_provider = self.service_publisher_service._storage_provider
+        self.service = Mock(org_uuid="test_org_uuid", uuid="test_service_uuid")
+        self.metadata = {"version": 1, "display_name": "test_service", "groups": []}
+
+    def test_stored_hash_matches(self, service_repository):
+        service_repository.return_value.get_service_metadata_hash.return_value = (
+            self.metadata_uri,
+            get_canonical_json_hash({"groups": [], "display_name": "test_service", "version": 1}),
+        )
+
+        change = self.service_publisher_service.are_blockchain_attributes_got_updated(
+            self.service, self.metadata_uri, self.metadata
+        )
+
+        self.assertFalse(change)
+        self.storage_provider.get.assert_not_called()
+        service_repository.return_value.save_service_metadata_hash.assert_not_called()
+
+    def test_metadata_uri_changed(self, service_repository):
+        service_repository.return_value.get_service_metadata_hash.return_value = (
+            "ipfs://previous_metadata_uri",
+            get_canonical_json_hash(self.metadata),
+        )
+        published_metadata = {**self.metadata, "display_name": "published_service"}
+        self.storage_provider.get.return_value = published_metadata
+
+        change = self.service_publisher_service.are_blockchain_attributes_got_updated(
+            self.service, self.metadata_uri, self.metadata
+        )
+
+        self.assertTrue(change)
+        self.storage_provider.get.assert_called_once_with(self.metadata_uri)
+        service_repository.return_value.save_service_metadata_hash.assert_called_once_with(
+            "test_org_uuid",
+            "test_service_uuid",
+            self.metadata_uri,
+            get_canonical_json_hash(published_metadata),
+        )
+
+    def test_no_existing_metadata_uri(self, service_repository):
+        change = self.service_publisher_service.are_blockchain_attributes_got_updated(
+            self.service, None, self.metadata
+        )
+
+        self.assertTrue(change)
+        self.storage_provider.get.assert_not_called()
+        service_repository.return_value.get_service_metadata_hash.assert_not_called()
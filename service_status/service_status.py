@@ -2,12 +2,12 @@ import json
 import re
 import datetime as dt
 from datetime import timedelta
-from opensearchpy import OpenSearch
 import grpc
 from grpc_health.v1 import health_pb2 as heartb_pb2
 from grpc_health.v1 import health_pb2_grpc as heartb_pb2_grpc
 
 from common.boto_utils import BotoUtils
+from common.lazy_import import lazy_import
 from common.logger import get_logger
 from common.utils import Utils
 from resources.certificates.root_certificate import certificate
@@ -15,6 +15,9 @@ from service_status.config import REGION_NAME, NOTIFICATION_ARN, NETWORKS, NETWO
     MAXIMUM_INTERVAL_IN_HOUR, MINIMUM_INTERVAL_IN_HOUR, NETWORK_NAME, BASE_URL_TO_RESET_SERVICE_HEALTH
 from service_status.constant import SRVC_STATUS_GRPC_TIMEOUT, LIMIT
 
+# opensearchpy is needed only when a failed health check is logged
+opensearchpy = lazy_import("opensearchpy")
+
 logger = get_logger(__name__)
 boto_util = BotoUtils(region_name=REGION_NAME)
 util = Utils()
@@ -79,7 +82,7 @@ class ServiceStatus:
         return response
 
     def _send_logs_to_opensearch(self, service_id, debug_error_string, org_id, endpoint):
-        client = OpenSearch(
+        client = opensearchpy.OpenSearch(
             http_compress = True,
             hosts = [{'host': HOST, 'port': 443}],
             http_auth = AUTH,
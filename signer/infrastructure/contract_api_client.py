@@ -1,8 +1,7 @@
 import json
 from typing import Tuple
 
-import boto3
-
+from common.boto_utils import get_boto_client
 from common.logger import get_logger
 from signer.settings import settings
 
@@ -16,8 +15,9 @@ class ContractAPIClientError(Exception):
 
 
 class ContractAPIClient:
-    def __init__(self):
-        self.lambda_client = boto3.client("lambda", region_name=settings.aws.region_name)
+    @property
+    def lambda_client(self):
+        return get_boto_client("lambda", region_name=settings.aws.region_name)
 
     def get_daemon_endpoint_and_free_call_for_group(
         self, org_id: str, service_id: str, group_id: str
@@ -1,9 +1,13 @@
 from urllib.parse import urlparse
 
-import grpc
+from common.lazy_import import lazy_import
 from common.logger import get_logger
 from resources.certificates.root_certificate import certificate
-from signer.stubs import state_service_pb2, state_service_pb2_grpc
+
+# grpc and the generated stubs are loaded by the first daemon call
+grpc = lazy_import("grpc")
+state_service_pb2 = lazy_import("signer.stubs.state_service_pb2")
+state_service_pb2_grpc = lazy_import("signer.stubs.state_service_pb2_grpc")
 
 logger = get_logger(__name__)
 
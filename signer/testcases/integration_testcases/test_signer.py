@@ -2,12 +2,15 @@ import json
 import unittest
 from unittest.mock import patch
 
+from common.boto_utils import clear_boto_clients
 from signer.application import handlers
 
 
 class TestSignUPAPI(unittest.TestCase):
     def setUp(self):
-        pass
+        # the tests patch boto3.client, clients cached by other tests would bypass the mock
+        clear_boto_clients()
+        self.addCleanup(clear_boto_clients)
 
     @patch("common.blockchain_util.BlockChainUtil.get_current_block_no")
     @patch("common.blockchain_util.BlockChainUtil.read_contract_address")
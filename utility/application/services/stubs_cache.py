@@ -0,0 +1,143 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import uuid
+from importlib.metadata import PackageNotFoundError, version
+
+from common.boto_utils import BotoUtils
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# uploaded last, so an entry interrupted in the middle of an upload is never restored
+S3_ENTRY_COMPLETE_MARKER = ".complete"
+
+
+def get_toolchain_version(*packages: str) -> str:
+    versions = []
+    for package in packages:
+        try:
+            versions.append(f"{package}=={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}==unknown")
+    return ";".join(versions)
+
+
+class ProtoStubsCache:
+    """
+    Content-addressed cache of compiled stubs. Entries are keyed by the hash of the proto files and
+    the compiler version, kept in a local directory of the warm container and, when s3_url is set,
+    under an S3 prefix shared by all containers.
+    """
+
+    def __init__(
+        self, boto_utils: BotoUtils, local_dir: str, s3_url: str = "", max_local_entries: int = 50
+    ):
+        self._boto_utils = boto_utils
+        self._local_dir = local_dir
+        self._s3_url = s3_url
+        self._max_local_entries = max_local_entries
+
+    @staticmethod
+    def compute_key(proto_dir: str, toolchain_version: str) -> str:
+        """Hash of the relative paths and contents of all proto files, sorted by path, and the toolchain version"""
+        proto_paths = sorted(
+            os.path.relpath(os.path.join(subdir, file), proto_dir).replace(os.sep, "/")
+            for subdir, _, files in os.walk(proto_dir)
+            for file in files
+            if file.endswith(".proto")
+        )
+        digest = hashlib.sha256(toolchain_version.encode("utf-8"))
+        for proto_path in proto_paths:
+            with open(os.path.join(proto_dir, proto_path), "rb") as proto_file:
+                content = proto_file.read()
+            digest.update(f"\0{proto_path}\0{len(content)}\0".encode("utf-8"))
+            digest.update(content)
+        return digest.hexdigest()
+
+    def restore(self, key: str, target_dir: str) -> bool:
+        """Copies cached stubs into target_dir, returns False on a cache miss"""
+        entry_dir = os.path.join(self._local_dir, key)
+        if not os.path.isdir(entry_dir) and not self._download_entry(key, entry_dir):
+            return False
+        shutil.copytree(entry_dir, target_dir, dirs_exist_ok=True)
+        # the least recently used entries are evicted first
+        os.utime(entry_dir)
+        logger.info(f"Stubs restored from cache: {key}")
+        return True
+
+    def store(self, key: str, source_dir: str) -> None:
+        entry_dir = os.path.join(self._local_dir, key)
+        self._copy_into_local(source_dir, entry_dir)
+        if self._s3_url:
+            bucket, prefix = self._get_s3_entry_location(key)
+            try:
+                for subdir, _, files in os.walk(entry_dir):
+                    for file in files:
+                        file_path = os.path.join(subdir, file)
+                        relative_path = os.path.relpath(file_path, entry_dir).replace(os.sep, "/")
+                        self._boto_utils.s3_upload_file(
+                            filename=file_path, bucket=bucket, key=f"{prefix}/{relative_path}"
+                        )
+                self._boto_utils.s3_upload_fileobj(
+                    fileobj=io.BytesIO(), bucket=bucket, key=f"{prefix}/{S3_ENTRY_COMPLETE_MARKER}"
+                )
+            except Exception as e:
+                # the stubs are already compiled, the next miss will just compile them again
+                logger.warning(f"Failed to store stubs {key} in S3 cache: {repr(e)}")
+        self._evict_local_entries()
+
+    def _get_s3_entry_location(self, key: str):
+        bucket, prefix = self._boto_utils.get_bucket_and_key_from_url(self._s3_url)
+        return bucket, f"{prefix.rstrip('/')}/{key}" if prefix else key
+
+    def _download_entry(self, key: str, entry_dir: str) -> bool:
+        if not self._s3_url:
+            return False
+        bucket, prefix = self._get_s3_entry_location(key)
+        objects = self._boto_utils.get_objects_from_s3(bucket=bucket, key=prefix + "/")
+        marker_key = f"{prefix}/{S3_ENTRY_COMPLETE_MARKER}"
+        if not any(obj["Key"] == marker_key for obj in objects):
+            return False
+
+        os.makedirs(self._local_dir, exist_ok=True)
+        download_dir = tempfile.mkdtemp(prefix=".", dir=self._local_dir)
+        for obj in objects:
+            if obj["Key"] == marker_key:
+                continue
+            relative_path = obj["Key"][len(prefix) + 1 :]
+            target_path = os.path.join(download_dir, *relative_path.split("/"))
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            self._boto_utils.s3_download_file(bucket=bucket, key=obj["Key"], filename=target_path)
+        self._move_into_local(download_dir, entry_dir)
+        return True
+
+    def _copy_into_local(self, source_dir: str, entry_dir: str) -> None:
+        os.makedirs(self._local_dir, exist_ok=True)
+        staging_dir = os.path.join(self._local_dir, f".{uuid.uuid4().hex}")
+        shutil.copytree(source_dir, staging_dir)
+        self._move_into_local(staging_dir, entry_dir)
+
+    @staticmethod
+    def _move_into_local(staging_dir: str, entry_dir: str) -> None:
+        # rename makes the entry visible only when it is complete
+        try:
+            os.rename(staging_dir, entry_dir)
+            os.utime(entry_dir)
+        except OSError:
+            # the same entry was stored meanwhile
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _evict_local_entries(self) -> None:
+        entries = [
+            entry
+            for entry in os.scandir(self._local_dir)
+            if entry.is_dir() and not entry.name.startswith(".")
+        ]
+        if len(entries) <= self._max_local_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self._max_local_entries]:
+            shutil.rmtree(entry.path, ignore_errors=True)
@@ -1,8 +1,10 @@
 import json
 import os
 import tempfile
+import time
 import uuid
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from importlib.resources import files
 
@@ -13,13 +15,22 @@ from common.boto_utils import BotoUtils
 from common.logger import get_logger
 from common.utils import create_text_file
 from utility.application.schemas import StubsGenerationRequest
+from utility.application.services.stubs_cache import ProtoStubsCache, get_toolchain_version
 from utility.settings import settings
 from utility.constants import PYTHON_BOILERPLATE_TEMPLATE
-from utility.exceptions import ProtoNotFound
+from utility.exceptions import ProtoNotFound, StubsCompilationFailed
 
 TEMP_FILE_DIR = tempfile.gettempdir()
 boto_utils = BotoUtils(region_name=settings.aws.REGION_NAME)
 logger = get_logger(__name__)
+stubs_cache = ProtoStubsCache(
+    boto_utils=boto_utils,
+    local_dir=settings.compile_proto.STUBS_CACHE.LOCAL_DIRECTORY
+    or os.path.join(TEMP_FILE_DIR, "python-stubs-cache"),
+    s3_url=settings.compile_proto.STUBS_CACHE.S3_URL,
+    max_local_entries=settings.compile_proto.STUBS_CACHE.MAX_LOCAL_ENTRIES,
+)
+PYTHON_TOOLCHAIN_VERSION = get_toolchain_version("grpcio-tools", "protobuf")
 
 
 class StubsGeneratorService:
@@ -77,47 +88,86 @@ class StubsGeneratorService:
                 "service_id": service_id,
             }
         )
-        response = {}
+        compilation = self._compile_stubs_for_environments(lambda_payload)
+        errors = {
+            environment: result["error"]
+            for environment, result in compilation.items()
+            if result["status"] == "FAILED"
+        }
+        if errors:
+            raise StubsCompilationFailed(input_s3_path=input_s3_path, errors=errors)
+
+        # Move objects from temp folder to output if success
+        # if no output path only remove temp extracted proto
+        if output_s3_path:
+            moves = [
+                {
+                    "source_bucket": input_bucket_name,
+                    "source_key": temp_proto_file_path,
+                    "target_bucket": output_bucket_name,
+                    "target_key": f"{input_s3_file_key}proto_extracted/",
+                    "clear_destination": True,
+                },
+                {
+                    "source_bucket": input_bucket_name,
+                    "source_key": boto_utils.get_bucket_and_key_from_url(temp_output_path)[1],
+                    "target_bucket": output_bucket_name,
+                    "target_key": f"{output_file_path}stubs/",
+                    "clear_destination": True,
+                },
+            ]
+            with ThreadPoolExecutor(max_workers=len(moves)) as executor:
+                futures = [executor.submit(boto_utils.move_s3_objects, **move) for move in moves]
+                # result() re-raises the failure of any move
+                for future in futures:
+                    future.result()
+        else:
+            BotoUtils.clear_s3_files(bucket=input_bucket_name, key=temp_proto_file_path)
+        return {"compilation": compilation}
+
+    @staticmethod
+    def _compile_stubs_for_environments(lambda_payload: str) -> dict:
+        """
+        Invokes the compile lambdas of all supported environments concurrently and
+        returns the status of every environment, failures don't stop the other compilations
+        """
+        lambda_arns = {}
         for environment in settings.compile_proto.SUPPORTED_ENVIRONMENT:
             if environment in "python":
-                response = boto_utils.invoke_lambda(
-                    invocation_type="RequestResponse",
-                    payload=lambda_payload,
-                    lambda_function_arn=settings.compile_proto.ARN.PYTHON_PROTO_LAMBDA_ARN,
-                )
+                lambda_arns[environment] = settings.compile_proto.ARN.PYTHON_PROTO_LAMBDA_ARN
             elif environment in "nodejs":
+                lambda_arns[environment] = settings.compile_proto.ARN.NODEJS_PROTO_LAMBDA_ARN
+        if not lambda_arns:
+            return {}
+
+        def compile_stubs(lambda_function_arn):
+            started_at = time.monotonic()
+            try:
                 response = boto_utils.invoke_lambda(
                     invocation_type="RequestResponse",
                     payload=lambda_payload,
-                    lambda_function_arn=settings.compile_proto.ARN.NODEJS_PROTO_LAMBDA_ARN,
+                    lambda_function_arn=lambda_function_arn,
                 )
-            if response.get("statusCode", {}) != 200:
-                raise Exception(
-                    f"Invalid proto file found on given path :: {input_s3_path} :: response :: {response}"
-                )
-
-        logger.info(f"Getting response from proto compilation lambda :: {response}")
+                error = None if response.get("statusCode", {}) == 200 else response
+            except Exception as e:
+                response, error = None, repr(e)
+            latency = round(time.monotonic() - started_at, 3)
+            if error is not None:
+                return {"status": "FAILED", "error": error, "latency_in_seconds": latency}
+            return {
+                "status": "SUCCEEDED",
+                "data": response.get("data"),
+                "latency_in_seconds": latency,
+            }
 
-        # Move objects from temp folder to output if success
-        # if no output path only remove temp extracted proto
-        if output_s3_path:
-            boto_utils.move_s3_objects(
-                source_bucket=input_bucket_name,
-                source_key=temp_proto_file_path,
-                target_bucket=output_bucket_name,
-                target_key=f"{input_s3_file_key}proto_extracted/",
-                clear_destination=True,
-            )
-            boto_utils.move_s3_objects(
-                source_bucket=input_bucket_name,
-                source_key=boto_utils.get_bucket_and_key_from_url(temp_output_path)[1],
-                target_bucket=output_bucket_name,
-                target_key=f"{output_file_path}stubs/",
-                clear_destination=True,
-            )
-        else:
-            BotoUtils.clear_s3_files(bucket=input_bucket_name, key=temp_proto_file_path)
-        return {}
+        with ThreadPoolExecutor(max_workers=len(lambda_arns)) as executor:
+            futures = {
+                environment: executor.submit(compile_stubs, lambda_function_arn)
+                for environment, lambda_function_arn in lambda_arns.items()
+            }
+            compilation = {environment: future.result() for environment, future in futures.items()}
+        logger.info(f"Getting response from proto compilation lambdas :: {compilation}")
+        return compilation
 
     def generate_python_stubs(self, request: StubsGenerationRequest):
         input_s3_path = request.input_s3_path
@@ -132,23 +182,31 @@ class StubsGeneratorService:
         boto_utils.download_folder_contents_from_s3(
             bucket=input_bucket, key=input_key, target=tmp_paths["proto"]
         )
-        proto_location = None
-        proto_names = []
-        training_indicator = False
+        proto_files = []
         for subdir, _, files in os.walk(tmp_paths["proto"]):
             for file in files:
                 filepath = subdir + os.sep + file
                 if filepath.endswith(".proto"):
-                    proto_names.append(os.path.basename(filepath))
-                    proto_location = filepath
-                    self._compile_proto(
-                        entry_path=subdir,
-                        codegen_dir=os.path.join(tmp_paths["stubs"]),
-                        proto_file_path=proto_location,
-                    )
-                    training_indicator = self._find_training_indicator(proto_path=proto_location)
-        if proto_location is None:
+                    proto_files.append((subdir, filepath))
+        if not proto_files:
             raise ProtoNotFound
+        training_indicator = self._find_training_indicator(proto_path=proto_files[-1][1])
+
+        cache_key = stubs_cache.compute_key(tmp_paths["proto"], PYTHON_TOOLCHAIN_VERSION)
+        if not stubs_cache.restore(cache_key, tmp_paths["stubs"]):
+            protos_by_directory = {}
+            for subdir, proto_location in proto_files:
+                protos_by_directory.setdefault(subdir, []).append(proto_location)
+            compiled = True
+            for subdir, proto_locations in protos_by_directory.items():
+                success = self._compile_protos(
+                    entry_path=subdir,
+                    codegen_dir=os.path.join(tmp_paths["stubs"]),
+                    proto_file_paths=proto_locations,
+                )
+                compiled = compiled and success
+            if compiled:
+                stubs_cache.store(cache_key, tmp_paths["stubs"])
 
         self._prepare_readme_file(
             target_path=os.path.join(tmp_paths["base"], "readme.txt"), service_id=service_id
@@ -207,7 +265,7 @@ class StubsGeneratorService:
         return temporary_paths
 
     @staticmethod
-    def _compile_proto(entry_path, codegen_dir, proto_file_path):
+    def _compile_proto(entry_path, codegen_dir, *proto_file_paths):
         proto_include = str(files("grpc_tools").joinpath("_proto"))
         compiler_args = ["-I{}".format(entry_path), "-I{}".format(proto_include)]
         if not os.path.exists(codegen_dir):
@@ -216,9 +274,25 @@ class StubsGeneratorService:
         compiler_args.append("--python_out={}".format(codegen_dir))
         compiler_args.append("--grpc_python_out={}".format(codegen_dir))
         compiler = protoc
-        compiler_args.append(str(proto_file_path))
+        compiler_args.extend(str(proto_file_path) for proto_file_path in proto_file_paths)
         return (True, codegen_dir) if not compiler(compiler_args) else (False, None)
 
+    def _compile_protos(self, entry_path, codegen_dir, proto_file_paths) -> bool:
+        """
+        Compiles all protos of the directory with one protoc run. protoc writes nothing if any
+        of them is invalid, so then every proto is compiled on its own to keep the valid stubs.
+        """
+        if len(proto_file_paths) > 1:
+            success, _ = self._compile_proto(entry_path, codegen_dir, *proto_file_paths)
+            if success:
+                return True
+            logger.info(f"Batch compilation failed, compiling protos one by one :: {entry_path}")
+        results = [
+            self._compile_proto(entry_path, codegen_dir, proto_file_path)[0]
+            for proto_file_path in proto_file_paths
+        ]
+        return all(results)
+
     @staticmethod
     def _prepare_readme_file(target_path, service_id):
         context = (
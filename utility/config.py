@@ -38,4 +38,5 @@ SUPPORTED_ENVIRONMENT = []
 PROTO_DIRECTORY_REGEX_PATTERN = ""
 NODEJS_PROTO_LAMBDA_ARN = ""
 PYTHON_PROTO_LAMBDA_ARN = ""
+STUBS_CACHE = {"S3_URL": "", "LOCAL_DIRECTORY": "", "MAX_LOCAL_ENTRIES": 50}
 NETWORK_NAME = ""
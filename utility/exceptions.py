@@ -26,6 +26,14 @@ class MissingUploadTypeDetailsParams(BadRequestException):
         super().__init__(message="Missing required parameters: org_uuid and/or service_uuid")
 
 
+class StubsCompilationFailed(Exception):
+    def __init__(self, input_s3_path: str, errors: dict):
+        self.errors = errors
+        super().__init__(
+            f"Invalid proto file found on given path :: {input_s3_path} :: errors :: {errors}"
+        )
+
+
 EXCEPTIONS = (
     BadRequestException,
     InvalidContentType,
@@ -42,10 +42,17 @@ class LambdaARNConfig(BaseModel):
     PYTHON_PROTO_LAMBDA_ARN: dict = Field(default=config.PYTHON_PROTO_LAMBDA_ARN)
 
 
+class StubsCacheConfig(BaseModel):
+    S3_URL: str = Field(default=config.STUBS_CACHE["S3_URL"])
+    LOCAL_DIRECTORY: str = Field(default=config.STUBS_CACHE["LOCAL_DIRECTORY"])
+    MAX_LOCAL_ENTRIES: int = Field(default=config.STUBS_CACHE["MAX_LOCAL_ENTRIES"])
+
+
 class CompileProtoConfig(BaseModel):
     PROTO_DIRECTORY_REGEX_PATTERN: str = Field(default=config.PROTO_DIRECTORY_REGEX_PATTERN)
     SUPPORTED_ENVIRONMENT: list[str] = Field(default=config.SUPPORTED_ENVIRONMENT)
     ARN: LambdaARNConfig = Field(default_factory=LambdaARNConfig)
+    STUBS_CACHE: StubsCacheConfig = Field(default_factory=StubsCacheConfig)
 
 
 class Settings(BaseSettings):
@@ -0,0 +1,120 @@
+"""
+Measures python stub generation latency on cache misses and hits for a corpus of repeated proto uploads.
+
+Misses run the real protoc, so the grpc_tools package (grpcio-tools in the utility dependencies)
+has to be installed. S3 is not used, the cache is local only.
+
+Run from the repository root:
+    python -m utility.testcases.benchmarks.stubs_cache_benchmark --services 20 --uploads-per-service 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from common.boto_utils import BotoUtils
+from utility.application.services.stubs_cache import ProtoStubsCache, get_toolchain_version
+from utility.application.services.stubs_generator_service import StubsGeneratorService
+
+PROTO_TEMPLATE = """syntax = "proto3";
+
+package service_{index};
+
+message Request_{index} {{
+{request_fields}
+}}
+
+message Response_{index} {{
+    string result = 1;
+}}
+
+service Service_{index} {{
+{methods}
+}}
+"""
+
+
+def create_proto_corpus(corpus_dir: str, services: int, methods: int) -> list:
+    proto_dirs = []
+    for index in range(services):
+        proto_dir = os.path.join(corpus_dir, f"service_{index}")
+        os.makedirs(proto_dir)
+        request_fields = "\n".join(
+            f"    string field_{field} = {field + 1};" for field in range(20)
+        )
+        rpc_methods = "\n".join(
+            f"    rpc method_{method}(Request_{index}) returns (Response_{index}) {{}}"
+            for method in range(methods)
+        )
+        with open(os.path.join(proto_dir, "service.proto"), "w") as proto_file:
+            proto_file.write(
+                PROTO_TEMPLATE.format(
+                    index=index, request_fields=request_fields, methods=rpc_methods
+                )
+            )
+        proto_dirs.append(proto_dir)
+    return proto_dirs
+
+
+def generate_stubs(
+    stubs_cache: ProtoStubsCache, toolchain_version: str, proto_dir: str, stubs_dir: str
+):
+    """The compile part of StubsGeneratorService.generate_python_stubs, returns True on a cache hit"""
+    cache_key = stubs_cache.compute_key(proto_dir, toolchain_version)
+    if stubs_cache.restore(cache_key, stubs_dir):
+        return True
+    for subdir, _, files in os.walk(proto_dir):
+        proto_file_paths = [os.path.join(subdir, file) for file in files if file.endswith(".proto")]
+        if proto_file_paths:
+            StubsGeneratorService()._compile_protos(
+                entry_path=subdir, codegen_dir=stubs_dir, proto_file_paths=proto_file_paths
+            )
+    stubs_cache.store(cache_key, stubs_dir)
+    return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--services", type=int, default=20)
+    parser.add_argument("--uploads-per-service", type=int, default=5)
+    parser.add_argument("--methods", type=int, default=30)
+    args = parser.parse_args()
+
+    toolchain_version = get_toolchain_version("grpcio-tools", "protobuf")
+    with tempfile.TemporaryDirectory() as work_dir:
+        proto_dirs = create_proto_corpus(
+            os.path.join(work_dir, "corpus"), args.services, args.methods
+        )
+        uploads = proto_dirs * args.uploads_per_service
+        random.Random(0).shuffle(uploads)
+        stubs_cache = ProtoStubsCache(
+            boto_utils=BotoUtils(region_name=None), local_dir=os.path.join(work_dir, "cache")
+        )
+
+        latencies = {True: [], False: []}
+        for upload_index, proto_dir in enumerate(uploads):
+            stubs_dir = os.path.join(work_dir, "stubs", str(upload_index))
+            started_at = time.perf_counter()
+            hit = generate_stubs(stubs_cache, toolchain_version, proto_dir, stubs_dir)
+            latencies[hit].append(time.perf_counter() - started_at)
+
+    print(f"toolchain: {toolchain_version}, uploads: {len(uploads)}")
+    for hit, name in ((False, "miss (compile)"), (True, "hit (copy)")):
+        if latencies[hit]:
+            print(
+                f"{name:<16} count {len(latencies[hit]):5d}   "
+                f"median {statistics.median(latencies[hit]) * 1000:9.2f} ms   "
+                f"max {max(latencies[hit]) * 1000:9.2f} ms"
+            )
+    total_without_cache = statistics.mean(latencies[False]) * len(uploads)
+    total_with_cache = sum(latencies[False]) + sum(latencies[True])
+    print(
+        f"total: {total_with_cache:.2f} s with cache, ~{total_without_cache:.2f} s compiling every upload"
+    )
+
+
+if __name__ == "__main__":
+    main()
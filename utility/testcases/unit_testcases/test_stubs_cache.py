@@ -0,0 +1,148 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from utility.application.services.stubs_cache import S3_ENTRY_COMPLETE_MARKER, ProtoStubsCache
+
+
+def write_files(root_dir: str, files: dict) -> None:
+    for path, content in files.items():
+        file_path = os.path.join(root_dir, *path.split("/"))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as f:
+            f.write(content)
+
+
+def read_files(root_dir: str) -> dict:
+    files = {}
+    for subdir, _, filenames in os.walk(root_dir):
+        for filename in filenames:
+            file_path = os.path.join(subdir, filename)
+            with open(file_path) as f:
+                files[os.path.relpath(file_path, root_dir).replace(os.sep, "/")] = f.read()
+    return files
+
+
+class TestProtoStubsCache(TestCase):
+    protos = {
+        "service.proto": 'syntax = "proto3";',
+        "nested/types.proto": "message Empty {}",
+        "README.md": "not a proto",
+    }
+    stubs = {"service_pb2.py": "# stubs", "nested/types_pb2.py": "# nested stubs"}
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.proto_dir = self.make_dir("protos", self.protos)
+        self.stubs_dir = self.make_dir("stubs", self.stubs)
+        self.boto_utils = Mock()
+        self.boto_utils.get_bucket_and_key_from_url.return_value = ("bucket", "stubs-cache")
+        self.cache = ProtoStubsCache(self.boto_utils, os.path.join(self.temp_dir.name, "cache"))
+
+    def make_dir(self, name: str, files: dict) -> str:
+        path = os.path.join(self.temp_dir.name, name)
+        write_files(path, files)
+        return path
+
+    def test_key_does_not_depend_on_path_order(self):
+        key = ProtoStubsCache.compute_key(self.proto_dir, "grpcio-tools==1.0")
+        walk = os.walk
+
+        with patch(
+            "utility.application.services.stubs_cache.os.walk",
+            side_effect=lambda path: reversed(list(walk(path))),
+        ):
+            self.assertEqual(ProtoStubsCache.compute_key(self.proto_dir, "grpcio-tools==1.0"), key)
+
+        other_proto_dir = self.make_dir("other_protos", dict(reversed(list(self.protos.items()))))
+        self.assertEqual(ProtoStubsCache.compute_key(other_proto_dir, "grpcio-tools==1.0"), key)
+
+    def test_key_depends_on_toolchain_version_and_content(self):
+        key = ProtoStubsCache.compute_key(self.proto_dir, "grpcio-tools==1.0")
+
+        self.assertNotEqual(ProtoStubsCache.compute_key(self.proto_dir, "grpcio-tools==1.1"), key)
+        write_files(self.proto_dir, {"README.md": "ignored"})
+        self.assertEqual(ProtoStubsCache.compute_key(self.proto_dir, "grpcio-tools==1.0"), key)
+        write_files(self.proto_dir, {"nested/types.proto": "message Other {}"})
+        self.assertNotEqual(ProtoStubsCache.compute_key(self.proto_dir, "grpcio-tools==1.0"), key)
+
+    def test_local_miss_store_and_hit(self):
+        target_dir = os.path.join(self.temp_dir.name, "target")
+
+        self.assertFalse(self.cache.restore("key", target_dir))
+        self.assertFalse(os.path.exists(target_dir))
+
+        self.cache.store("key", self.stubs_dir)
+
+        self.assertTrue(self.cache.restore("key", target_dir))
+        self.assertEqual(read_files(target_dir), self.stubs)
+        self.boto_utils.s3_upload_file.assert_not_called()
+
+    def test_least_recently_used_entry_evicted(self):
+        self.cache = ProtoStubsCache(
+            self.boto_utils, os.path.join(self.temp_dir.name, "cache"), max_local_entries=2
+        )
+        self.cache.store("first", self.stubs_dir)
+        self.cache.store("second", self.stubs_dir)
+        os.utime(os.path.join(self.temp_dir.name, "cache", "first"), (1, 1))
+        os.utime(os.path.join(self.temp_dir.name, "cache", "second"), (2, 2))
+        # restoring the first entry makes it the most recently used one
+        self.cache.restore("first", os.path.join(self.temp_dir.name, "target"))
+
+        self.cache.store("third", self.stubs_dir)
+
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.temp_dir.name, "cache"))), ["first", "third"]
+        )
+
+    def test_store_uploads_completion_marker_last(self):
+        self.cache._s3_url = "s3://bucket/stubs-cache"
+
+        self.cache.store("key", self.stubs_dir)
+
+        uploaded_keys = sorted(
+            call.kwargs["key"] for call in self.boto_utils.s3_upload_file.call_args_list
+        )
+        self.assertEqual(
+            uploaded_keys, ["stubs-cache/key/nested/types_pb2.py", "stubs-cache/key/service_pb2.py"]
+        )
+        self.boto_utils.s3_upload_fileobj.assert_called_once()
+        self.assertEqual(
+            self.boto_utils.s3_upload_fileobj.call_args.kwargs["key"],
+            f"stubs-cache/key/{S3_ENTRY_COMPLETE_MARKER}",
+        )
+
+    def test_s3_entry_without_marker_not_restored(self):
+        self.cache._s3_url = "s3://bucket/stubs-cache"
+        self.boto_utils.get_objects_from_s3.return_value = [
+            {"Key": "stubs-cache/key/service_pb2.py"}
+        ]
+
+        self.assertFalse(self.cache.restore("key", os.path.join(self.temp_dir.name, "target")))
+        self.boto_utils.s3_download_file.assert_not_called()
+
+    def test_s3_entry_with_marker_restored(self):
+        self.cache._s3_url = "s3://bucket/stubs-cache"
+        self.boto_utils.get_objects_from_s3.return_value = [
+            {"Key": "stubs-cache/key/service_pb2.py"},
+            {"Key": "stubs-cache/key/nested/types_pb2.py"},
+            {"Key": f"stubs-cache/key/{S3_ENTRY_COMPLETE_MARKER}"},
+        ]
+
+        def s3_download_file(bucket, key, filename):
+            with open(filename, "w") as f:
+                f.write(self.stubs[key[len("stubs-cache/key/") :]])
+
+        self.boto_utils.s3_download_file.side_effect = s3_download_file
+        target_dir = os.path.join(self.temp_dir.name, "target")
+
+        self.assertTrue(self.cache.restore("key", target_dir))
+        self.assertEqual(read_files(target_dir), self.stubs)
+        self.assertEqual(self.boto_utils.s3_download_file.call_count, 2)
+
+        # the entry is kept locally after the download
+        self.boto_utils.get_objects_from_s3.reset_mock()
+        self.assertTrue(self.cache.restore("key", os.path.join(self.temp_dir.name, "target_2")))
+        self.boto_utils.get_objects_from_s3.assert_not_called()
@@ -0,0 +1,133 @@
+import os
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from utility.application.schemas import StubsGenerationRequest
+from utility.application.services import stubs_generator_service
+from utility.application.services.stubs_generator_service import StubsGeneratorService
+from utility.exceptions import StubsCompilationFailed
+from utility.settings import settings
+
+
+class TestCompileStubsForEnvironments(TestCase):
+    def setUp(self):
+        for target, attribute, value in [
+            (settings.compile_proto, "SUPPORTED_ENVIRONMENT", ["python", "nodejs"]),
+            (settings.compile_proto.ARN, "PYTHON_PROTO_LAMBDA_ARN", "python_arn"),
+            (settings.compile_proto.ARN, "NODEJS_PROTO_LAMBDA_ARN", "nodejs_arn"),
+        ]:
+            patcher = patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @patch.object(stubs_generator_service.boto_utils, "invoke_lambda")
+    def test_environments_compiled_concurrently(self, invoke_lambda):
+        # both compilations have to be running at the same time to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def compile_stubs(invocation_type, payload, lambda_function_arn):
+            barrier.wait()
+            return {"statusCode": 200, "data": {"arn": lambda_function_arn}}
+
+        invoke_lambda.side_effect = compile_stubs
+
+        compilation = StubsGeneratorService._compile_stubs_for_environments("{}")
+
+        self.assertEqual(compilation["python"]["status"], "SUCCEEDED")
+        self.assertEqual(compilation["python"]["data"], {"arn": "python_arn"})
+        self.assertEqual(compilation["nodejs"]["status"], "SUCCEEDED")
+        self.assertIsNotNone(compilation["nodejs"]["latency_in_seconds"])
+
+    @patch.object(stubs_generator_service.boto_utils, "invoke_lambda")
+    def test_failure_does_not_stop_other_environment(self, invoke_lambda):
+        def compile_stubs(invocation_type, payload, lambda_function_arn):
+            if lambda_function_arn == "python_arn":
+                raise TimeoutError("python compilation timed out")
+            return {"statusCode": 200, "data": {}}
+
+        invoke_lambda.side_effect = compile_stubs
+
+        compilation = StubsGeneratorService._compile_stubs_for_environments("{}")
+
+        self.assertEqual(compilation["python"]["status"], "FAILED")
+        self.assertEqual(
+            compilation["python"]["error"], repr(TimeoutError("python compilation timed out"))
+        )
+        self.assertEqual(compilation["nodejs"]["status"], "SUCCEEDED")
+
+    @patch("utility.application.services.stubs_generator_service.BotoUtils.clear_s3_files")
+    @patch.object(StubsGeneratorService, "_download_extract_and_upload_proto_files")
+    @patch.object(StubsGeneratorService, "_compile_stubs_for_environments")
+    def test_compilation_errors_of_all_environments_reported(
+        self, compile_stubs_for_environments, download_extract_and_upload, clear_s3_files
+    ):
+        compile_stubs_for_environments.return_value = {
+            "python": {"status": "FAILED", "error": "python error", "latency_in_seconds": 1},
+            "nodejs": {"status": "FAILED", "error": {"statusCode": 500}, "latency_in_seconds": 1},
+        }
+        request = StubsGenerationRequest(
+            input_s3_path="s3://bucket/org/service/proto.zip",
+            output_s3_path="",
+            org_id="org",
+            service_id="service",
+        )
+
+        with self.assertRaises(StubsCompilationFailed) as context:
+            StubsGeneratorService().manage_proto_compilation(request)
+
+        self.assertEqual(
+            context.exception.errors, {"python": "python error", "nodejs": {"statusCode": 500}}
+        )
+
+
+class TestCompileProtos(TestCase):
+    valid_proto = (
+        'syntax = "proto3";\n\npackage valid;\n\nmessage Request {\n    string value = 1;\n}\n'
+    )
+    invalid_proto = 'syntax = "proto3";\n\nmessage Broken {\n    unknown_type value = 1;\n}\n'
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.proto_dir = os.path.join(self.temp_dir.name, "proto")
+        self.codegen_dir = os.path.join(self.temp_dir.name, "stubs")
+        os.makedirs(self.proto_dir)
+
+    def write_proto(self, filename: str, content: str) -> str:
+        proto_path = os.path.join(self.proto_dir, filename)
+        with open(proto_path, "w") as proto_file:
+            proto_file.write(content)
+        return proto_path
+
+    @patch.object(StubsGeneratorService, "_compile_proto", return_value=(True, "stubs"))
+    def test_batch_compiled_with_one_protoc_run(self, compile_proto):
+        proto_paths = ["a.proto", "b.proto", "c.proto"]
+
+        self.assertTrue(
+            StubsGeneratorService()._compile_protos(self.proto_dir, self.codegen_dir, proto_paths)
+        )
+        compile_proto.assert_called_once_with(self.proto_dir, self.codegen_dir, *proto_paths)
+
+    def test_failed_batch_falls_back_to_per_file_compilation(self):
+        proto_paths = [
+            self.write_proto("valid.proto", self.valid_proto),
+            self.write_proto("invalid.proto", self.invalid_proto),
+        ]
+
+        with patch.object(
+            StubsGeneratorService,
+            "_compile_proto",
+            wraps=StubsGeneratorService._compile_proto,
+        ) as compile_proto:
+            success = StubsGeneratorService()._compile_protos(
+                self.proto_dir, self.codegen_dir, proto_paths
+            )
+
+        self.assertFalse(success)
+        self.assertEqual(compile_proto.call_count, 3)
+        # the stubs of the valid proto are kept
+        self.assertEqual(
+            sorted(os.listdir(self.codegen_dir)), ["valid_pb2.py", "valid_pb2_grpc.py"]
+        )
@@ -68,15 +68,21 @@ def get_transactions_for_order(event, context):
         assert body is not None, "Body not found"
         payload_dict = json.loads(body)
         order_id = payload_dict.get('order_id', None)
+        order_ids = payload_dict.get('order_ids', None)
         username = payload_dict.get('username', None)
         org_id = payload_dict.get('org_id', None)
         group_id = payload_dict.get('group_id', None)
-        assert (order_id is not None) or (username is not None and org_id is not None and group_id is not None), \
-            "Body must contain either 'order_id' or 'username' and 'org_id' and 'group_id'"
+        assert (order_id is not None) or isinstance(order_ids, list) or \
+               (username is not None and org_id is not None and group_id is not None), \
+            "Body must contain either 'order_id', 'order_ids' or 'username' and 'org_id' and 'group_id'"
     except AssertionError as e:
         raise BadRequestException(str(e))
 
-    if order_id is not None:
+    if order_ids is not None:
+        response_data = channel_service.get_channel_transactions_against_order_ids(
+            order_ids = list(dict.fromkeys(order_ids))
+        )
+    elif order_id is not None:
         response_data = channel_service.get_channel_transactions_against_order_id(
             order_id = payload_dict["order_id"]
         )
@@ -2,6 +2,8 @@ import datetime as dt
 import base64
 import json
 
+from web3.exceptions import Web3RPCError
+
 from common.logger import get_logger
 from common.utils import Utils
 # from common.blockchain_util import BlockChainUtil
@@ -12,6 +14,7 @@ TODO: change back when 'common' is updated
 """
 from common.boto_utils import BotoUtils
 from common.constant import TransactionStatus
+from common.secret_cache import get_secret_cache
 
 from wallets.config import (
     NETWORK_ID,
@@ -42,30 +45,43 @@ class ChannelService:
         )
         self.utils = Utils()
         self.channel_repo = ChannelRepository()
+        self.secret_cache = get_secret_cache(REGION_NAME)
+
+    def __load_executor_wallet(self):
+        executor_wallet = self.secret_cache.get_ssm_parameters([EXECUTOR_ADDRESS, EXECUTOR_KEY])
+        self.EXECUTOR_WALLET_ADDRESS = executor_wallet[EXECUTOR_ADDRESS]
+        self.EXECUTOR_WALLET_KEY = executor_wallet[EXECUTOR_KEY]
+
+    def __send_executor_transaction(self, *positional_inputs, method_name, gas=None):
+        self.__load_executor_wallet()
+        try:
+            transaction_object = self.blockchain_util.create_transaction_object(
+                *positional_inputs, method_name=method_name,
+                address=self.EXECUTOR_WALLET_ADDRESS,
+                contract_path=MPE_CNTRCT_PATH,
+                contract_address_path=MPE_ADDR_PATH,
+                net_id=NETWORK_ID,
+                token_name = TOKEN_NAME,
+                stage = STAGE,
+                gas=gas
+            )
+            raw_transaction = self.blockchain_util.sign_transaction_with_private_key(
+                transaction_object=transaction_object,
+                private_key=self.EXECUTOR_WALLET_KEY)
+            return self.blockchain_util.process_raw_transaction(raw_transaction=raw_transaction)
+        except Web3RPCError:
+            # the transaction moves funds and may already be in the mempool, so it is never resent here,
+            # the next request loads the executor wallet again in case it was rotated
+            self.secret_cache.invalidate(EXECUTOR_ADDRESS, EXECUTOR_KEY)
+            raise
 
     def add_funds_to_channel(self, org_id, group_id, channel_id, sender, recipient, order_id, amount, currency, amount_in_cogs):
-        self.EXECUTOR_WALLET_ADDRESS = self.boto_utils.get_ssm_parameter(EXECUTOR_ADDRESS)
-        self.EXECUTOR_WALLET_KEY = self.boto_utils.get_ssm_parameter(EXECUTOR_KEY)
         method_name = "channelAddFunds"
         # amount_in_cogs = self.__calculate_amount_in_cogs(amount=amount, currency=currency)
         self.__validate__cogs(amount_in_cogs=amount_in_cogs)
         positional_inputs = (channel_id, amount_in_cogs)
 
-        transaction_object = self.blockchain_util.create_transaction_object(
-            *positional_inputs, method_name=method_name,
-            address=self.EXECUTOR_WALLET_ADDRESS,
-            contract_path=MPE_CNTRCT_PATH,
-            contract_address_path=MPE_ADDR_PATH,
-            net_id=NETWORK_ID,
-            token_name = TOKEN_NAME,
-            stage = STAGE
-        )
-
-        raw_transaction = self.blockchain_util.sign_transaction_with_private_key(
-            transaction_object=transaction_object,
-            private_key=self.EXECUTOR_WALLET_KEY)
-
-        transaction_hash = self.blockchain_util.process_raw_transaction(raw_transaction=raw_transaction)
+        transaction_hash = self.__send_executor_transaction(*positional_inputs, method_name=method_name)
         logger.info("channelAddFunds::transaction_hash: %s for order_id: %s", transaction_hash, order_id)
 
         self.channel_repo.update_channel_transaction_history_status_by_order_id(
@@ -151,6 +167,21 @@ class ChannelService:
             "transactions": transactions
         }
 
+    def get_channel_transactions_against_order_ids(self, order_ids):
+        transactions_by_order_id = {order_id: [] for order_id in order_ids}
+        if order_ids:
+            transaction_history = self.channel_repo.get_channel_transactions_against_order_ids(order_ids)
+            logger.info(f"Fetched {len(transaction_history)} transactions against {len(order_ids)} orders")
+            for transaction in transaction_history:
+                transactions_by_order_id[transaction.order_id].append(transaction.to_dict())
+
+        return {
+            "orders": [
+                {"order_id": order_id, "transactions": transactions}
+                for order_id, transactions in transactions_by_order_id.items()
+            ]
+        }
+
     def record_create_channel_event(self, payload):
         self.channel_repo.add_channel_transaction_history_record(ChannelTransactionHistoryModel(
             order_id = payload["order_id"],
@@ -174,8 +205,6 @@ class ChannelService:
 
     def open_channel_by_third_party(self, order_id, sender, signature, r, s, v, group_id,
                                     org_id, amount, currency, recipient, current_block_no, amount_in_cogs):
-        self.EXECUTOR_WALLET_ADDRESS = self.boto_utils.get_ssm_parameter(EXECUTOR_ADDRESS)
-        self.EXECUTOR_WALLET_KEY = self.boto_utils.get_ssm_parameter(EXECUTOR_KEY)
         method_name = "openChannelByThirdParty"
         self.mpe_address = self.blockchain_util.read_contract_address(
             net_id=NETWORK_ID,
@@ -198,23 +227,10 @@ class ChannelService:
             current_block_no, v, r, s
         )
 
-        transaction_object = self.blockchain_util.create_transaction_object(
-            *positional_inputs,
-            method_name=method_name,
-            address=self.EXECUTOR_WALLET_ADDRESS,
-            contract_path=MPE_CNTRCT_PATH,
-            contract_address_path=MPE_ADDR_PATH,
-            net_id=NETWORK_ID,
-            token_name = TOKEN_NAME,
-            stage = STAGE,
-            gas=250000,
+        transaction_hash = self.__send_executor_transaction(
+            *positional_inputs, method_name=method_name, gas=250000
         )
 
-        raw_transaction = self.blockchain_util.sign_transaction_with_private_key(
-            transaction_object=transaction_object,
-            private_key=self.EXECUTOR_WALLET_KEY)
-        transaction_hash = self.blockchain_util.process_raw_transaction(raw_transaction=raw_transaction)
-
         logger.info("openChannelByThirdParty::transaction_hash : %s for order_id : %s", transaction_hash, order_id)
 
         self.channel_repo.update_channel_transaction_history_status_by_order_id(
@@ -254,24 +270,34 @@ class ChannelService:
     def manage_channel_transaction_status(self):
         # UPDATE PENDING TRANSACTIONS
         pending_txns_db = self.channel_repo.get_channel_transaction_history_data(status=TransactionStatus.PENDING)
-        for txn_data in pending_txns_db:
-            if txn_data.transaction_hash:
-                txn_receipt = self.blockchain_util.get_transaction_receipt_from_blockchain(
-                    transaction_hash=txn_data.transaction_hash)
-                if txn_receipt:
-                    txn_data.status = TransactionStatus.PROCESSING if txn_receipt.status == 1 else TransactionStatus.FAILED
-                    self.channel_repo.update_channel_transaction_history_status_by_order_id(channel_txn_history=txn_data)
+        pending_txns_db = [txn for txn in pending_txns_db if txn.transaction_hash]
+        if pending_txns_db:
+            receipt_statuses = self.blockchain_util.get_transaction_receipt_statuses_from_blockchain(
+                transaction_hashes=[txn.transaction_hash for txn in pending_txns_db])
+            mined_order_ids = {TransactionStatus.PROCESSING: [], TransactionStatus.FAILED: []}
+            for txn_data in pending_txns_db:
+                receipt_status = receipt_statuses.get(txn_data.transaction_hash)
+                if receipt_status is not None:
+                    status = TransactionStatus.PROCESSING if receipt_status == 1 else TransactionStatus.FAILED
+                    mined_order_ids[status].append(txn_data.order_id)
+            for status, order_ids in mined_order_ids.items():
+                self.channel_repo.update_channel_transaction_history_status(order_ids=order_ids, status=status)
 
         # UPDATE PROCESSING TRANSACTIONS
         processing_txns_db = self.channel_repo.get_channel_transaction_history_data(status=TransactionStatus.PROCESSING)
-        processing_txn = [txn.transaction_hash for txn in processing_txns_db]
         if processing_txns_db:
-            processed_transactions = self.get_mpe_processed_transactions_from_event_pub_sub(processing_txn)
-            for txn in processed_transactions:
-                if txn["processed"]:
-                    txn_data = list(filter(lambda x: x.transaction_hash == txn["transactionHash"], processing_txns_db))[0]
-                    txn_data.status = TransactionStatus.SUCCESS
-                    self.channel_repo.update_channel_transaction_history_status_by_order_id(channel_txn_history=txn_data)
+            processing_txns_by_hash = {}
+            for txn_data in processing_txns_db:
+                processing_txns_by_hash.setdefault(txn_data.transaction_hash, []).append(txn_data)
+            processed_transactions = self.get_mpe_processed_transactions_from_event_pub_sub(
+                list(processing_txns_by_hash.keys()))
+            processed_order_ids = [
+                txn_data.order_id
+                for txn in processed_transactions if txn["processed"]
+                for txn_data in processing_txns_by_hash.get(txn["transactionHash"], [])
+            ]
+            self.channel_repo.update_channel_transaction_history_status(
+                order_ids=processed_order_ids, status=TransactionStatus.SUCCESS)
 
     def manage_create_channel_event(self):
         pending_create_channel_event = self.channel_repo.get_one_create_channel_event(TransactionStatus.PENDING)
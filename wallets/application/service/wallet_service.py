@@ -1,4 +1,4 @@
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 
 # from common.blockchain_util import BlockChainUtil
 from wallets.infrastructure.blockchain_util import BlockChainUtil
@@ -8,6 +8,7 @@ TODO: change back when 'common' is updated
 """
 from common.boto_utils import BotoUtils
 from common.logger import get_logger
+from common.secret_cache import get_secret_cache
 from common.utils import Utils
 from wallets.config import NETWORK_ID, NETWORKS, REGION_NAME, ENCRYPTION_KEY
 from wallets.constant import GENERAL_WALLET_TYPE, WalletStatus
@@ -27,8 +28,19 @@ class WalletService:
         )
         self.utils = Utils()
         self.wallet_repo = WalletRepository()
-        self.ENCRYPTION_KEY = self.boto_utils.get_ssm_parameter(ENCRYPTION_KEY)
-        self.fernet = Fernet(bytes.fromhex(self.ENCRYPTION_KEY))
+        self.secret_cache = get_secret_cache(REGION_NAME)
+        self._fernet = None
+        self._fernet_key = None
+        # fails fast on a missing key, later lookups are served from the container-wide cache
+        self.secret_cache.prefetch_ssm_parameters([ENCRYPTION_KEY])
+
+    @property
+    def fernet(self):
+        encryption_key = self.secret_cache.get_ssm_parameter(ENCRYPTION_KEY)
+        if encryption_key != self._fernet_key:
+            self._fernet = Fernet(bytes.fromhex(encryption_key))
+            self._fernet_key = encryption_key
+        return self._fernet
 
     def create_and_register_wallet(self, username):
         address, private_key = self.blockchain_util.create_account()
@@ -81,7 +93,10 @@ class WalletService:
 
     def _decrypt_key(self, encrypted_key: str) -> str:
         encrypted_key_in_bytes = bytes.fromhex(encrypted_key)
-        decrypted_key = self.fernet.decrypt(encrypted_key_in_bytes)
+        # the encryption key could be rotated since it was cached
+        decrypted_key = self.secret_cache.call_with_refresh(
+            lambda: self.fernet.decrypt(encrypted_key_in_bytes), [ENCRYPTION_KEY], refresh_on=InvalidToken
+        )
         return decrypted_key.hex()
 
 
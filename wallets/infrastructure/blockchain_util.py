@@ -1,10 +1,12 @@
 import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 import web3
 from eth_account.messages import defunct_hash_message
 from web3 import Web3
+from web3.exceptions import TransactionNotFound
 from websockets.exceptions import ConnectionClosed
 
 from common.constant import TokenSymbol
@@ -138,6 +140,44 @@ class BlockChainUtil(object):
     def get_transaction_receipt_from_blockchain(self, transaction_hash):
         return self.web3_object.eth.get_transaction_receipt(transaction_hash)
 
+    def get_transaction_receipt_statuses_from_blockchain(self, transaction_hashes, batch_size=100, max_workers=10):
+        """
+        Returns receipt status (1 - success, 0 - reverted) by transaction hash, None is returned for the
+        transactions that are not mined yet. Receipts are requested with JSON-RPC batches, the provider
+        falls back to concurrent single requests if it does not support batches.
+        """
+        statuses = {}
+        for i in range(0, len(transaction_hashes), batch_size):
+            chunk = transaction_hashes[i:i + batch_size]
+            try:
+                statuses.update(self._get_transaction_receipt_statuses_batch(chunk))
+            except Exception as e:
+                logger.info(f"Batch request for transaction receipts failed, requesting one by one:: {repr(e)}")
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    statuses.update(zip(chunk, executor.map(self._get_transaction_receipt_status, chunk)))
+        return statuses
+
+    def _get_transaction_receipt_statuses_batch(self, transaction_hashes):
+        responses = self.web3_object.provider.make_batch_request(
+            [("eth_getTransactionReceipt", [transaction_hash]) for transaction_hash in transaction_hashes]
+        )
+        if not isinstance(responses, list):
+            raise Exception(f"Batch request error: {responses.get('error')}")
+
+        statuses = {}
+        for transaction_hash, response in zip(transaction_hashes, responses):
+            if "error" in response:
+                raise Exception(f"Receipt request error for {transaction_hash}: {response['error']}")
+            receipt = response.get("result")
+            statuses[transaction_hash] = None if receipt is None else int(receipt["status"], 16)
+        return statuses
+
+    def _get_transaction_receipt_status(self, transaction_hash):
+        try:
+            return self.get_transaction_receipt_from_blockchain(transaction_hash).status
+        except TransactionNotFound:
+            return None
+
     @staticmethod
     def get_contract_file_paths(base_path, contract_name):
         logger.info(f"base_path: {base_path}, contract_name: {contract_name}")
@@ -60,6 +60,22 @@ class ChannelRepository(BaseRepository):
             logger.error(f"Failed to update channel transaction history status: {e}")
             raise e
 
+    def update_channel_transaction_history_status(self, order_ids: list[str], status: str):
+        if not order_ids:
+            return
+        current_time = dt.datetime.now(dt.UTC)
+        try:
+            logger.info(f"Updating channel transaction history status to {status} for order_ids: {order_ids}")
+            self.session.query(ChannelTransactionHistory). \
+                filter(ChannelTransactionHistory.order_id.in_(order_ids)). \
+                update({ChannelTransactionHistory.status: status, ChannelTransactionHistory.row_updated: current_time},
+                       synchronize_session=False)
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Failed to update channel transaction history status: {e}")
+            raise e
+
     def add_channel_transaction_history_record(self, channel_txn_history):
         current_time = dt.datetime.now(dt.UTC)
         self.add_item(ChannelTransactionHistory(
@@ -152,6 +168,17 @@ class ChannelRepository(BaseRepository):
             logger.error(f"Failed to get channel transactions: {e}")
             raise e
 
+    def get_channel_transactions_against_order_ids(self, order_ids: list[str]) -> list[ChannelTransactionHistoryModel]:
+        try:
+            transactions_data = self.session.query(ChannelTransactionHistory) \
+                .filter(ChannelTransactionHistory.order_id.in_(order_ids)).all()
+            return [WalletsFactory.convert_channel_transaction_history_db_model_to_entity_model(transaction)
+                    for transaction in transactions_data]
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Failed to get channel transactions: {e}")
+            raise e
+
     def persist_create_channel_event(self, payload, created_at) -> bool:
         try:
             event = CreateChannelEvent(
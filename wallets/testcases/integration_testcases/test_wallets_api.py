@@ -2,7 +2,7 @@ import json
 import unittest
 from unittest.mock import patch
 
-with patch("common.boto_utils.BotoUtils.get_ssm_parameter", return_value="744f676a485a4b63427a56342d476b6a3174324335536f375f65566f545735644553574a483663333554773d"):
+with patch("common.secret_cache.SecretCache._fetch_ssm_parameters", side_effect=lambda names: {name: "744f676a485a4b63427a56342d476b6a3174324335536f375f65566f545735644553574a483663333554773d" for name in names}):
     from wallets.application.handlers import wallet_handlers, channel_handlers
 from wallets.infrastructure.models import ChannelTransactionHistory, Wallet, UserWallet
 from wallets.infrastructure.repositories.channel_repository import ChannelRepository
@@ -136,6 +136,40 @@ class TestWalletAPI(unittest.TestCase):
         real_dict = json.loads(response['body'])["data"]
         assert real_dict == expected_dict
 
+    def test_get_transactions_for_orders(self):
+        self.tearDown()
+        channel_repo.add_item(ChannelTransactionHistory(
+            order_id="8c6b2568-f358-11eb-bd57-46eba0f9718d",
+            amount=2,
+            currency="USD",
+            type="openChannelByThirdParty",
+            address="sample_address",
+            recipient="sample_recipient",
+            signature="sample_signature",
+            org_id="sample_org_id",
+            group_id="sample_group_id",
+            request_parameters="sample",
+            transaction_hash="sample_hash",
+            status="PENDING",
+            row_updated="2021-05-19 13:51:53",
+            row_created="2021-05-19 13:51:53"
+        ))
+
+        get_transactions_for_orders = {
+            "body": json.dumps({
+                "order_ids": ["8c6b2568-f358-11eb-bd57-46eba0f9718d", "sample_order_without_transactions"]
+            })
+        }
+        response = channel_handlers.get_transactions_for_order(get_transactions_for_orders,
+                                                  context=None)
+        assert response['statusCode'] == 200
+        real_dict = json.loads(response['body'])["data"]
+        assert [order["order_id"] for order in real_dict["orders"]] == \
+               ["8c6b2568-f358-11eb-bd57-46eba0f9718d", "sample_order_without_transactions"]
+        assert [transaction["transaction_hash"] for transaction in real_dict["orders"][0]["transactions"]] == \
+               ["sample_hash"]
+        assert real_dict["orders"][1]["transactions"] == []
+
     def tearDown(self):
         channel_repo.session.query(Wallet).delete()
         channel_repo.session.query(UserWallet).delete()
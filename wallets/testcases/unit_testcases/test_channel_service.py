@@ -1,10 +1,11 @@
-import json
 import unittest
-from types import SimpleNamespace as Namespace
 from unittest.mock import patch
 
+from web3.exceptions import Web3RPCError
+
 from common.constant import TransactionStatus
 from wallets.application.handlers.channel_handlers import update_channel_transaction_status
+from wallets.application.service.channel_service import ChannelService
 from wallets.infrastructure.models import ChannelTransactionHistory
 from wallets.infrastructure.repositories.channel_repository import ChannelRepository
 
@@ -13,8 +14,49 @@ channel_repo = ChannelRepository()
 
 class TestChannelService(unittest.TestCase):
 
+    @patch("wallets.application.service.channel_service.EXECUTOR_KEY", "EXECUTOR_KEY")
+    @patch("wallets.application.service.channel_service.EXECUTOR_ADDRESS", "EXECUTOR_ADDRESS")
+    @patch("wallets.infrastructure.repositories.channel_repository.ChannelRepository.update_channel_transaction_history_status_by_order_id")
+    @patch("wallets.infrastructure.blockchain_util.BlockChainUtil.process_raw_transaction")
+    @patch("wallets.infrastructure.blockchain_util.BlockChainUtil.sign_transaction_with_private_key")
+    @patch("wallets.infrastructure.blockchain_util.BlockChainUtil.create_transaction_object")
+    @patch("common.secret_cache.SecretCache._fetch_ssm_parameters")
+    def test_add_funds_to_channel_with_rotated_executor_wallet(self, mock_fetch_ssm_parameters, mock_create_transaction,
+                                                                mock_sign_transaction, mock_process_transaction,
+                                                                mock_update_channel_transaction):
+        executor_wallets = [
+            {"EXECUTOR_ADDRESS": "old_executor_address", "EXECUTOR_KEY": "old_executor_key"},
+            {"EXECUTOR_ADDRESS": "new_executor_address", "EXECUTOR_KEY": "new_executor_key"}
+        ]
+        mock_fetch_ssm_parameters.side_effect = lambda names: executor_wallets.pop(0)
+        mock_create_transaction.return_value = "transaction_object"
+        mock_sign_transaction.return_value = "raw_transaction"
+        mock_process_transaction.side_effect = [Web3RPCError("invalid sender"), "transaction_hash"]
+
+        channel_service = ChannelService()
+        channel_service.secret_cache.invalidate()
+        add_funds_kwargs = dict(
+            org_id="sample_org_id", group_id="sample_group_id", channel_id=1, sender="sample_sender",
+            recipient="sample_recipient", order_id="sample_order_id", amount=2, currency="USD",
+            amount_in_cogs=200000000)
+
+        # a rejected transaction is not resent, it could already be in the mempool
+        with self.assertRaises(Web3RPCError):
+            channel_service.add_funds_to_channel(**add_funds_kwargs)
+        self.assertEqual(mock_process_transaction.call_count, 1)
+        mock_update_channel_transaction.assert_not_called()
+
+        response = channel_service.add_funds_to_channel(**add_funds_kwargs)
+
+        self.assertEqual(response["transaction_hash"], "transaction_hash")
+        self.assertEqual(mock_process_transaction.call_count, 2)
+        self.assertEqual(mock_fetch_ssm_parameters.call_count, 2)
+        self.assertEqual(mock_create_transaction.call_args.kwargs["address"], "new_executor_address")
+        self.assertEqual(mock_sign_transaction.call_args.kwargs["private_key"], "new_executor_key")
+        channel_service.secret_cache.invalidate()
+
     @patch("wallets.application.service.channel_service.ChannelService.get_mpe_processed_transactions_from_event_pub_sub")
-    @patch("wallets.infrastructure.blockchain_util.BlockChainUtil.get_transaction_receipt_from_blockchain")
+    @patch("wallets.infrastructure.blockchain_util.BlockChainUtil.get_transaction_receipt_statuses_from_blockchain")
     def test_channel_update_transaction_status(self, mock_reciept, mock_processed_res):
         self.tearDown()
         channel_repo.add_item(ChannelTransactionHistory(
@@ -100,7 +142,7 @@ class TestChannelService(unittest.TestCase):
                 "error_msg": ""
             }
         ]
-        mock_reciept.return_value = json.loads('{"status": 1}', object_hook=lambda d: Namespace(**d))
+        mock_reciept.return_value = {"sample_1": 1, "sample_2": 1, "sample_3": 1}
         res = update_channel_transaction_status(event={}, context=None)
         transaction = channel_repo.get_channel_transaction_history_data()
         assert transaction[0].transaction_hash == "sample_1"
@@ -127,7 +169,7 @@ class TestChannelService(unittest.TestCase):
             row_updated="2021-05-19 13:51:53",
             row_created="2021-05-19 13:51:53"
         ))
-        mock_reciept.return_value = json.loads('{"status": 0}', object_hook=lambda d: Namespace(**d))
+        mock_reciept.return_value = {"sample_1": 0}
         res = update_channel_transaction_status(event={}, context=None)
         transaction = channel_repo.get_channel_transaction_history_data()
         assert transaction[0].transaction_hash == "sample_1"
@@ -9,8 +9,8 @@ from wallets.infrastructure.repositories.wallet_repository import WalletReposito
 
 class TestWalletService(unittest.TestCase):
     def setUp(self):
-        with patch("common.boto_utils.BotoUtils.get_ssm_parameter",
-                   return_value = "744f676a485a4b63427a56342d476b6a3174324335536f375f65566f545735644553574a483663333554773d"):
+        with patch("common.secret_cache.SecretCache._fetch_ssm_parameters",
+                   side_effect = lambda names: {name: "744f676a485a4b63427a56342d476b6a3174324335536f375f65566f545735644553574a483663333554773d" for name in names}):
             self.wallet_service = WalletService()
         self.wallet_repo = WalletRepository()
 